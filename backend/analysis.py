@@ -0,0 +1,332 @@
+import os
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from bson.objectid import ObjectId
+import numpy as np
+
+from backend.nlp.resume_parser import (
+    extract_resume_text_timed, parse_document, parse_resume_header, EXTRACT_LOCATION, MAX_PAGES
+)
+from backend.nlp.document import ResumeDocument
+from backend.nlp.parse_cache import PARSE_CACHE, file_sha256, cache_key
+from backend.nlp.skill_extractor import extract_skills_from_sections
+from backend.nlp.feedback_engine import generate_ats_feedback
+from backend.nlp.matcher import calculate_simple_ats
+from backend.nlp.skill_vocab import resume_skill_fields, resume_skill_vector, SKILL_DTYPE
+
+from backend.db import resumes_collection
+from backend.metrics import ANALYSES, PARSE_CACHE_LOOKUPS
+from backend.timing import timed
+from backend.repository import find_resume, save_analysis
+from backend.skill_index import record_skills
+
+logger = logging.getLogger(__name__)
+
+# ======================================================
+# WORKER POOL
+# ======================================================
+
+# Status progression written to resumes_collection:
+#   queued -> parsing -> analyzed | failed
+STATUS_QUEUED = "queued"
+STATUS_PARSING = "parsing"
+STATUS_ANALYZED = "analyzed"
+STATUS_FAILED = "failed"
+
+IN_PROGRESS_STATUSES = (STATUS_QUEUED, STATUS_PARSING)
+
+ANALYSIS_WORKERS = int(os.environ.get("ANALYSIS_WORKERS", 2))
+
+# a resume queued longer ago than this is assumed lost (its worker
+# restarted or died) and may be queued again
+ANALYSIS_STALE_SECONDS = int(os.environ.get("ANALYSIS_STALE_SECONDS", 15 * 60))
+
+_executor = None
+
+
+def _get_executor():
+    # Created lazily so the pool is owned by the gunicorn worker that
+    # serves the request, not by the master process before fork.
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=ANALYSIS_WORKERS,
+            thread_name_prefix="resume-analysis"
+        )
+    return _executor
+
+
+def submit_task(fn, *args):
+    """
+    Run fn(*args) on this worker's background pool (analysis, match scoring).
+    """
+    return _get_executor().submit(fn, *args)
+
+
+def enqueue_analysis(resume_id):
+    """
+    Mark a resume as queued and hand it to the local worker pool.
+    Returns immediately; progress is tracked through `status`.
+    """
+    resumes_collection.update_one(
+        {"_id": ObjectId(resume_id)},
+        {"$set": {
+            "status": STATUS_QUEUED,
+            "queued_at": datetime.utcnow(),
+            "analysis_error": None
+        }}
+    )
+    submit_task(run_analysis, str(resume_id))
+
+
+def analysis_in_progress(resume):
+    """
+    True while a resume is queued or parsing and not yet stale.
+    """
+    if resume.get("status") not in IN_PROGRESS_STATUSES:
+        return False
+    queued_at = resume.get("queued_at")
+    return queued_at is not None and (datetime.utcnow() - queued_at).total_seconds() < ANALYSIS_STALE_SECONDS
+
+
+def get_analysis_status(resume_id, user_id):
+    resume = find_resume(
+        {"_id": ObjectId(resume_id), "uploaded_by": user_id},
+        "status"
+    )
+    if not resume:
+        return None
+
+    return {
+        "resume_id": str(resume["_id"]),
+        "status": resume.get("status"),
+        "error": resume.get("analysis_error"),
+        "personal_details": resume.get("personal_details")
+    }
+
+# ======================================================
+# PIPELINE
+# ======================================================
+
+def run_analysis(resume_id):
+    resume = find_resume({"_id": ObjectId(resume_id)}, "analyze")
+    if not resume:
+        return
+
+    resumes_collection.update_one(
+        {"_id": resume["_id"]},
+        {"$set": {"status": STATUS_PARSING}}
+    )
+
+    try:
+        _save_contact_details(resume)
+
+        with timed("analyze_total"):
+            result = analyze_resume_file(resume.get("file_path"), resume.get("content_hash"))
+
+        result["status"] = STATUS_ANALYZED
+        result["analyzed_at"] = datetime.utcnow()
+
+        with timed("mongo_write"):
+            save_analysis(resume["_id"], result)
+            record_skills({resume["_id"]: result["skills"]})
+    except Exception as e:
+        logger.exception("Resume analysis failed for %s", resume_id)
+        ANALYSES.labels(STATUS_FAILED).inc()
+        resumes_collection.update_one(
+            {"_id": resume["_id"]},
+            {"$set": {
+                "status": STATUS_FAILED,
+                "analysis_error": str(e) or e.__class__.__name__
+            }}
+        )
+        return
+
+    ANALYSES.labels(STATUS_ANALYZED).inc()
+
+    # applications submitted with this resume before it was analyzed
+    from backend.match_scores import rescore_resume
+    rescore_resume(resume["_id"])
+
+
+def _save_contact_details(resume):
+    # Name, email, phone and location from the first page(s) only, so the
+    # status page can show whose resume it is while the full parse runs.
+    # Not needed when the full parse is already cached.
+    file_path, content_hash = resume.get("file_path"), resume.get("content_hash")
+    if not file_path or not os.path.exists(file_path):
+        return
+    if content_hash and PARSE_CACHE.get(_parse_key(content_hash)) is not None:
+        return
+
+    with timed("parse_header"):
+        header = parse_resume_header(file_path)
+    resumes_collection.update_one(
+        {"_id": resume["_id"]},
+        {"$set": {"personal_details": contact_details(header)}}
+    )
+
+
+def contact_details(parsed):
+    return {
+        "name": parsed.get("name"),
+        "email": parsed.get("email"),
+        "phone": parsed.get("phone"),
+        "location": ", ".join(parsed.get("location", []))
+    }
+
+
+def _parse_key(content_hash):
+    # text past MAX_PAGES is never read, so the limit is part of the key
+    return cache_key(content_hash, f"p{MAX_PAGES}" if EXTRACT_LOCATION else f"p{MAX_PAGES}-noloc")
+
+
+def parse_with_cache(file_path, content_hash=None):
+    """
+    parse_resume + skill extraction, reused across identical files.
+    Returns (parsed, skills_meta, document).
+    """
+    if content_hash is None:
+        with timed("file_hash"):
+            content_hash = file_sha256(file_path)
+
+    return _parse_cached(_parse_key(content_hash), lambda: extract_resume_text_timed(file_path))
+
+
+def parse_text_with_cache(text):
+    """
+    parse_with_cache for resume text that is already extracted.
+    """
+    content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return _parse_cached(cache_key(content_hash, "text" if EXTRACT_LOCATION else "text-noloc"),
+                         lambda: (text, True))
+
+
+def _parse_cached(key, load_text):
+    # load_text() -> (text, complete); a parse of text cut short by the
+    # extraction time budget is returned but not cached
+    cached = PARSE_CACHE.get(key)
+    PARSE_CACHE_LOOKUPS.labels("miss" if cached is None else "hit").inc()
+    if cached is not None:
+        return cached["parsed"], cached["skills_meta"], ResumeDocument(cached["parsed"].get("raw_text"))
+
+    with timed("parse_resume"):
+        text, complete = load_text()
+        document = ResumeDocument(text)
+        parsed = parse_document(document)
+    with timed("skill_extraction"):
+        skills_meta = extract_skills_from_sections(skill_sections(parsed))
+
+    if complete:
+        PARSE_CACHE.put(key, {"parsed": parsed, "skills_meta": skills_meta})
+    return parsed, skills_meta, document
+
+
+def skill_sections(parsed):
+    projects = parsed.get("projects", [])
+
+    project_text_list = []
+
+    for p in projects:
+        if isinstance(p, dict):
+            project_text_list.append(p.get("name", ""))
+            project_text_list.extend(p.get("points", []))
+        else:
+            project_text_list.append(str(p))
+
+    project_text = " ".join(project_text_list)
+
+    return {
+        "skills": parsed.get("skills", ""),
+        "experience": " ".join([e.get("title", "") for e in parsed.get("experience", [])]),
+        "projects": project_text
+    }
+
+
+def analyze_resume_file(file_path, content_hash=None):
+    if not file_path or not os.path.exists(file_path):
+        raise FileNotFoundError("Resume file not found. Please upload again.")
+
+    parsed, skills_meta, document = parse_with_cache(file_path, content_hash)
+
+    personal_details = contact_details(parsed)
+
+    projects = parsed.get("projects", [])
+
+    skills = [s["skill"] for s in skills_meta]
+    skill_fields = resume_skill_fields(skills_meta)
+
+    raw_text = parsed.get("raw_text", "")
+    summary = raw_text[:400] + "..." if raw_text else "No summary available."
+
+    with timed("ats_score"):
+        ats_score = calculate_simple_ats({
+            "skills": np.frombuffer(skill_fields["skills_vec"], dtype=SKILL_DTYPE),
+            "experience": parsed.get("experience", []),
+            "education": parsed.get("education", ""),
+            "raw_text": raw_text
+        })
+
+    with timed("ats_feedback"):
+        ats_feedback = generate_ats_feedback(
+            resume_text=document,
+            resume_data={
+                "personal_details": personal_details,
+                "skills": skills,
+                "experience": parsed.get("experience", []),
+                "projects": projects,
+                "education": parsed.get("education", "")
+            },
+            ats_result={"ats_score": ats_score}
+        )
+
+    return {
+        "personal_details": personal_details,
+        "summary": summary,
+        "skills": skills,
+        "skills_meta": skills_meta,
+        **skill_fields,
+        "experience": parsed.get("experience", []),
+        "projects": projects,
+        "education": parsed.get("education", ""),
+        "certifications": parsed.get("certifications", ""),
+        "raw_text": raw_text,
+        "ats_score": ats_score,
+        "ats_feedback": ats_feedback
+    }
+
+
+# ======================================================
+# JOB MATCH INPUT
+# ======================================================
+
+def _join_entries(entries, title_key):
+    parts = []
+    for entry in entries or []:
+        if isinstance(entry, dict):
+            parts.append(entry.get(title_key, ""))
+            parts.extend(entry.get("points", []))
+        else:
+            parts.append(str(entry))
+    return " ".join(parts)
+
+
+def resume_scoring_input(resume):
+    """
+    Shape a stored (analyzed) resume document, with its payload merged
+    in, for matcher.rank_resumes. Skills are the stored skill_vocab vector
+    when it is current, else skills_meta (encoded by the matcher).
+    """
+    skills = resume_skill_vector(resume)
+    return {
+        "id": str(resume["_id"]),
+        "text": resume.get("raw_text", ""),
+        "skills": resume.get("skills_meta", []) if skills is None else skills,
+        "sections": {
+            "experience": _join_entries(resume.get("experience"), "title"),
+            "projects": _join_entries(resume.get("projects"), "name"),
+            "certifications": resume.get("certifications", "")
+        }
+    }
@@ -1,18 +1,30 @@
-from flask import Flask, render_template, request, redirect, session, flash, Response
+from flask import Flask, render_template, request, redirect, session, flash, Response, jsonify, stream_with_context
 from werkzeug.security import generate_password_hash, check_password_hash
 from bson.objectid import ObjectId
 from datetime import datetime
 import os
 
 # ================= NLP =================
-from backend.nlp.resume_parser import parse_resume
-from backend.nlp.skill_extractor import extract_skills_from_sections
 from backend.nlp.matcher import calculate_ats_score
-from backend.nlp.feedback_engine import generate_ats_feedback
-from backend.nlp.matcher import calculate_simple_ats
+from backend.nlp.skill_vocab import job_skill_fields
+from backend.nlp.skill_extractor import canonical_skill
+from backend.analysis import enqueue_analysis, get_analysis_status, analysis_in_progress, IN_PROGRESS_STATUSES
 
 # ================= DB =================
-from backend.db import users_collection, resumes_collection, jobs_collection, applications_collection
+from backend.db import users_collection, resumes_collection, jobs_collection, applications_collection, next_sequence
+from backend.indexes import ensure_indexes, CREATE_INDEXES
+from backend.repository import find_resume, find_resumes, with_payload, load_payload, delete_payload
+from backend.skill_index import search_resumes, forget_resume, SkillQueryError
+from backend.job_matrix import recommend_jobs, record_job
+from backend.match_scores import enqueue_match_score, enqueue_rescore, MATCH_PENDING
+from backend.recruiter_stats import get_recruiter_stats, record_application, record_status_change, APPLICATION_STATUSES
+from backend.metrics import render_metrics
+from backend.file_store import store_upload, release_upload, UploadTooLarge, UPLOAD_DIR, UPLOAD_MAX_BYTES
+from backend.batch_scoring import (
+    parse_batch_request, stream_scores, valid_api_key, BatchRequestError,
+    API_VERSION as SCORING_API_VERSION, SCORING_MAX_BYTES
+)
+from pymongo.errors import DuplicateKeyError
 
 # ================= APP =================
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -24,11 +36,44 @@ app = Flask(
 )
 app.secret_key = "supersecretkey"
 
-UPLOAD_FOLDER = "uploads"
-app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
+# Werkzeug enforces this while reading the body, chunked requests
+# included; room for the multipart framing around one resume. The
+# scoring API raises it for its own requests.
+app.config["MAX_CONTENT_LENGTH"] = UPLOAD_MAX_BYTES + 64 * 1024
+
+os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+if CREATE_INDEXES:
+    ensure_indexes()
+
+JOBS_PER_PAGE = 20
+
+def object_ids(values):
+    """Valid ObjectIds from a list of id strings, deduplicated."""
+    return list({ObjectId(v) for v in values if v and ObjectId.is_valid(v)})
+
+
+def job_owner(job_id):
+    if not job_id or not ObjectId.is_valid(job_id):
+        return None
+    job = jobs_collection.find_one({"_id": ObjectId(job_id)}, {"created_by": 1})
+    return job.get("created_by") if job else None
+
+# ======================================================
+# METRICS (PROMETHEUS)
+# ======================================================
 
-upload_dir = os.path.join(app.root_path, UPLOAD_FOLDER)
-os.makedirs(upload_dir, exist_ok=True)
+@app.route("/metrics")
+def metrics():
+    body, content_type = render_metrics()
+    return Response(body, headers={"Content-Type": content_type})
+
+@app.errorhandler(413)
+def request_too_large(e):
+    if request.path.startswith("/api/"):
+        return jsonify({"error": f"Request body larger than {SCORING_MAX_BYTES} bytes"}), 413
+    flash(f"❌ Resume too large: file is larger than {UPLOAD_MAX_BYTES // (1024 * 1024)} MB")
+    return redirect("/candidate/upload")
 
 # ======================================================
 # AUTH
@@ -84,9 +129,10 @@ def logout():
 
 @app.route("/candidate/dashboard")
 def candidate_dashboard():
-    resumes = list(
-        resumes_collection.find({"uploaded_by": session.get("user_id")})
-        .sort("uploaded_at", -1)
+    resumes = find_resumes(
+        {"uploaded_by": session.get("user_id")},
+        "dashboard",
+        sort=[("uploaded_at", -1)]
     )
     return render_template("candidate/dashboard.html", resumes=resumes)
 
@@ -98,8 +144,9 @@ def candidate_upload():
 
 @app.route("/candidate/suggestions")
 def candidate_suggestions():
-    resume = resumes_collection.find_one(
+    resume = find_resume(
         {"uploaded_by": session.get("user_id"), "status": "analyzed"},
+        "suggestions",
         sort=[("uploaded_at", -1)]
     )
     return render_template("candidate/suggestions.html", resume=resume)
@@ -111,13 +158,17 @@ def candidate_suggestions():
 
 @app.route("/upload-resume", methods=["POST"])
 def upload_resume():
+    # bodies over MAX_CONTENT_LENGTH never reach here (request_too_large)
     file = request.files.get("resume")
     if not file or file.filename == "":
         flash("❌ No file selected")
         return redirect("/candidate/upload")
 
-    file_path = os.path.join(app.root_path, app.config["UPLOAD_FOLDER"], file.filename)
-    file.save(file_path)
+    try:
+        content_hash, file_path, file_size = store_upload(file.stream, file.filename)
+    except UploadTooLarge as e:
+        flash(f"❌ Resume too large: {e}")
+        return redirect("/candidate/upload")
 
     user_id = session.get("user_id")
 
@@ -130,6 +181,8 @@ def upload_resume():
         "uploaded_by": user_id,
         "filename": file.filename,
         "file_path": file_path,
+        "content_hash": content_hash,
+        "file_size": file_size,
         "uploaded_at": datetime.utcnow(),
         "is_active": True,
         "status": "uploaded"
@@ -146,22 +199,23 @@ def upload_resume():
 def delete_resume(resume_id):
     user_id = session.get("user_id")
 
-    resume = resumes_collection.find_one({
+    resume = find_resume({
         "_id": ObjectId(resume_id),
         "uploaded_by": user_id
-    })
+    }, "delete")
 
     if not resume:
         flash("Resume not found")
         return redirect("/candidate/dashboard")
 
+    resumes_collection.delete_one({"_id": resume["_id"]})
+
     try:
-        if os.path.exists(resume["file_path"]):
-            os.remove(resume["file_path"])
+        release_upload(resume.get("file_path"))
     except:
         pass
-
-    resumes_collection.delete_one({"_id": resume["_id"]})
+    delete_payload(resume["_id"])
+    forget_resume(resume.get("doc_no"))
     flash("🗑️ Resume deleted successfully")
     return redirect("/candidate/dashboard")
 
@@ -173,10 +227,10 @@ def delete_resume(resume_id):
 def analyze_resume():
     user_id = session.get("user_id")
 
-    resume = resumes_collection.find_one({
+    resume = find_resume({
         "uploaded_by": user_id,
         "is_active": True
-    })
+    }, "analyze")
 
     if not resume:
         flash("❌ Upload a resume first")
@@ -188,78 +242,27 @@ def analyze_resume():
         flash("⚠ Resume file not found. Please upload again.")
         return redirect("/candidate/dashboard")
 
-    parsed = parse_resume(file_path)
+    if analysis_in_progress(resume):
+        flash("⏳ Resume analysis already in progress")
+        return redirect(f"/candidate/analysis/{resume['_id']}")
 
-    personal_details = {
-        "name": parsed.get("name"),
-        "email": parsed.get("email"),
-        "phone": parsed.get("phone"),
-        "location": ", ".join(parsed.get("location", []))
-    }
-
-    projects = parsed.get("projects", [])
+    enqueue_analysis(resume["_id"])
 
-    project_text_list = []
-
-    for p in projects:
-        if isinstance(p, dict):
-            project_text_list.append(p.get("name", ""))
-            project_text_list.extend(p.get("points", []))
-        else:
-            project_text_list.append(str(p))
+    flash("⏳ Resume queued for analysis")
+    return redirect(f"/candidate/analysis/{resume['_id']}")
 
-    project_text = " ".join(project_text_list)
 
-    sections = {
-        "skills": parsed.get("skills", ""),
-        "experience": " ".join([e.get("title", "") for e in parsed.get("experience", [])]),
-        "projects": project_text
-    }
+@app.route("/analyze-resume/status/<resume_id>")
+def analyze_resume_status(resume_id):
+    try:
+        status = get_analysis_status(resume_id, session.get("user_id"))
+    except:
+        status = None
 
-    skills_meta = extract_skills_from_sections(sections)
-    skills = [s["skill"] for s in skills_meta]
-
-    raw_text = parsed.get("raw_text", "")
-    summary = raw_text[:400] + "..." if raw_text else "No summary available."
-
-    ats_score = calculate_simple_ats({
-    "skills": skills,
-    "experience": parsed.get("experience", []),
-    "education": parsed.get("education", ""),
-    "raw_text": raw_text
-})
-
-    ats_feedback = generate_ats_feedback(
-        resume_text=raw_text,
-        resume_data={
-            "personal_details": personal_details,
-            "skills": skills,
-            "experience": parsed.get("experience", []),
-            "projects": projects,
-            "education": parsed.get("education", "")
-        },
-        ats_result={"ats_score": ats_score}
-    )
+    if not status:
+        return jsonify({"error": "Resume not found"}), 404
 
-    resumes_collection.update_one(
-        {"_id": resume["_id"]},
-        {"$set": {
-            "personal_details": personal_details,
-            "summary": summary,
-            "skills": skills,
-            "skills_meta": skills_meta,
-            "experience": parsed.get("experience", []),
-            "projects": projects,
-            "education": parsed.get("education", ""),
-            "raw_text": raw_text,
-            "ats_score": ats_score,
-            "ats_feedback": ats_feedback,
-            "status": "analyzed"
-        }}
-    )   
-
-    flash("✅ Resume analyzed successfully")
-    return redirect(f"/candidate/analysis/{resume['_id']}")
+    return jsonify(status)
 
 # ======================================================
 # VIEW ANALYSIS
@@ -267,14 +270,20 @@ def analyze_resume():
 
 @app.route("/candidate/analysis/<resume_id>")
 def candidate_analysis(resume_id):
-    resume = resumes_collection.find_one({"_id": ObjectId(resume_id)})
+    resume = find_resume({"_id": ObjectId(resume_id)}, "analysis")
+
+    # raw_text and parsed sections are only loaded for a finished report
+    if resume and resume.get("status") not in IN_PROGRESS_STATUSES:
+        resume = with_payload(resume)
+
     return render_template("candidate/analysis.html", resume=resume)
 
 
 @app.route("/candidate/analysis/latest")
 def latest_analysis():
-    resume = resumes_collection.find_one(
+    resume = find_resume(
         {"uploaded_by": session.get("user_id"), "status": "analyzed"},
+        "status",
         sort=[("uploaded_at", -1)]
     )
     if not resume:
@@ -321,30 +330,97 @@ def view_recruiter_jobs(recruiter_id):
 
     candidate_id = session.get("user_id")
 
+    page = max(request.args.get("page", 1, type=int), 1)
+
+    total_jobs = jobs_collection.count_documents({"created_by": recruiter_id})
+    pages = max((total_jobs + JOBS_PER_PAGE - 1) // JOBS_PER_PAGE, 1)
+    page = min(page, pages)
+
     jobs = list(
         jobs_collection.find({"created_by": recruiter_id})
         .sort("created_at", -1)
+        .skip((page - 1) * JOBS_PER_PAGE)
+        .limit(JOBS_PER_PAGE)
     )
 
-    # 🔥 Attach application status for each job
-    for job in jobs:
-        application = applications_collection.find_one({
-            "job_id": str(job["_id"]),
-            "candidate_id": candidate_id
-        })
+    # 🔥 Attach application status for every job on the page in one query
+    statuses = {
+        a["job_id"]: a.get("status", "pending")
+        for a in applications_collection.find(
+            {
+                "candidate_id": candidate_id,
+                "job_id": {"$in": [str(job["_id"]) for job in jobs]}
+            },
+            {"job_id": 1, "status": 1}
+        )
+    }
 
-        if application:
-            job["application_status"] = application.get("status", "pending")
-        else:
-            job["application_status"] = None
+    for job in jobs:
+        job["application_status"] = statuses.get(str(job["_id"]))
 
     return render_template(
         "candidate/recruiter_jobs.html",
         recruiter=recruiter,
-        jobs=jobs
+        jobs=jobs,
+        page=page,
+        pages=pages
     )
 
 
+# ======================================================
+# CANDIDATE → JOB RECOMMENDATIONS
+# ======================================================
+
+@app.route("/candidate/recommendations")
+def candidate_recommendations():
+    """
+    /candidate/recommendations?k=10 — best-matching jobs for the active resume
+    """
+    if session.get("role") != "Candidate":
+        return jsonify({"error": "Unauthorized"}), 401
+
+    candidate_id = session.get("user_id")
+    k = min(max(request.args.get("k", 10, type=int), 1), 100)
+
+    resume = find_resume(
+        {"uploaded_by": candidate_id, "is_active": True, "status": "analyzed"},
+        "recommend"
+    )
+    if not resume:
+        return jsonify({"error": "Analyze your resume first"}), 404
+
+    text = " ".join([load_payload(resume["_id"]).get("raw_text") or ""] + list(resume.get("skills") or []))
+
+    applied = [
+        a["job_id"]
+        for a in applications_collection.find({"candidate_id": candidate_id}, {"job_id": 1})
+    ]
+
+    ranked = recommend_jobs(text, k=k, exclude=applied)
+
+    jobs = {
+        str(job["_id"]): job
+        for job in jobs_collection.find(
+            {"_id": {"$in": object_ids([job_id for job_id, _ in ranked])}},
+            {"title": 1, "required_skills": 1, "created_by": 1}
+        )
+    }
+
+    return jsonify({
+        "resume_id": str(resume["_id"]),
+        "results": [
+            {
+                "job_id": job_id,
+                "title": jobs[job_id].get("title"),
+                "recruiter_id": jobs[job_id].get("created_by"),
+                "required_skills": jobs[job_id].get("required_skills", []),
+                "score": round(score * 100, 2)
+            }
+            for job_id, score in ranked
+            if job_id in jobs
+        ]
+    })
+
 # ======================================================
 # CANDIDATE → APPLY TO JOB
 # ======================================================
@@ -364,9 +440,10 @@ def candidate_apply(job_id):
         return redirect("/candidate/recruiters")
 
     # 2️⃣ Get Candidate Resumes
-    resumes = list(
-        resumes_collection.find({"uploaded_by": candidate_id})
-        .sort("uploaded_at", -1)
+    resumes = find_resumes(
+        {"uploaded_by": candidate_id},
+        "apply",
+        sort=[("uploaded_at", -1)]
     )
 
     if request.method == "POST":
@@ -376,25 +453,26 @@ def candidate_apply(job_id):
             flash("Please select a resume")
             return redirect(request.url)
 
-        # 3️⃣ Prevent duplicate apply
-        existing = applications_collection.find_one({
-            "job_id": job_id,
-            "candidate_id": candidate_id
-        })
-
-        if existing:
+        # 3️⃣ Insert Application (unique job_id + candidate_id index
+        #    rejects a duplicate apply)
+        try:
+            application = applications_collection.insert_one({
+                "job_id": job_id,
+                "candidate_id": candidate_id,
+                "recruiter_id": job["created_by"],
+                "resume_id": resume_id,
+                "match_score": 0,
+                "match_status": MATCH_PENDING,
+                "status": "pending",
+                "applied_at": datetime.utcnow()
+            })
+        except DuplicateKeyError:
             flash("You already applied to this job")
             return redirect(request.url)
 
-        # 4️⃣ Insert Application
-        applications_collection.insert_one({
-            "job_id": job_id,
-            "candidate_id": candidate_id,
-            "resume_id": resume_id,
-            "match_score": 0,
-            "status": "pending",
-            "applied_at": datetime.utcnow()
-        })
+        record_application(job["created_by"])
+        # 4️⃣ Job-specific match score, computed in the background
+        enqueue_match_score(application.inserted_id)
 
         flash("Application submitted successfully")
         return redirect(f"/candidate/recruiter/{job['created_by']}")
@@ -416,31 +494,13 @@ def recruiter_dashboard():
 
     recruiter_id = session.get("user_id")
 
-    # Get recruiter jobs
-    recruiter_jobs = list(
-        jobs_collection.find({"created_by": recruiter_id})
-    )
+    # 🔥 O(1): materialized counters kept current by apply / status updates
+    stats = get_recruiter_stats(recruiter_id)
 
-    job_ids = [str(job["_id"]) for job in recruiter_jobs]
-
-    total = applications_collection.count_documents({
-        "job_id": {"$in": job_ids}
-    })
-
-    shortlisted = applications_collection.count_documents({
-        "job_id": {"$in": job_ids},
-        "status": "shortlisted"
-    })
-
-    rejected = applications_collection.count_documents({
-        "job_id": {"$in": job_ids},
-        "status": "rejected"
-    })
-
-    pending = applications_collection.count_documents({
-        "job_id": {"$in": job_ids},
-        "status": "pending"
-    })
+    total = stats["total"]
+    shortlisted = stats["shortlisted"]
+    rejected = stats["rejected"]
+    pending = stats["pending"]
 
     return render_template(
         "recruiter_dashboard.html",
@@ -475,38 +535,65 @@ def recruiter_job_applicants(job_id):
         flash("Job not found")
         return redirect("/recruiter/jobs")
 
+    # 🔥 Best match first, straight off the (job_id, match_score) index;
+    #    scores are precomputed at apply time (backend/match_scores.py)
     applications = list(
-        applications_collection.find({"job_id": job_id})
+        applications_collection.find(
+            {"job_id": job_id},
+            {
+                "candidate_id": 1,
+                "resume_id": 1,
+                "status": 1,
+                "applied_at": 1,
+                "match_score": 1,
+                "match_components": 1,
+                "match_status": 1
+            }
+        ).sort([("match_score", -1), ("applied_at", 1)])
     )
 
-    enriched_apps = []
+    # 🔥 Two batched $in lookups instead of two find_one per application
+    candidate_ids = object_ids(a.get("candidate_id") for a in applications)
+    resume_ids = object_ids(a.get("resume_id") for a in applications)
 
-    for app_doc in applications:
+    candidates = {
+        str(u["_id"]): u
+        for u in users_collection.find(
+            {"_id": {"$in": candidate_ids}},
+            {"name": 1, "email": 1}
+        )
+    }
 
-        try:
-            candidate = users_collection.find_one({
-                "_id": ObjectId(app_doc.get("candidate_id"))
-            })
+    resumes = {
+        str(r["_id"]): r
+        for r in find_resumes({"_id": {"$in": resume_ids}}, "applicant")
+    }
 
-            resume = resumes_collection.find_one({
-                "_id": ObjectId(app_doc["resume_id"])
-        })
+    enriched_apps = []
 
-            enriched_apps.append({
-                "application_id": str(app_doc["_id"]),
-                "candidate_name": candidate.get("name") if candidate else "Unknown",
-                "candidate_email": candidate.get("email") if candidate else "",
-                "resume_filename": resume.get("filename") if resume else "",
-                "ats_score": resume.get("ats_score", 0) if resume else 0,
-                "summary": resume.get("summary", "") if resume else "",
-                "skills": resume.get("skills", []) if resume else [],
-                "status": app_doc.get("status", "pending"),
-                "applied_at": app_doc.get("applied_at")
-            })
+    for app_doc in applications:
 
-        except:
+        if not (ObjectId.is_valid(app_doc.get("candidate_id")) and ObjectId.is_valid(app_doc.get("resume_id"))):
             continue
 
+        candidate = candidates.get(app_doc["candidate_id"])
+        resume = resumes.get(app_doc["resume_id"])
+
+        enriched_apps.append({
+            "application_id": str(app_doc["_id"]),
+            "candidate_name": candidate.get("name") if candidate else "Unknown",
+            "candidate_email": candidate.get("email") if candidate else "",
+            "resume_filename": resume.get("filename") if resume else "",
+            "ats_score": resume.get("ats_score", 0) if resume else 0,
+            "summary": resume.get("summary", "") if resume else "",
+            "skills": resume.get("skills", []) if resume else [],
+            "status": app_doc.get("status", "pending"),
+            "applied_at": app_doc.get("applied_at"),
+            "match_score": app_doc.get("match_score", 0),
+            "match_components": app_doc.get("match_components"),
+            "match_status": app_doc.get("match_status")
+        })
+
     return render_template(
         "recruiter/manage_applicants.html",
         job=job,
@@ -523,30 +610,104 @@ def update_application_status():
     application_id = request.form.get("application_id")
     status = request.form.get("status")
 
-    app_doc = applications_collection.find_one({
-        "_id": ObjectId(application_id)
-    })
+    if status not in APPLICATION_STATUSES:
+        flash("Invalid status")
+        return redirect(request.referrer or "/recruiter-dashboard")
+
+    # 1️⃣ Update application status (returns the previous document, so
+    #    the counters move from the old status to the new one exactly once)
+    app_doc = applications_collection.find_one_and_update(
+        {"_id": ObjectId(application_id)},
+        {"$set": {"status": status}},
+        projection={"job_id": 1, "resume_id": 1, "status": 1, "recruiter_id": 1}
+    )
 
     if not app_doc:
         flash("Application not found")
         return redirect("/recruiter-dashboard")
 
-    # 1️⃣ Update application status
-    applications_collection.update_one(
-        {"_id": ObjectId(application_id)},
-        {"$set": {"status": status}}
-    )
+    recruiter_id = app_doc.get("recruiter_id") or job_owner(app_doc.get("job_id"))
+    if recruiter_id:
+        record_status_change(recruiter_id, app_doc.get("status"), status)
 
-    # 2️⃣ ALSO update resume status (so dashboard counts work)
-    resumes_collection.update_one(
-        {"_id": ObjectId(app_doc["resume_id"])},
-        {"$set": {"status": status}}
-    )
+    # the outcome belongs to the application only: the resume's status
+    # tracks its analysis, which scoring and recommendations filter on
 
     flash(f"Candidate {status.capitalize()} successfully")
 
     return redirect(request.referrer)
 
+# ======================================================
+# RECRUITER → SKILL SEARCH (SOURCING)
+# ======================================================
+
+@app.route("/recruiter/skill-search")
+def recruiter_skill_search():
+    """
+    /recruiter/skill-search?q=python AND docker AND (aws OR azure)&limit=50
+    """
+    if session.get("role") != "Recruiter":
+        return jsonify({"error": "Unauthorized"}), 401
+
+    query = request.args.get("q", "")
+    limit = min(max(request.args.get("limit", 50, type=int), 0), 500)
+
+    try:
+        total, resumes = search_resumes(query, limit=limit)
+    except SkillQueryError as e:
+        return jsonify({"error": f"Invalid query: {e}"}), 400
+
+    return jsonify({
+        "query": query,
+        "total": total,
+        "results": [
+            {
+                "resume_id": str(r["_id"]),
+                "candidate_id": r.get("uploaded_by"),
+                "filename": r.get("filename"),
+                "ats_score": r.get("ats_score"),
+                "skills": r.get("skills", [])
+            }
+            for r in resumes
+        ]
+    })
+
+# ======================================================
+# BATCH SCORING API (ATS INTEGRATIONS)
+# ======================================================
+
+@app.route(f"/api/{SCORING_API_VERSION}/score", methods=["POST"])
+def api_score():
+    """
+    One job against a batch of resumes; streams NDJSON (backend/batch_scoring.py).
+    """
+    # an API key reaches every stored resume, a recruiter only their applicants'
+    if valid_api_key(request.headers.get("Authorization")):
+        recruiter_id = None
+    elif session.get("role") == "Recruiter":
+        recruiter_id = session.get("user_id")
+    else:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    # A body with a Content-Length over the cap is refused by Werkzeug
+    # (request_too_large); a chunked one is cut off at it instead, so read
+    # one byte more to tell the two apart.
+    request.max_content_length = SCORING_MAX_BYTES + 1
+    if len(request.get_data()) > SCORING_MAX_BYTES:
+        return jsonify({"error": f"Request body larger than {SCORING_MAX_BYTES} bytes"}), 413
+
+    try:
+        description, required_skills, refs = parse_batch_request(request.get_json(silent=True))
+    except BatchRequestError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return Response(
+        stream_with_context(stream_scores(description, required_skills, refs, recruiter_id)),
+        mimetype="application/x-ndjson",
+        # let proxies pass each chunk through as it is written
+        headers={"X-Accel-Buffering": "no"}
+    )
+
 # ======================================================
 # RECRUITER JOB MANAGEMENT (PHASE 2)
 # ======================================================
@@ -558,17 +719,30 @@ def recruiter_jobs():
 
     recruiter_id = session.get("user_id")
 
+    # Only what the cards render; the description is cut server-side to
+    # the 150-char preview (+1 so the template still knows to add "...")
     jobs = list(
-        jobs_collection.find({"created_by": recruiter_id})
+        jobs_collection.aggregate([
+            {"$match": {"created_by": recruiter_id}},
+            {"$project": {
+                "title": 1,
+                "created_at": 1,
+                "description": {"$substrCP": [{"$ifNull": ["$description", ""]}, 0, 151]}
+            }}
+        ])
     )
 
+    # 🔥 Count applicants for every job in one aggregation
+    counts = {
+        row["_id"]: row["count"]
+        for row in applications_collection.aggregate([
+            {"$match": {"job_id": {"$in": [str(job["_id"]) for job in jobs]}}},
+            {"$group": {"_id": "$job_id", "count": {"$sum": 1}}}
+        ])
+    }
 
-    # Count applicants per job
     for job in jobs:
-        applicant_count = applications_collection.count_documents({
-            "job_id": str(job["_id"])
-        })
-        job["applicant_count"] = applicant_count
+        job["applicant_count"] = counts.get(str(job["_id"]), 0)
 
     return render_template("recruiter/jobs.html", jobs=jobs)
 
@@ -583,20 +757,73 @@ def create_job():
         required_skills = request.form.get("skills")
         degree = request.form.get("degree")
 
-        jobs_collection.insert_one({
+        job = {
             "title": title,
             "description": description,
-            "required_skills": [s.strip().lower() for s in required_skills.split(",") if s.strip()],
+            "required_skills": list(dict.fromkeys(canonical_skill(s) for s in required_skills.split(",") if s.strip())),
             "degree": degree.lower(),
             "created_by": session.get("user_id"),
-            "created_at": datetime.utcnow()
-        })
+            "created_at": datetime.utcnow(),
+            # lets other workers pick the job up into their recommendation matrix
+            "job_seq": next_sequence("job_seq")
+        }
+        job.update(job_skill_fields(job["required_skills"]))
+        jobs_collection.insert_one(job)
+        record_job(job)
 
         flash("✅ Job created successfully")
         return redirect("/recruiter/jobs")
 
     return render_template("recruiter/create_job.html")
 
+
+@app.route("/recruiter/edit-job/<job_id>", methods=["GET", "POST"])
+def edit_job(job_id):
+    if session.get("role") != "Recruiter":
+        return redirect("/login")
+
+    try:
+        job = jobs_collection.find_one({
+            "_id": ObjectId(job_id),
+            "created_by": session.get("user_id")
+        })
+    except:
+        job = None
+
+    if not job:
+        flash("Job not found")
+        return redirect("/recruiter/jobs")
+
+    if request.method == "POST":
+        required_skills = request.form.get("skills") or ""
+        changes = {
+            "title": request.form.get("title"),
+            "description": request.form.get("description"),
+            "required_skills": list(dict.fromkeys(canonical_skill(s) for s in required_skills.split(",") if s.strip())),
+            "degree": (request.form.get("degree") or "").lower()
+        }
+
+        # only what the match score depends on triggers a rescore
+        rescore = (
+            changes["description"] != job.get("description")
+            or changes["required_skills"] != job.get("required_skills", [])
+        )
+        if rescore:
+            changes["job_seq"] = next_sequence("job_seq")
+            changes.update(job_skill_fields(changes["required_skills"]))
+
+        jobs_collection.update_one({"_id": job["_id"]}, {"$set": changes})
+
+        if rescore:
+            job.update(changes)
+            record_job(job)
+            enqueue_rescore(job_id)
+
+        flash("✅ Job updated successfully")
+        return redirect(f"/recruiter/job/{job_id}")
+
+    return render_template("recruiter/create_job.html", job=job)
+
 import os
 
 if __name__ == "__main__":
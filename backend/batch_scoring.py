@@ -0,0 +1,219 @@
+"""
+Batch scoring for ATS integrations: one job against many resumes, with
+the results streamed back as NDJSON.
+
+    POST /api/v1/score
+    Authorization: Bearer <key from SCORING_API_KEYS>   (or a recruiter session)
+
+    {
+        "job": {"description": "...", "required_skills": ["python", "docker"]},
+        "resumes": [
+            {"id": "a-17", "text": "..."},                  # extracted resume text
+            {"id": "a-18", "resume_id": "<ObjectId>"},      # a resume uploaded here
+            {"id": "a-19", "content_hash": "<sha256>"}      # a file in the upload store
+        ]
+    }
+
+With an API key any stored resume or file can be referenced. A recruiter
+session only reaches resumes (by id, or by the content hash of their
+file) that were used to apply to one of the recruiter's jobs; anything
+else is reported as not found.
+
+Resumes are parsed (parse_document + extract_skills_from_sections,
+through the parse cache) and scored with the calculate_ats_score blend in
+chunks of SCORING_CHUNK_SIZE, one vectorized score_resumes call each.
+Each chunk's lines are written as soon as it is scored, so the client
+reads the first results while the rest are parsed, and the server holds
+one chunk at a time:
+
+    {"type": "result", "index": 0, "id": "a-17", "ats_score": 71.4, "skill_score": 100.0,
+     "semantic_score": 38.0, "section_score": 60, "skills": ["python", "docker"]}
+    {"type": "error", "index": 2, "id": "a-19", "error": "file not found"}
+    {"type": "summary", "scored": 2, "failed": 1, "ranking": [{"index": 0, "id": "a-17", "rank": 1, "ats_score": 71.4}, ...]}
+
+Results are in input order; the closing summary ranks all of them. A
+resume's scores do not depend on the chunking or on the other resumes in
+the request.
+"""
+
+import os
+import hmac
+import json
+
+from bson.objectid import ObjectId
+
+from backend.analysis import parse_with_cache, parse_text_with_cache, resume_scoring_input
+from backend.file_store import find_stored
+from backend.nlp.matcher import score_resumes
+from backend.nlp.skill_extractor import canonical_skill
+from backend.nlp.skill_vocab import encode_job_skills
+from backend.db import jobs_collection, applications_collection
+from backend.repository import find_resumes
+
+API_VERSION = "v1"
+
+SCORING_API_KEYS = [k for k in os.environ.get("SCORING_API_KEYS", "").split(",") if k.strip()]
+SCORING_MAX_RESUMES = int(os.environ.get("SCORING_MAX_RESUMES", 1000))
+SCORING_MAX_BYTES = int(os.environ.get("SCORING_MAX_BYTES", 32 * 1024 * 1024))
+SCORING_CHUNK_SIZE = int(os.environ.get("SCORING_CHUNK_SIZE", 50))
+
+
+class BatchRequestError(ValueError):
+    pass
+
+
+def valid_api_key(authorization):
+    scheme, _, key = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not key:
+        return False
+    return any(hmac.compare_digest(key.strip().encode(), k.strip().encode()) for k in SCORING_API_KEYS)
+
+# ======================================================
+# REQUEST
+# ======================================================
+
+def parse_batch_request(body):
+    """
+    Validate a request body -> (job description, required skills, resume refs).
+    Raises BatchRequestError with a message for the client.
+    """
+    if not isinstance(body, dict):
+        raise BatchRequestError("expected a JSON object")
+
+    job = body.get("job")
+    if not isinstance(job, dict) or not isinstance(job.get("description", ""), str):
+        raise BatchRequestError("job must be an object with a description")
+
+    required_skills = job.get("required_skills") or []
+    if not isinstance(required_skills, list) or not all(isinstance(s, str) for s in required_skills):
+        raise BatchRequestError("job.required_skills must be a list of strings")
+    required_skills = list(dict.fromkeys(canonical_skill(s) for s in required_skills if s.strip()))
+
+    resumes = body.get("resumes")
+    if not isinstance(resumes, list) or not resumes:
+        raise BatchRequestError("resumes must be a non-empty list")
+    if len(resumes) > SCORING_MAX_RESUMES:
+        raise BatchRequestError(f"at most {SCORING_MAX_RESUMES} resumes per request")
+
+    refs = []
+    for index, resume in enumerate(resumes):
+        if not isinstance(resume, dict):
+            raise BatchRequestError(f"resumes[{index}] must be an object")
+        sources = [key for key in ("text", "resume_id", "content_hash") if resume.get(key) is not None]
+        if len(sources) != 1 or not isinstance(resume[sources[0]], str):
+            raise BatchRequestError(f"resumes[{index}] needs exactly one of text, resume_id, content_hash")
+        refs.append({"index": index, "id": resume.get("id", index), "source": sources[0], "value": resume[sources[0]]})
+
+    return job.get("description", ""), required_skills, refs
+
+# ======================================================
+# SCORING
+# ======================================================
+
+def recruiter_job_ids(recruiter_id):
+    return [str(job["_id"]) for job in jobs_collection.find({"created_by": recruiter_id}, {"_id": 1})]
+
+
+def _stored_files(refs, job_ids=None):
+    """
+    (source, value) -> (file_path, content_hash) for a chunk's stored
+    resume refs, in one query. With job_ids (a recruiter session), only
+    resumes applied to those jobs, and content_hash refs are looked up
+    through them too.
+    """
+    ids = [ObjectId(r["value"]) for r in refs if r["source"] == "resume_id" and ObjectId.is_valid(r["value"])]
+    hashes = [r["value"] for r in refs if r["source"] == "content_hash"] if job_ids is not None else []
+
+    clauses = ([{"_id": {"$in": ids}}] if ids else []) + ([{"content_hash": {"$in": hashes}}] if hashes else [])
+    if not clauses:
+        return {}
+    resumes = list(find_resumes({"$or": clauses}, "analyze"))
+
+    if job_ids is not None:
+        applied = set(applications_collection.distinct("resume_id", {
+            "job_id": {"$in": job_ids},
+            "resume_id": {"$in": [str(r["_id"]) for r in resumes]}
+        }))
+        resumes = [r for r in resumes if str(r["_id"]) in applied]
+
+    stored = {}
+    for r in resumes:
+        stored[("resume_id", str(r["_id"]))] = (r.get("file_path"), r.get("content_hash"))
+        if r.get("content_hash"):
+            stored[("content_hash", r["content_hash"])] = (r.get("file_path"), r["content_hash"])
+    return stored
+
+
+def _parse(ref, stored, scoped):
+    if ref["source"] == "text":
+        return parse_text_with_cache(ref["value"])
+
+    if ref["source"] == "content_hash" and not scoped:
+        file_path, content_hash = find_stored(ref["value"]), ref["value"]
+    else:
+        file_path, content_hash = stored.get((ref["source"], ref["value"]), (None, None))
+    if not file_path or not os.path.exists(file_path):
+        raise FileNotFoundError("file not found")
+    return parse_with_cache(file_path, content_hash)
+
+
+def _score_chunk(description, required_skills, skill_ids, refs, job_ids=None):
+    stored = _stored_files(refs, job_ids)
+
+    scored, lines = [], {}
+    for ref in refs:
+        try:
+            parsed, skills_meta, _ = _parse(ref, stored, job_ids is not None)
+        except Exception as e:
+            lines[ref["index"]] = {"type": "error", "index": ref["index"], "id": ref["id"],
+                                   "error": str(e) or e.__class__.__name__}
+            continue
+        scored.append((ref, skills_meta, resume_scoring_input({"_id": ref["id"], **parsed, "skills_meta": skills_meta})))
+
+    if scored:
+        final, skill, semantic, section = score_resumes(
+            description, required_skills, [inputs for _, _, inputs in scored], skill_ids
+        )
+        for i, (ref, skills_meta, _) in enumerate(scored):
+            lines[ref["index"]] = {
+                "type": "result",
+                "index": ref["index"],
+                "id": ref["id"],
+                "ats_score": float(final[i]),
+                "skill_score": float(skill[i]),
+                "semantic_score": float(semantic[i]),
+                "section_score": int(section[i]),
+                "skills": [s["skill"] for s in skills_meta]
+            }
+
+    return [lines[ref["index"]] for ref in refs]
+
+
+def stream_scores(description, required_skills, refs, recruiter_id=None, chunk_size=SCORING_CHUNK_SIZE):
+    """
+    Generator of NDJSON lines (see the module docstring). Stored resumes
+    are limited to the recruiter's applicants when recruiter_id is given.
+    """
+    skill_ids = encode_job_skills(required_skills)
+    job_ids = recruiter_job_ids(recruiter_id) if recruiter_id is not None else None
+    ranking = []
+    failed = 0
+
+    for start in range(0, len(refs), chunk_size):
+        for line in _score_chunk(description, required_skills, skill_ids, refs[start:start + chunk_size], job_ids):
+            if line["type"] == "result":
+                ranking.append((line["ats_score"], line["index"], line["id"]))
+            else:
+                failed += 1
+            yield json.dumps(line) + "\n"
+
+    ranking.sort(key=lambda r: (-r[0], r[1]))
+    yield json.dumps({
+        "type": "summary",
+        "scored": len(ranking),
+        "failed": failed,
+        "ranking": [
+            {"index": index, "id": resume_id, "rank": rank + 1, "ats_score": score}
+            for rank, (score, index, resume_id) in enumerate(ranking)
+        ]
+    }) + "\n"
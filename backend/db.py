@@ -1,12 +1,32 @@
 import os
-from pymongo import MongoClient
+from pymongo import MongoClient, ReturnDocument
+
+from backend.metrics import MongoCommandMetrics
 
 MONGO_URI = os.environ.get("MONGO_URI")
 
-client = MongoClient(MONGO_URI)
+client = MongoClient(MONGO_URI, event_listeners=[MongoCommandMetrics()])
 db = client["resume_db"]
 
 users_collection = db["users"]
 resumes_collection = db["resumes"]
 jobs_collection = db["jobs"]
 applications_collection = db["applications"]
+recruiter_stats_collection = db["recruiter_stats"]
+resume_payloads_collection = db["resume_payloads"]
+counters_collection = db["counters"]
+uploads_collection = db["uploads"]
+skill_tombstones_collection = db["skill_tombstones"]
+
+
+def next_sequence(counter, n=1):
+    """
+    Reserve n consecutive integers from a named counter; returns the first.
+    """
+    doc = counters_collection.find_one_and_update(
+        {"_id": counter},
+        {"$inc": {"seq": n}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return doc["seq"] - n + 1
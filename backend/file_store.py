@@ -0,0 +1,237 @@
+"""
+Content-addressed storage for uploaded resume files.
+
+Uploads are streamed to disk in chunks, hashed (SHA-256) on the way and
+stored once per distinct content under a sharded path:
+
+    <UPLOAD_DIR>/ab/cd/abcd...<64 hex>.pdf
+
+The extension is kept because the parser picks its reader by it. The
+same file uploaded by many candidates is one file on disk. The
+`uploads` collection counts the resume documents that reference each
+stored file; the file is only removed when the last one releases it.
+The content hash is saved on the resume and is what analysis uses as
+the parse cache key, so the file is never hashed twice.
+
+Reference changes and the file operations that go with them run under
+an exclusive lock on the shard (flock), so a store racing a release of
+the same content cannot lose the file. The lock is per host, like the
+upload directory itself.
+
+    python -m backend.file_store backfill   # move files uploaded before the store existed
+"""
+
+import os
+import re
+import sys
+import fcntl
+import hashlib
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+
+from pymongo import ReturnDocument
+
+from backend.db import uploads_collection
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# where uploads were saved by their original filename before the store
+LEGACY_UPLOAD_DIR = os.path.join(BASE_DIR, "backend", "uploads")
+
+UPLOAD_DIR = os.environ.get("UPLOAD_DIR", LEGACY_UPLOAD_DIR)
+UPLOAD_MAX_BYTES = int(os.environ.get("UPLOAD_MAX_BYTES", 10 * 1024 * 1024))
+
+CHUNK_SIZE = 64 * 1024
+
+_EXTENSION = re.compile(r"^\.[a-z0-9]{1,10}$")
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+def file_extension(filename):
+    ext = os.path.splitext(filename or "")[1].lower()
+    return ext if _EXTENSION.match(ext) else ""
+
+
+def stored_path(content_hash, ext, directory=UPLOAD_DIR):
+    return os.path.join(directory, content_hash[:2], content_hash[2:4], content_hash + ext)
+
+
+def find_stored(content_hash, directory=UPLOAD_DIR):
+    """
+    Path of the stored file with this content hash, whatever its
+    extension, or None.
+    """
+    if not re.fullmatch(r"[0-9a-f]{64}", content_hash or ""):
+        return None
+    shard = os.path.dirname(stored_path(content_hash, "", directory))
+    try:
+        names = os.listdir(shard)
+    except OSError:
+        return None
+    for name in names:
+        if name.startswith(content_hash):
+            return os.path.join(shard, name)
+    return None
+
+
+def is_stored(file_path, directory=UPLOAD_DIR):
+    """
+    True for paths of the form <directory>/ab/cd/<hash><ext>.
+    """
+    if not file_path:
+        return False
+    shard = os.path.dirname(os.path.abspath(file_path))
+    return os.path.dirname(os.path.dirname(shard)) == os.path.abspath(directory)
+
+
+def is_legacy_upload(file_path):
+    """
+    True for files saved by name directly in LEGACY_UPLOAD_DIR.
+    """
+    return bool(file_path) and os.path.dirname(os.path.abspath(file_path)) == os.path.abspath(LEGACY_UPLOAD_DIR)
+
+
+@contextmanager
+def _shard_lock(shard):
+    with open(os.path.join(shard, ".lock"), "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+# ======================================================
+# STORE / RELEASE
+# ======================================================
+
+def store_upload(stream, filename, max_bytes=UPLOAD_MAX_BYTES, directory=UPLOAD_DIR):
+    """
+    Stream a file object into the store and take one reference to it.
+    Returns (content_hash, file_path, size). Raises UploadTooLarge, and
+    keeps nothing, once more than max_bytes have been read.
+    """
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".tmp")
+
+    try:
+        digest = hashlib.sha256()
+        size = 0
+        with os.fdopen(fd, "wb") as f:
+            for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(f"file is larger than {max_bytes // (1024 * 1024)} MB")
+                digest.update(chunk)
+                f.write(chunk)
+
+        content_hash = digest.hexdigest()
+        ext = file_extension(filename)
+        path = stored_path(content_hash, ext, directory)
+        shard = os.path.dirname(path)
+        os.makedirs(shard, exist_ok=True)
+
+        with _shard_lock(shard):
+            uploads_collection.update_one(
+                {"_id": content_hash + ext},
+                {"$inc": {"refs": 1}, "$setOnInsert": {"size": size, "created_at": datetime.utcnow()}},
+                upsert=True
+            )
+            if os.path.exists(path):
+                os.remove(tmp_path)
+            else:
+                os.replace(tmp_path, path)
+
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return content_hash, path, size
+
+
+def release_upload(file_path, directory=UPLOAD_DIR):
+    """
+    Drop one reference to a stored file, removing it with the last one.
+    Files uploaded before the store existed (saved by name directly in
+    LEGACY_UPLOAD_DIR) are removed directly. Any other path, such as the
+    source file of a bulk-ingested resume, is never touched. Returns True
+    if the file was removed.
+    """
+    if is_legacy_upload(file_path):
+        if os.path.isfile(file_path):
+            os.remove(file_path)
+            return True
+        return False
+
+    if not is_stored(file_path, directory):
+        return False
+
+    shard = os.path.dirname(file_path)
+    if not os.path.isdir(shard):
+        return False
+
+    with _shard_lock(shard):
+        doc = uploads_collection.find_one_and_update(
+            {"_id": os.path.basename(file_path)},
+            {"$inc": {"refs": -1}},
+            return_document=ReturnDocument.AFTER
+        )
+        # no record: not ours to remove
+        if doc is None or doc["refs"] > 0:
+            return False
+
+        uploads_collection.delete_one({"_id": os.path.basename(file_path), "refs": {"$lte": 0}})
+        if os.path.exists(file_path):
+            os.remove(file_path)
+            return True
+    return False
+
+# ======================================================
+# BACKFILL
+# ======================================================
+
+def backfill():
+    """
+    Move files uploaded before the store existed (saved by their original
+    filename) into it and record their content hash on the resumes.
+    """
+    from backend.db import resumes_collection
+
+    moved, missing = 0, 0
+    legacy = set()
+
+    # bulk-ingested resumes point at their source files, which stay put
+    query = {"file_path": {"$ne": None}, "ingest_source": {"$exists": False}}
+    for resume in resumes_collection.find(query, {"file_path": 1, "filename": 1}):
+        file_path = resume["file_path"]
+        if not is_legacy_upload(file_path):
+            continue
+        if not os.path.exists(file_path):
+            missing += 1
+            continue
+
+        with open(file_path, "rb") as f:
+            content_hash, path, size = store_upload(f, resume.get("filename") or file_path, max_bytes=float("inf"))
+        resumes_collection.update_one(
+            {"_id": resume["_id"]},
+            {"$set": {"file_path": path, "content_hash": content_hash, "file_size": size}}
+        )
+        legacy.add(file_path)
+        moved += 1
+
+    for file_path in legacy:
+        os.remove(file_path)
+
+    return moved, missing
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["backfill"]:
+        print("usage: python -m backend.file_store backfill", file=sys.stderr)
+        sys.exit(2)
+    moved, missing = backfill()
+    print(f"moved {moved} resumes into {UPLOAD_DIR} ({missing} files missing)")
@@ -0,0 +1,115 @@
+"""
+Index bootstrap for every collection.
+
+Idempotent: create_indexes is a no-op for indexes that already exist with
+the same spec. Runs at app startup (disable with CREATE_INDEXES=0) or
+from the command line:
+
+    python -m backend.indexes
+"""
+
+import os
+import logging
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import PyMongoError
+
+from backend.db import (
+    users_collection, resumes_collection, jobs_collection, applications_collection, skill_tombstones_collection
+)
+
+logger = logging.getLogger(__name__)
+
+CREATE_INDEXES = os.environ.get("CREATE_INDEXES", "1").lower() not in ("0", "false", "no", "off")
+
+INDEXES = {
+    users_collection: [
+        # login
+        IndexModel([("email", ASCENDING), ("role", ASCENDING)], name="email_role"),
+        # candidate_recruiters
+        IndexModel([("role", ASCENDING)], name="role")
+    ],
+    resumes_collection: [
+        # candidate_dashboard, candidate_apply, upload_resume
+        IndexModel([("uploaded_by", ASCENDING), ("uploaded_at", DESCENDING)], name="uploaded_by_uploaded_at"),
+        # analyze_resume
+        IndexModel([("uploaded_by", ASCENDING), ("is_active", ASCENDING)], name="uploaded_by_is_active"),
+        # candidate_suggestions, latest_analysis
+        IndexModel(
+            [("uploaded_by", ASCENDING), ("status", ASCENDING), ("uploaded_at", DESCENDING)],
+            name="uploaded_by_status_uploaded_at"
+        ),
+        # skill index: doc_no lookups and incremental catch-up
+        IndexModel(
+            [("doc_no", ASCENDING)],
+            name="doc_no",
+            unique=True,
+            partialFilterExpression={"doc_no": {"$exists": True}}
+        ),
+        IndexModel(
+            [("skills_seq", ASCENDING)],
+            name="skills_seq",
+            partialFilterExpression={"skills_seq": {"$exists": True}}
+        ),
+        # batch scoring: content_hash refs (every $or branch needs an index)
+        IndexModel([("content_hash", ASCENDING)], name="content_hash"),
+        # bulk ingestion upserts
+        IndexModel(
+            [("ingest_source", ASCENDING)],
+            name="ingest_source",
+            unique=True,
+            partialFilterExpression={"ingest_source": {"$exists": True}}
+        )
+    ],
+    jobs_collection: [
+        # recruiter_jobs, recruiter_dashboard, view_recruiter_jobs
+        IndexModel([("created_by", ASCENDING), ("created_at", DESCENDING)], name="created_by_created_at"),
+        # job matrix catch-up
+        IndexModel(
+            [("job_seq", ASCENDING)],
+            name="job_seq",
+            partialFilterExpression={"job_seq": {"$exists": True}}
+        )
+    ],
+    applications_collection: [
+        # duplicate-apply guard: candidate_apply relies on DuplicateKeyError
+        IndexModel([("job_id", ASCENDING), ("candidate_id", ASCENDING)], name="job_id_candidate_id", unique=True),
+        # jobs a candidate already applied to (recommendations)
+        IndexModel([("candidate_id", ASCENDING)], name="candidate_id"),
+        # status counts per job
+        IndexModel([("job_id", ASCENDING), ("status", ASCENDING)], name="job_id_status"),
+        # recruiter_job_applicants, best match first
+        IndexModel([("job_id", ASCENDING), ("match_score", DESCENDING)], name="job_id_match_score"),
+        # rescore after a resume is (re)analyzed
+        IndexModel([("resume_id", ASCENDING)], name="resume_id")
+    ],
+    skill_tombstones_collection: [
+        # skill index catch-up
+        IndexModel([("skills_seq", ASCENDING)], name="skills_seq"),
+        # workers catch up within seconds; a month covers any that lag
+        IndexModel([("created_at", ASCENDING)], name="created_at_ttl", expireAfterSeconds=30 * 24 * 3600)
+    ]
+}
+
+
+def ensure_indexes():
+    """
+    Create all indexes. Failures (e.g. existing duplicates blocking a
+    unique index) are logged per collection and returned.
+    """
+    errors = {}
+    for collection, models in INDEXES.items():
+        try:
+            collection.create_indexes(models)
+        except PyMongoError as e:
+            logger.error("Index creation failed on %s: %s", collection.name, e)
+            errors[collection.name] = str(e)
+    return errors
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    failed = ensure_indexes()
+    for collection, models in INDEXES.items():
+        status = "FAILED: " + failed[collection.name] if collection.name in failed else "ok"
+        print(f"{collection.name}: {', '.join(m.document['name'] for m in models)} [{status}]")
+    raise SystemExit(1 if failed else 0)
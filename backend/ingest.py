@@ -0,0 +1,265 @@
+"""
+Bulk resume ingestion.
+
+Walks a directory or ZIP of resumes, parses them in a process pool and
+writes the analyzed documents to resumes_collection (or to a JSONL file)
+in batches.
+
+    python -m backend.ingest resumes.zip --owner <recruiter_id>
+    python -m backend.ingest ./campus-drive --jsonl out.jsonl --workers 8
+
+Resumable: every source written is appended to a state file, and a rerun
+skips anything already listed there. Mongo writes are upserts keyed by
+the source, so a crash between a write and its checkpoint does not
+produce duplicates on rerun.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import zipfile
+import argparse
+import tempfile
+import multiprocessing
+from datetime import datetime
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+
+# ======================================================
+# SOURCES
+# ======================================================
+
+def iter_sources(path):
+    """
+    Yield (source_id, file_path, zip_member) for every resume under path.
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for member in sorted(archive.namelist()):
+                if member.endswith("/") or not member.lower().endswith(SUPPORTED_EXTENSIONS):
+                    continue
+                yield f"{os.path.abspath(path)}::{member}", path, member
+        return
+
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                file_path = os.path.abspath(os.path.join(root, name))
+                yield file_path, file_path, None
+
+
+def load_state(state_path):
+    if not os.path.exists(state_path):
+        return set()
+    with open(state_path, "r", encoding="utf-8") as f:
+        return {line.rstrip("\n") for line in f if line.strip()}
+
+# ======================================================
+# WORKER (runs in the process pool)
+# ======================================================
+
+def _init_worker():
+    # Load spaCy once per worker process, not once per file
+    from backend.nlp.resume_parser import EXTRACT_LOCATION, get_nlp
+    if EXTRACT_LOCATION:
+        get_nlp()
+
+
+def _process(source):
+    from backend.analysis import analyze_resume_file, STATUS_ANALYZED, STATUS_FAILED
+    from backend.nlp.parse_cache import file_sha256
+
+    source_id, file_path, member = source
+    filename = os.path.basename(member or file_path)
+    tmp_dir = None
+
+    doc = {
+        "ingest_source": source_id,
+        "filename": filename,
+        "file_path": None if member else file_path,
+        "uploaded_at": datetime.utcnow(),
+        "is_active": False
+    }
+
+    try:
+        if member:
+            tmp_dir = tempfile.mkdtemp(prefix="ingest-")
+            with zipfile.ZipFile(file_path) as archive:
+                local_path = os.path.join(tmp_dir, "resume" + os.path.splitext(member)[1].lower())
+                with archive.open(member) as src, open(local_path, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+        else:
+            local_path = file_path
+
+        content_hash = file_sha256(local_path)
+        doc["content_hash"] = content_hash
+        doc.update(analyze_resume_file(local_path, content_hash))
+        doc["status"] = STATUS_ANALYZED
+        doc["analyzed_at"] = datetime.utcnow()
+
+    except Exception as e:
+        doc["status"] = STATUS_FAILED
+        doc["analysis_error"] = str(e) or e.__class__.__name__
+
+    finally:
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return doc
+
+# ======================================================
+# SINKS
+# ======================================================
+
+class MongoSink:
+
+    def __init__(self, owner):
+        from backend.db import resumes_collection
+        self.collection = resumes_collection
+        self.owner = owner
+
+    def write(self, docs):
+        from pymongo import UpdateOne
+        from backend.repository import split_payload, save_payloads
+        from backend.skill_index import record_skills
+
+        ops = []
+        payloads = {}
+        for doc in docs:
+            doc["uploaded_by"] = self.owner
+            light, payloads[doc["ingest_source"]] = split_payload(doc)
+            ops.append(UpdateOne(
+                {"ingest_source": doc["ingest_source"]},
+                {"$set": light},
+                upsert=True
+            ))
+        self.collection.bulk_write(ops, ordered=False)
+
+        # payloads are keyed by resume _id, which upserts only report for
+        # new documents, so look all of them up in one query
+        ids = {
+            r["ingest_source"]: r["_id"]
+            for r in self.collection.find(
+                {"ingest_source": {"$in": list(payloads)}},
+                {"ingest_source": 1}
+            )
+        }
+        save_payloads({ids[source]: payload for source, payload in payloads.items() if payload})
+
+        record_skills({
+            ids[doc["ingest_source"]]: doc.get("skills", [])
+            for doc in docs
+            if doc.get("status") == "analyzed"
+        })
+
+    def close(self):
+        pass
+
+
+def _json_default(value):
+    # encoded skill vectors (skills_vec) as hex
+    return value.hex() if isinstance(value, bytes) else str(value)
+
+
+class JsonlSink:
+
+    def __init__(self, path, owner):
+        self.file = open(path, "a", encoding="utf-8")
+        self.owner = owner
+
+    def write(self, docs):
+        for doc in docs:
+            doc["uploaded_by"] = self.owner
+            self.file.write(json.dumps(doc, default=_json_default) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+# ======================================================
+# DRIVER
+# ======================================================
+
+def ingest(path, sink, state_path, workers=None, batch_size=200, report_every=5.0, out=sys.stderr):
+    done = load_state(state_path)
+    pending = [s for s in iter_sources(path) if s[0] not in done]
+
+    total = len(pending)
+    print(f"{len(done)} already ingested, {total} to go", file=out)
+    if not total:
+        return {"processed": 0, "failed": 0}
+
+    processed = 0
+    failed = 0
+    batch = []
+    started = time.monotonic()
+    last_report = started
+
+    ctx = multiprocessing.get_context("spawn")
+
+    with open(state_path, "a", encoding="utf-8") as state, \
+            ctx.Pool(processes=workers, initializer=_init_worker) as pool:
+
+        def flush():
+            sink.write(batch)
+            # checkpoint only after the batch is durable in the sink
+            state.write("".join(doc["ingest_source"] + "\n" for doc in batch))
+            state.flush()
+            os.fsync(state.fileno())
+            batch.clear()
+
+        for doc in pool.imap_unordered(_process, pending, chunksize=4):
+            batch.append(doc)
+            processed += 1
+            if doc.get("status") == "failed":
+                failed += 1
+
+            if len(batch) >= batch_size:
+                flush()
+
+            now = time.monotonic()
+            if now - last_report >= report_every:
+                rate = processed / (now - started)
+                print(f"{processed}/{total} files  {rate:.1f} files/s  {failed} failed", file=out)
+                last_report = now
+
+        if batch:
+            flush()
+
+    elapsed = time.monotonic() - started
+    print(
+        f"done: {processed} files in {elapsed:.1f}s "
+        f"({processed / elapsed if elapsed else 0:.1f} files/s), {failed} failed",
+        file=out
+    )
+    return {"processed": processed, "failed": failed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-ingest a directory or ZIP of resumes.")
+    parser.add_argument("path", help="directory or .zip of PDF/DOCX/TXT resumes")
+    parser.add_argument("--jsonl", help="write documents to this JSONL file instead of Mongo")
+    parser.add_argument("--owner", help="user id stored as uploaded_by")
+    parser.add_argument("--workers", type=int, default=None, help="parser processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--state", help="checkpoint file (default: <path>.ingest-state)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.path):
+        parser.error(f"{args.path} does not exist")
+
+    state_path = args.state or os.path.abspath(args.path).rstrip(os.sep) + ".ingest-state"
+    sink = JsonlSink(args.jsonl, args.owner) if args.jsonl else MongoSink(args.owner)
+
+    try:
+        ingest(args.path, sink, state_path, workers=args.workers, batch_size=args.batch_size)
+    finally:
+        sink.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Precomputed job matrix for candidate recommendations.
+
+Every job is vectorized once (TF-IDF over description + required_skills,
+using the corpus model from backend.nlp.tfidf_model) and kept in memory
+as a sparse term x job matrix. Recommending jobs for a resume is then one
+transform, one sparse row-times-matrix product that only touches the
+postings of the resume's own terms, and an argpartition for the top k.
+
+Kept current incrementally, like the skill index:
+  - create_job / edit_job stamp the job with a fresh global `job_seq`
+    and call record_job(), which updates this worker's matrix straight
+    away.
+  - Before each query the matrix pulls jobs with a newer job_seq
+    (created or edited in other workers), plus any older seq it has not
+    seen yet in case its write committed late (backend.seq_tracker).
+    One indexed query, usually empty.
+
+New and edited rows go into a small pending block (an edited job's old
+column is masked out) that is stacked into the matrix once it grows past
+COMPACT_THRESHOLD. The matrix is rebuilt when the
+corpus model is refitted. Without a corpus model the vectorizer is
+fitted over the jobs themselves; terms that only appear in jobs created
+after that fit are ignored until the next rebuild.
+"""
+
+import threading
+import numpy as np
+import scipy.sparse as sp
+
+from backend.db import jobs_collection
+from backend.seq_tracker import SeqTracker
+from backend.nlp.tfidf_model import get_model, build_vectorizer, job_text
+
+COMPACT_THRESHOLD = 1000
+
+JOB_PROJECTION = {"description": 1, "required_skills": 1, "job_seq": 1}
+
+
+class JobMatrix:
+
+    def __init__(self, vectorizer=None):
+        self.vectorizer = vectorizer
+        self.job_ids = []
+        self.terms = None            # term x job CSR
+        self.pending_ids = []
+        self.pending = []            # 1 x term CSR rows, not yet stacked
+        self.pending_block = None    # vstack(pending), built on first query
+        self.rows = {}               # job_id -> column
+        self.versions = {}           # job_id -> job_seq of its vector
+        self.dead = []               # columns of replaced vectors
+        self.tracker = SeqTracker()
+        self.loaded = False
+        self.lock = threading.RLock()
+
+    @classmethod
+    def build(cls, vectorizer, jobs):
+        """
+        jobs = iterable of (job_id, text).
+        """
+        index = cls(vectorizer)
+        jobs = list(jobs)
+        index.job_ids = [job_id for job_id, _ in jobs]
+        index.rows = {job_id: i for i, job_id in enumerate(index.job_ids)}
+        if vectorizer is not None and jobs:
+            index.terms = vectorizer.transform([text for _, text in jobs]).T.tocsr()
+        index.loaded = True
+        return index
+
+    def __len__(self):
+        return len(self.job_ids) + len(self.pending_ids)
+
+    def add(self, job_id, text, seq=0):
+        if self.vectorizer is None:
+            return
+        if job_id in self.rows:
+            if seq <= self.versions.get(job_id, 0):
+                return
+            self.dead.append(self.rows[job_id])
+        self.rows[job_id] = len(self)
+        self.versions[job_id] = seq
+        self.pending_ids.append(job_id)
+        self.pending.append(self.vectorizer.transform([text]))
+        self.pending_block = None
+        if len(self.pending) >= COMPACT_THRESHOLD:
+            self.compact()
+
+    def compact(self):
+        if not self.pending:
+            return
+        block = sp.vstack(self.pending).T.tocsr()
+        terms = block if self.terms is None else sp.hstack([self.terms, block]).tocsr()
+        job_ids = self.job_ids + self.pending_ids
+
+        if self.dead:
+            alive = np.ones(len(job_ids), dtype=bool)
+            alive[self.dead] = False
+            terms = terms[:, alive]
+            job_ids = [job_id for job_id, keep in zip(job_ids, alive) if keep]
+            self.rows = {job_id: i for i, job_id in enumerate(job_ids)}
+            self.dead = []
+
+        self.terms = terms
+        self.job_ids = job_ids
+        self.pending_ids = []
+        self.pending = []
+        self.pending_block = None
+
+    def scores(self, text):
+        """
+        Cosine similarity of text against every job, in column order.
+        """
+        scores = np.zeros(len(self), dtype=np.float32)
+        if self.vectorizer is None or not len(self):
+            return scores
+
+        query = self.vectorizer.transform([text or ""])
+        if self.terms is not None:
+            scores[:len(self.job_ids)] = (query @ self.terms).toarray().ravel()
+        if self.pending:
+            if self.pending_block is None:
+                self.pending_block = sp.vstack(self.pending).tocsr()
+            scores[len(self.job_ids):] = (self.pending_block @ query.T).toarray().ravel()
+        if self.dead:
+            scores[self.dead] = 0
+        return scores
+
+    def top_k(self, text, k=10, exclude=()):
+        """
+        [(job_id, score)] for the k best-matching jobs, best first.
+        Jobs in exclude and jobs with no overlap at all are left out.
+        """
+        scores = self.scores(text)
+        for job_id in exclude:
+            if job_id in self.rows:
+                scores[self.rows[job_id]] = 0
+
+        k = min(k, scores.size)
+        if k <= 0:
+            return []
+        if k < scores.size:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(scores.size)
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        ids = self.job_ids + self.pending_ids
+        return [(ids[i], float(scores[i])) for i in top if scores[i] > 0]
+
+
+JOB_MATRIX = JobMatrix()
+
+
+def record_job(job):
+    """
+    Add a just-written job (with _id and job_seq) to this worker's matrix.
+    """
+    if JOB_MATRIX.loaded:
+        with JOB_MATRIX.lock:
+            JOB_MATRIX.add(str(job["_id"]), job_text(job), job.get("job_seq", 0))
+
+
+def _load(model):
+    global JOB_MATRIX
+    jobs = []
+    versions = {}
+    for job in jobs_collection.find({}, JOB_PROJECTION):
+        jobs.append((str(job["_id"]), job_text(job)))
+        versions[str(job["_id"])] = job.get("job_seq", 0)
+
+    vectorizer = model
+    if vectorizer is None and jobs:
+        try:
+            vectorizer = build_vectorizer(max_df=1.0).fit([text for _, text in jobs])
+        except ValueError:
+            # empty vocabulary
+            vectorizer = None
+
+    matrix = JobMatrix.build(vectorizer, jobs)
+    matrix.versions = versions
+    matrix.tracker = SeqTracker.loaded(versions.values())
+    JOB_MATRIX = matrix
+
+
+def _catch_up():
+    seen = []
+    for job in jobs_collection.find(JOB_MATRIX.tracker.query("job_seq"), JOB_PROJECTION).sort("job_seq", 1):
+        JOB_MATRIX.add(str(job["_id"]), job_text(job), job["job_seq"])
+        seen.append(job["job_seq"])
+    JOB_MATRIX.tracker.advance(seen)
+
+
+_load_lock = threading.Lock()
+
+
+def _needs_load(model):
+    if not JOB_MATRIX.loaded:
+        return True
+    # corpus model refitted, or first appeared after a fallback fit
+    if model is not None and model is not JOB_MATRIX.vectorizer:
+        return True
+    # nothing to fit on last time; retry once jobs exist
+    return JOB_MATRIX.vectorizer is None and jobs_collection.count_documents({"job_seq": {"$gt": JOB_MATRIX.tracker.seq}}, limit=1)
+
+
+def get_job_matrix():
+    model = get_model()
+    if _needs_load(model):
+        with _load_lock:
+            if _needs_load(model):
+                _load(model)
+    with JOB_MATRIX.lock:
+        _catch_up()
+    return JOB_MATRIX
+
+
+def recommend_jobs(text, k=10, exclude=()):
+    """
+    [(job_id, score)] for the k jobs closest to a resume text.
+    """
+    matrix = get_job_matrix()
+    with matrix.lock:
+        return matrix.top_k(text, k, exclude)
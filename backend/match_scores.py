@@ -0,0 +1,206 @@
+"""
+Resume-vs-job match scores stored on applications.
+
+Each application carries its job-specific match score and components:
+
+    match_score       0-100, the calculate_ats_score / rank_resumes blend
+    match_components  {"skill", "semantic", "section"}
+    match_status      pending | scored | failed
+    scored_seq        job_seq of the job version that was scored
+
+so the applicants page reads them sorted straight off the
+(job_id, match_score) index instead of scoring on every request.
+
+Scores are computed in the background worker pool:
+  - candidate_apply enqueues the new application;
+  - editing a job's description or required_skills enqueues a batch
+    rescore of that job's applications only;
+  - finishing a resume analysis rescores the applications that use it
+    (an application submitted before its resume was analyzed stays
+    pending until then).
+
+Writes are conditional on scored_seq, so a slow score for an old job
+version never overwrites one for the current version.
+
+    python -m backend.match_scores backfill   # score applications that predate this
+"""
+
+import sys
+import logging
+from datetime import datetime
+from bson.objectid import ObjectId
+from pymongo import UpdateOne
+
+from backend.nlp.matcher import rank_resumes
+from backend.nlp.skill_vocab import job_skill_ids
+from backend.analysis import resume_scoring_input, submit_task, STATUS_ANALYZED
+from backend.db import jobs_collection, applications_collection, resumes_collection
+from backend.recruiter_stats import APPLICATION_STATUSES
+from backend.repository import find_resumes, load_payloads
+
+logger = logging.getLogger(__name__)
+
+MATCH_PENDING = "pending"
+MATCH_SCORED = "scored"
+MATCH_FAILED = "failed"
+
+RESCORE_BATCH = 500
+
+SCORING_PROJECTION = {"resume_id": 1, "job_id": 1}
+
+
+def _object_id(value):
+    if isinstance(value, ObjectId):
+        return value
+    return ObjectId(value) if value and ObjectId.is_valid(value) else None
+
+
+def score_applications(job, applications):
+    """
+    Score a batch of one job's applications in a single rank_resumes call
+    and write the results in one bulk_write. Applications whose resume is
+    not analyzed yet are left pending. Returns the number scored.
+    """
+    seq = job.get("job_seq", 0)
+
+    resume_ids = list({rid for rid in (_object_id(a.get("resume_id")) for a in applications) if rid})
+    resumes = {
+        r["_id"]: r
+        for r in find_resumes({"_id": {"$in": resume_ids}, "status": STATUS_ANALYZED}, "scoring")
+    }
+    payloads = load_payloads(list(resumes))
+
+    inputs = []
+    for app_doc in applications:
+        resume = resumes.get(_object_id(app_doc.get("resume_id")))
+        if not resume:
+            continue
+        scoring_input = resume_scoring_input({**resume, **payloads.get(resume["_id"], {})})
+        scoring_input["id"] = app_doc["_id"]
+        inputs.append(scoring_input)
+
+    ranking = rank_resumes(
+        job.get("description", ""),
+        job.get("required_skills", []),
+        inputs,
+        skill_ids=job_skill_ids(job)
+    )
+
+    now = datetime.utcnow()
+    ops = [
+        UpdateOne(
+            {
+                "_id": result["id"],
+                "$or": [{"scored_seq": {"$exists": False}}, {"scored_seq": {"$lte": seq}}]
+            },
+            {"$set": {
+                "match_score": result["ats_score"],
+                "match_components": {
+                    "skill": result["skill_score"],
+                    "semantic": result["semantic_score"],
+                    "section": result["section_score"]
+                },
+                "match_status": MATCH_SCORED,
+                "scored_seq": seq,
+                "scored_at": now
+            }}
+        )
+        for result in ranking
+    ]
+    if ops:
+        applications_collection.bulk_write(ops, ordered=False)
+    return len(ops)
+
+
+def _mark_failed(query):
+    applications_collection.update_many(query, {"$set": {"match_status": MATCH_FAILED}})
+
+
+def score_application(application_id):
+    app_doc = applications_collection.find_one({"_id": _object_id(application_id)}, SCORING_PROJECTION)
+    job = jobs_collection.find_one({"_id": _object_id(app_doc.get("job_id"))}) if app_doc else None
+    if not job:
+        return
+
+    try:
+        score_applications(job, [app_doc])
+    except Exception:
+        logger.exception("Match scoring failed for application %s", application_id)
+        _mark_failed({"_id": app_doc["_id"]})
+
+
+def rescore_job(job_id):
+    """
+    Rescore every application of one job, RESCORE_BATCH at a time.
+    """
+    job = jobs_collection.find_one({"_id": _object_id(job_id)})
+    if not job:
+        return 0
+
+    scored = 0
+    batch = []
+    try:
+        for app_doc in applications_collection.find({"job_id": str(job["_id"])}, SCORING_PROJECTION):
+            batch.append(app_doc)
+            if len(batch) >= RESCORE_BATCH:
+                scored += score_applications(job, batch)
+                batch = []
+        if batch:
+            scored += score_applications(job, batch)
+    except Exception:
+        logger.exception("Rescoring failed for job %s", job_id)
+        _mark_failed({"job_id": str(job["_id"]), "match_status": {"$ne": MATCH_SCORED}})
+
+    return scored
+
+
+def rescore_resume(resume_id):
+    """
+    Rescore the applications submitted with one resume (one batch per job).
+    """
+    by_job = {}
+    for app_doc in applications_collection.find({"resume_id": str(resume_id)}, SCORING_PROJECTION):
+        by_job.setdefault(app_doc.get("job_id"), []).append(app_doc)
+
+    for job in jobs_collection.find({"_id": {"$in": [j for j in map(_object_id, by_job) if j]}}):
+        try:
+            score_applications(job, by_job[str(job["_id"])])
+        except Exception:
+            logger.exception("Match scoring failed for resume %s on job %s", resume_id, job["_id"])
+
+
+def enqueue_match_score(application_id):
+    submit_task(score_application, str(application_id))
+
+
+def enqueue_rescore(job_id):
+    applications_collection.update_many(
+        {"job_id": str(job_id)},
+        {"$set": {"match_status": MATCH_PENDING}}
+    )
+    submit_task(rescore_job, str(job_id))
+
+
+def backfill():
+    """
+    Score applications created before match scores were stored, and
+    those left pending because their resume's status had been
+    overwritten with an application outcome.
+    """
+    # update_application_status used to copy the outcome onto the resume
+    resumes_collection.update_many(
+        {"status": {"$in": list(APPLICATION_STATUSES)}, "analyzed_at": {"$exists": True}},
+        {"$set": {"status": STATUS_ANALYZED}}
+    )
+
+    job_ids = applications_collection.distinct(
+        "job_id", {"match_status": {"$in": [None, MATCH_PENDING]}}
+    )
+    return sum(rescore_job(job_id) for job_id in job_ids)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["backfill"]:
+        print("usage: python -m backend.match_scores backfill", file=sys.stderr)
+        sys.exit(2)
+    print(f"scored {backfill()} applications")
@@ -0,0 +1,143 @@
+"""
+Prometheus metrics, served as text on /metrics.
+
+    resume_stage_duration_seconds{stage}            parse / analysis stages
+    resume_stage_failures_total{stage}
+    resume_analyses_total{status}                   analyzed | failed
+    parse_cache_lookups_total{result}               hit | miss
+    mongo_command_duration_seconds{endpoint,collection,command}
+    mongo_command_failures_total{endpoint,collection,command}
+
+Stages are timed with `with timed("stage"):` from backend.timing, which
+has no dependencies so the nlp code can use it; importing this module
+registers the observer that records them. Mongo commands are timed
+by a pymongo CommandListener registered on the client in backend/db.py,
+so every call made from a route (labelled with its Flask endpoint) or
+from a background thread (endpoint="background") is covered without
+wrapping each call.
+
+Multiple gunicorn workers: gunicorn.conf.py sets PROMETHEUS_MULTIPROC_DIR
+before the workers start. Each worker then writes its samples to
+mmap'd files in that directory and /metrics aggregates all of them,
+whichever worker serves the scrape. Without it the in-process registry
+is used. Each observation is a lock and a float add (an mmap write in
+multiprocess mode), a few microseconds.
+"""
+
+import os
+from collections import OrderedDict
+
+from flask import has_request_context, request
+from prometheus_client import (
+    CollectorRegistry, Counter, Histogram, REGISTRY, CONTENT_TYPE_LATEST, generate_latest, multiprocess
+)
+from pymongo import monitoring
+
+from backend.timing import add_observer
+
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+MONGO_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+STAGE_SECONDS = Histogram(
+    "resume_stage_duration_seconds",
+    "Time spent in each resume parsing / analysis stage",
+    ["stage"],
+    buckets=STAGE_BUCKETS
+)
+STAGE_FAILURES = Counter(
+    "resume_stage_failures_total",
+    "Resume parsing / analysis stages that raised",
+    ["stage"]
+)
+ANALYSES = Counter(
+    "resume_analyses_total",
+    "Finished background analyses by outcome",
+    ["status"]
+)
+PARSE_CACHE_LOOKUPS = Counter(
+    "parse_cache_lookups_total",
+    "Parse cache lookups by result",
+    ["result"]
+)
+MONGO_SECONDS = Histogram(
+    "mongo_command_duration_seconds",
+    "MongoDB command round-trip time",
+    ["endpoint", "collection", "command"],
+    buckets=MONGO_BUCKETS
+)
+MONGO_FAILURES = Counter(
+    "mongo_command_failures_total",
+    "MongoDB commands that failed",
+    ["endpoint", "collection", "command"]
+)
+
+# ======================================================
+# STAGES
+# ======================================================
+
+def _observe_stage(stage, seconds, failed):
+    if failed:
+        STAGE_FAILURES.labels(stage).inc()
+    STAGE_SECONDS.labels(stage).observe(seconds)
+
+
+add_observer(_observe_stage)
+
+# ======================================================
+# MONGO
+# ======================================================
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """
+    Times every command sent through the client it is registered on.
+    """
+
+    # far more than can be in flight (maxPoolSize is 100 per server);
+    # past it the oldest entries, commands that never reported back
+    # (e.g. their connection was dropped), are discarded
+    MAX_PENDING = 10000
+
+    def __init__(self):
+        # (connection, request_id) -> labels; the endpoint is only known
+        # in started(), which runs on the calling thread
+        self._pending = OrderedDict()
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        self._pending[(event.connection_id, event.request_id)] = (
+            (request.endpoint or "unknown") if has_request_context() else "background",
+            collection if isinstance(collection, str) else "",
+            event.command_name
+        )
+        if len(self._pending) > self.MAX_PENDING:
+            try:
+                self._pending.popitem(last=False)
+            except KeyError:
+                # emptied by other threads in the meantime
+                pass
+
+    def succeeded(self, event):
+        labels = self._pending.pop((event.connection_id, event.request_id), None)
+        if labels:
+            MONGO_SECONDS.labels(*labels).observe(event.duration_micros / 1e6)
+
+    def failed(self, event):
+        labels = self._pending.pop((event.connection_id, event.request_id), None)
+        if labels:
+            MONGO_SECONDS.labels(*labels).observe(event.duration_micros / 1e6)
+            MONGO_FAILURES.labels(*labels).inc()
+
+# ======================================================
+# EXPOSITION
+# ======================================================
+
+def render_metrics():
+    """
+    (body, content type) for the /metrics endpoint.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
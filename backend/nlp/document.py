@@ -0,0 +1,74 @@
+import re
+from functools import cached_property
+
+from backend.nlp.taxonomy import normalize_lowercase
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class ResumeDocument:
+    """
+    A resume's extracted text plus the derived views the pipeline stages
+    read, each computed on first use and memoized:
+
+        clean_text      whitespace collapsed to single spaces (contact details)
+        lower           lowercased raw text (feedback keyword checks)
+        normalized      lowercase [a-z0-9] tokens, single-spaced (skill matching)
+        tokens          normalized.split()
+        lines           raw_text.split("\\n")
+        word_count      whitespace-separated words
+        section_spans   {section: [(start, end)]} into raw_text
+        section(key)    a section's cleaned body, sliced on demand
+
+    Create one per resume and pass it along instead of the bare string,
+    so each view is computed once per analysis however many stages use it.
+    """
+
+    def __init__(self, raw_text):
+        self.raw_text = raw_text or ""
+        self._sections = {}
+
+    def __len__(self):
+        return len(self.raw_text)
+
+    @cached_property
+    def clean_text(self):
+        return _WHITESPACE.sub(" ", self.raw_text)
+
+    @cached_property
+    def lower(self):
+        return self.raw_text.lower()
+
+    @cached_property
+    def normalized(self):
+        return normalize_lowercase(self.lower)
+
+    @cached_property
+    def tokens(self):
+        return self.normalized.split()
+
+    @cached_property
+    def lines(self):
+        return self.raw_text.split("\n")
+
+    @cached_property
+    def word_count(self):
+        return len(self.raw_text.split())
+
+    @cached_property
+    def section_spans(self):
+        from backend.nlp.resume_parser import section_spans
+        return section_spans(self.raw_text)
+
+    def section(self, key):
+        if key not in self._sections:
+            from backend.nlp.resume_parser import section_text
+            self._sections[key] = section_text(self.raw_text, self.section_spans.get(key, ()))
+        return self._sections[key]
+
+
+def as_document(text):
+    """
+    A ResumeDocument for text, or text itself if it already is one.
+    """
+    return text if isinstance(text, ResumeDocument) else ResumeDocument(text)
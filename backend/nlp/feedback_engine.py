@@ -1,4 +1,10 @@
+from backend.nlp.document import as_document
+
+
 def generate_ats_feedback(resume_text, resume_data, ats_result):
+    """
+    resume_text: a string, or the ResumeDocument of the analysis.
+    """
 
     suggestions = []
 
@@ -8,7 +14,8 @@ def generate_ats_feedback(resume_text, resume_data, ats_result):
     experience = resume_data.get("experience", [])
     projects = resume_data.get("projects", [])
     education = resume_data.get("education", "")
-    raw_text = resume_text.lower()
+    document = as_document(resume_text)
+    raw_text = document.lower
 
     # ================= ATS SCORE =================
     if ats_score < 40:
@@ -49,7 +56,7 @@ def generate_ats_feedback(resume_text, resume_data, ats_result):
         )
 
     # ================= RESUME LENGTH =================
-    if len(raw_text.split()) < 250:
+    if document.word_count < 250:
         suggestions.append(
             "Resume is too short. Add more details about projects, skills and responsibilities."
         )
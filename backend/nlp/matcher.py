@@ -1,54 +1,72 @@
 import math
-from sklearn.feature_extraction.text import TfidfVectorizer
+import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
 
+from backend.nlp.tfidf_model import get_model, build_vectorizer
+from backend.nlp.skill_vocab import encode_job_skills, skill_mask, stack_resume_vectors
+
 
 # -------------------------
 # 1️⃣ SEMANTIC SIMILARITY
 # -------------------------
 
 def semantic_similarity(resume_text, job_description):
+    model = get_model()
+
+    # No corpus model yet: fall back to a throwaway two-document fit
+    if model is None:
+        return _pairwise_similarity(resume_text, job_description)
+
+    tfidf = model.transform([resume_text or "", job_description or ""])
+    similarity = tfidf[0].multiply(tfidf[1]).sum()
+
+    return round(float(similarity) * 100, 2)
+
+
+def _pairwise_similarity(resume_text, job_description):
     documents = [resume_text, job_description]
 
-    vectorizer = TfidfVectorizer(
-        stop_words="english",
-        ngram_range=(1, 2),
-        max_df=0.85
-    )
+    # max_df would prune every term the two documents share
+    vectorizer = build_vectorizer(max_df=1.0)
 
-    tfidf = vectorizer.fit_transform(documents)
+    try:
+        tfidf = vectorizer.fit_transform(documents)
+    except ValueError:
+        # empty vocabulary (blank or stop-word-only documents)
+        return 0.0
     similarity = cosine_similarity(tfidf[0:1], tfidf[1:2])[0][0]
 
-    return round(similarity * 100, 2)
+    return round(float(similarity) * 100, 2)
 
 
 # -------------------------
 # 2️⃣ SKILL MATCH SCORE
 # -------------------------
 
-def skill_match_score(resume_skills, required_skills):
+def skill_match_score(resume_skills, required_skills, required_count=None):
     """
     resume_skills = [
         {"skill": "python", "confidence": 1.0},
         {"skill": "flask", "confidence": 0.7}
     ]
     required_skills = ["python", "flask", "sql"]
+
+    Either argument may also be already encoded (skill_vocab): skills_vec
+    bytes or a SKILL_DTYPE array for the resume, taxonomy ids for the job
+    (then pass required_count, the length of the original list).
     """
 
-    if not required_skills:
+    required_count = len(required_skills) if required_count is None else required_count
+    if not required_count:
         return 0
 
-    matched = 0
-    weighted_score = 0
+    return float(batch_skill_scores([resume_skills], required_skills, required_count)[0])
 
-    for req in required_skills:
-        for rs in resume_skills:
-            if req.lower() == rs["skill"]:
-                matched += 1
-                weighted_score += rs["confidence"]
 
-    raw_score = weighted_score / len(required_skills)
-    return round(min(raw_score * 100, 100), 2)
+def _job_mask(required_skills):
+    if isinstance(required_skills, np.ndarray):
+        return skill_mask(required_skills)
+    return skill_mask(encode_job_skills(required_skills))
 
 
 # -------------------------
@@ -113,6 +131,131 @@ def calculate_ats_score(resume_text, job_description, resume_skills, sections, r
         "section_score": section_score
     }
 
+# -------------------------
+# 🚀 BATCH RANKING (ONE JOB × N RESUMES)
+# -------------------------
+
+def batch_semantic_scores(job_description, resume_texts):
+    """
+    Cosine similarity of every resume against the job, from one sparse
+    TF-IDF matrix. Returns a float array of 0–100 scores.
+
+    Without a corpus model each resume is fitted pairwise with the job,
+    as semantic_similarity does, so a score never depends on which other
+    resumes are in the batch.
+    """
+    if not resume_texts:
+        return np.zeros(0)
+
+    model = get_model()
+    if model is None:
+        return np.array([_pairwise_similarity(t or "", job_description or "") for t in resume_texts])
+
+    documents = [job_description or ""] + [t or "" for t in resume_texts]
+    tfidf = model.transform(documents)
+
+    # rows are L2-normalized, so the dot product is the cosine
+    similarity = np.asarray((tfidf[1:] @ tfidf[0].T).todense(), dtype=float).ravel()
+    return np.round(similarity * 100, 2)
+
+
+def batch_skill_scores(resume_skills_list, required_skills, required_count=None):
+    """
+    Vectorized skill_match_score for N resumes: the confidences (x100) of
+    every resume skill, kept where the job's skill mask is set and summed
+    per resume.
+
+    required_count is the score's denominator, len(required_skills) by
+    default; pass it when required_skills are encoded ids, since skills
+    outside the taxonomy still count as missing.
+    """
+    n = len(resume_skills_list)
+    required_count = len(required_skills) if required_count is None else required_count
+    if not required_count or not n:
+        return np.zeros(n)
+
+    mask = _job_mask(required_skills)
+    rows, ids, confidences = stack_resume_vectors(resume_skills_list)
+
+    weighted = np.bincount(rows, weights=confidences * mask[ids], minlength=n) / 100
+
+    raw_score = weighted / required_count
+    return np.round(np.minimum(raw_score * 100, 100), 2)
+
+
+def batch_section_scores(sections_list):
+    """
+    Vectorized section_quality_score for N resumes.
+    """
+    experience = np.array([len(s.get("experience", "") or "") for s in sections_list])
+    projects = np.array([len(s.get("projects", "") or "") for s in sections_list])
+    certifications = np.array([bool(s.get("certifications")) for s in sections_list])
+
+    score = (
+        np.where(experience > 200, 40, np.where(experience > 80, 25, 0)) +
+        np.where(projects > 100, 35, np.where(projects > 40, 20, 0)) +
+        np.where(certifications, 25, 0)
+    )
+
+    return np.minimum(score, 100)
+
+
+def score_resumes(job_description, required_skills, resumes, skill_ids=None):
+    """
+    Component and final scores of N resumes against one job, in input
+    order, as arrays: (final, skill, semantic, section). Takes the same
+    arguments as rank_resumes.
+    """
+    semantic = batch_semantic_scores(job_description, [r.get("text", "") for r in resumes])
+    skill = batch_skill_scores(
+        [r.get("skills", []) for r in resumes],
+        required_skills if skill_ids is None else skill_ids,
+        required_count=len(required_skills)
+    )
+    section = batch_section_scores([r.get("sections", {}) for r in resumes])
+
+    final = np.round(0.5 * skill + 0.3 * semantic + 0.2 * section, 2)
+    return final, skill, semantic, section
+
+
+def rank_resumes(job_description, required_skills, resumes, skill_ids=None):
+    """
+    Score N resumes against one job in a single vectorized pass.
+
+    resumes = [
+        {
+            "id": "...",
+            "text": "...",
+            "skills": [{"skill": "python", "confidence": 1.0}],   # or a skill_vocab vector
+            "sections": {"experience": "...", "projects": "...", "certifications": "..."}
+        }
+    ]
+
+    skill_ids are the job's stored skill_vocab ids, if it has them, so
+    only its length is read from required_skills.
+
+    Returns the resumes ranked best first, each with the same component
+    scores as calculate_ats_score.
+    """
+    if not resumes:
+        return []
+
+    final, skill, semantic, section = score_resumes(job_description, required_skills, resumes, skill_ids)
+
+    order = np.argsort(-final, kind="stable")
+
+    return [
+        {
+            "id": resumes[i].get("id"),
+            "rank": rank + 1,
+            "ats_score": float(final[i]),
+            "skill_score": float(skill[i]),
+            "semantic_score": float(semantic[i]),
+            "section_score": int(section[i])
+        }
+        for rank, i in enumerate(order)
+    ]
+
 def calculate_simple_ats(resume):
     """
     Improved professional ATS scoring (0–100)
@@ -125,7 +268,10 @@ def calculate_simple_ats(resume):
     # 1️⃣ SKILLS (40%)
     # =========================
     skills = resume.get("skills", [])
-    unique_skills = len(set(skills))
+    if isinstance(skills, np.ndarray):
+        unique_skills = len(skills)
+    else:
+        unique_skills = len(set(skills))
 
     # Normalize skill score (assuming 12 skills = strong profile)
     skill_score = min((unique_skills / 12) * 40, 40)
@@ -0,0 +1,181 @@
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+from backend.nlp.taxonomy import get_taxonomy
+
+# ======================================================
+# PARSE RESULT CACHE
+# ======================================================
+#
+# Keyed by SHA-256 of the file bytes plus PIPELINE_VERSION, so the same
+# PDF uploaded again (by anyone) skips text extraction and spaCy. Bump
+# PIPELINE_VERSION whenever parse_resume or the skill extractor changes
+# what they return. The compiled skill taxonomy's digest is part of the
+# key too, so editing the taxonomy source invalidates cached skills.
+#
+# Two tiers:
+#   - in-process LRU, bounded by entry count
+#   - JSON files on local disk, sharded by hash prefix, bounded by total
+#     size with least-recently-used eviction
+
+PIPELINE_VERSION = "5"
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+PARSE_CACHE_DIR = os.environ.get("PARSE_CACHE_DIR", os.path.join(BASE_DIR, "cache", "parse"))
+PARSE_CACHE_MAX_BYTES = int(os.environ.get("PARSE_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+PARSE_CACHE_MEMORY_ITEMS = int(os.environ.get("PARSE_CACHE_MEMORY_ITEMS", 256))
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(content_hash, variant=""):
+    key = f"{content_hash}-v{PIPELINE_VERSION}-{get_taxonomy().digest[:8]}"
+    return f"{key}-{variant}" if variant else key
+
+
+class ParseCache:
+
+    def __init__(self, directory=PARSE_CACHE_DIR, max_bytes=PARSE_CACHE_MAX_BYTES,
+                 memory_items=PARSE_CACHE_MEMORY_ITEMS):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = None
+
+    # -------------------------
+    # PUBLIC
+    # -------------------------
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+
+        value = self._disk_get(key)
+        if value is not None:
+            self._memory_put(key, value)
+        return value
+
+    def put(self, key, value):
+        self._memory_put(key, value)
+        if self.directory and self.max_bytes > 0:
+            self._disk_put(key, value)
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+
+    # -------------------------
+    # MEMORY TIER
+    # -------------------------
+
+    def _memory_put(self, key, value):
+        if self.memory_items <= 0:
+            return
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    # -------------------------
+    # DISK TIER
+    # -------------------------
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def _disk_get(self, key):
+        if not self.directory:
+            return None
+
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # mtime doubles as last-used time for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def _disk_put(self, key, value):
+        path = self._path(key)
+        shard = os.path.dirname(path)
+
+        try:
+            os.makedirs(shard, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=shard, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f, default=str)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError):
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan()[1]
+            else:
+                self._disk_bytes += size
+            over = self._disk_bytes > self.max_bytes
+
+        if over:
+            self._evict()
+
+    def _scan(self):
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        return entries, total
+
+    def _evict(self):
+        # Trim to 90% of the cap so every write doesn't trigger a scan
+        entries, total = self._scan()
+        target = int(self.max_bytes * 0.9)
+
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+        with self._lock:
+            self._disk_bytes = total
+
+
+PARSE_CACHE = ParseCache()
@@ -1,43 +1,237 @@
+import os
 import re
-import spacy
+import time
+import threading
+import multiprocessing
 import PyPDF2
 import docx
 import phonenumbers
 from collections import defaultdict
 
-nlp = spacy.load("en_core_web_sm")
+from backend.timing import timed
+from backend.nlp.document import ResumeDocument
+
+# ======================================================
+# SPACY (LAZY)
+# ======================================================
+
+SPACY_MODEL = os.environ.get("SPACY_MODEL", "en_core_web_sm")
+
+# Set EXTRACT_LOCATION=0 to skip NER entirely (spaCy is then never loaded)
+EXTRACT_LOCATION = os.environ.get("EXTRACT_LOCATION", "1").lower() not in ("0", "false", "no", "off")
+
+# Only NER is used. In the sm/md/lg pipelines "ner" carries its own
+# tok2vec layer, so everything else can be left out of the load.
+SPACY_EXCLUDE = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+
+_nlp = None
+_nlp_lock = threading.Lock()
+
+
+def get_nlp():
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                import spacy
+                _nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+    return _nlp
 
 # ======================================================
 # TEXT EXTRACTION
 # ======================================================
 
-def extract_text_from_pdf(file_path):
-    text = ""
+# Limits applied to every format. A "page" for DOCX/TXT is CHARS_PER_PAGE
+# characters. 0 disables either limit.
+#
+# The time budget is checked between pages, which stops a long document
+# early but not a pathological PDF/DOCX whose parser hangs in one call
+# (opening the file, or one page's extract_text). Those formats are read
+# in a child process, killed once it runs EXTRACT_GRACE seconds past the
+# budget; extract_resume_text then raises ExtractionTimeout.
+MAX_PAGES = int(os.environ.get("RESUME_MAX_PAGES", 10))
+TIME_BUDGET = float(os.environ.get("RESUME_TIME_BUDGET", 10))
+HEADER_PAGES = int(os.environ.get("RESUME_HEADER_PAGES", 1))
+EXTRACT_GRACE = float(os.environ.get("RESUME_EXTRACT_GRACE", 5))
+CHARS_PER_PAGE = 4000
+
+ISOLATED_FORMATS = (".pdf", ".docx")
+
+
+class ExtractionTimeout(TimeoutError):
+    pass
+
+
+def _deadline(time_budget):
+    return time.monotonic() + time_budget if time_budget else None
+
+
+def _expired(deadline):
+    return deadline is not None and time.monotonic() > deadline
+
+
+def iter_pdf_pages(file_path, max_pages=MAX_PAGES, time_budget=TIME_BUDGET):
+    deadline = _deadline(time_budget)
+
     with open(file_path, "rb") as f:
-        reader = PyPDF2.PdfReader(f)
-        for page in reader.pages:
-            text += page.extract_text() or ""
-    return text
+        reader = PyPDF2.PdfReader(f, strict=False)
+        for i, page in enumerate(reader.pages):
+            if (max_pages and i >= max_pages) or _expired(deadline):
+                break
+            try:
+                yield page.extract_text() or ""
+            except Exception:
+                # skip a malformed page rather than losing the document
+                continue
 
 
-def extract_text_from_docx(file_path):
+def iter_docx_pages(file_path, max_pages=MAX_PAGES, time_budget=TIME_BUDGET):
+    deadline = _deadline(time_budget)
     doc = docx.Document(file_path)
-    return "\n".join(p.text for p in doc.paragraphs)
 
+    page = []
+    size = 0
+    pages = 0
+
+    for p in doc.paragraphs:
+        if _expired(deadline):
+            break
+        page.append(p.text)
+        size += len(p.text) + 1
+        if size >= CHARS_PER_PAGE:
+            yield "\n".join(page)
+            pages += 1
+            page, size = [], 0
+            if max_pages and pages >= max_pages:
+                return
+
+    if page:
+        yield "\n".join(page)
+
+
+def iter_txt_pages(file_path, max_pages=MAX_PAGES, time_budget=TIME_BUDGET):
+    deadline = _deadline(time_budget)
 
-def extract_text_from_txt(file_path):
     with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-        return f.read()
+        pages = 0
+        while not (max_pages and pages >= max_pages) and not _expired(deadline):
+            chunk = f.read(CHARS_PER_PAGE)
+            if not chunk:
+                break
+            yield chunk
+            pages += 1
+
+
+# extension -> (page iterator, separator used to join pages)
+PAGE_READERS = {
+    ".pdf": (iter_pdf_pages, "\n"),
+    ".docx": (iter_docx_pages, "\n"),
+    ".txt": (iter_txt_pages, "")
+}
+
+
+def iter_resume_pages(file_path, max_pages=MAX_PAGES, time_budget=TIME_BUDGET):
+    reader = PAGE_READERS.get(os.path.splitext(file_path)[1].lower())
+    if not reader:
+        return iter(())
+    return reader[0](file_path, max_pages=max_pages, time_budget=time_budget)
+
+
+def extract_text_from_pdf(file_path, max_pages=MAX_PAGES, time_budget=TIME_BUDGET):
+    return "\n".join(iter_pdf_pages(file_path, max_pages, time_budget))
+
+
+def extract_text_from_docx(file_path, max_pages=MAX_PAGES, time_budget=TIME_BUDGET):
+    return "\n".join(iter_docx_pages(file_path, max_pages, time_budget))
+
+
+def extract_text_from_txt(file_path, max_pages=MAX_PAGES, time_budget=TIME_BUDGET):
+    return "".join(iter_txt_pages(file_path, max_pages, time_budget))
+
+
+def _join_pages(file_path, max_pages, time_budget):
+    separator = PAGE_READERS[os.path.splitext(file_path)[1].lower()][1]
+    return separator.join(iter_resume_pages(file_path, max_pages, time_budget))
 
 
-def extract_resume_text(file_path):
-    if file_path.endswith(".pdf"):
-        return extract_text_from_pdf(file_path)
-    if file_path.endswith(".docx"):
-        return extract_text_from_docx(file_path)
-    if file_path.endswith(".txt"):
-        return extract_text_from_txt(file_path)
-    return ""
+_context = None
+_context_lock = threading.Lock()
+
+
+def _get_context():
+    # A fork server with this module preloaded starts each reader in a few
+    # milliseconds, without forking the (threaded) web worker itself.
+    global _context
+    with _context_lock:
+        if _context is None:
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                _context = multiprocessing.get_context("forkserver")
+                _context.set_forkserver_preload([__name__])
+            else:
+                _context = multiprocessing.get_context("spawn")
+        return _context
+
+
+def _read_in_child(conn, file_path, max_pages, time_budget):
+    try:
+        conn.send((True, _join_pages(file_path, max_pages, time_budget)))
+    except Exception as e:
+        conn.send((False, str(e) or e.__class__.__name__))
+    finally:
+        conn.close()
+
+
+def _read_isolated(file_path, max_pages, time_budget):
+    context = _get_context()
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_read_in_child, args=(sender, file_path, max_pages, time_budget), daemon=True)
+    process.start()
+    sender.close()
+
+    try:
+        if not receiver.poll(time_budget + EXTRACT_GRACE):
+            raise ExtractionTimeout(f"reading the file took longer than {time_budget + EXTRACT_GRACE:g} seconds")
+        ok, value = receiver.recv()
+    except EOFError:
+        raise ValueError("could not read the file")
+    finally:
+        receiver.close()
+        if process.is_alive():
+            process.kill()
+        process.join()
+
+    if not ok:
+        raise ValueError(value)
+    return value
+
+
+def extract_resume_text(file_path, max_pages=MAX_PAGES, time_budget=TIME_BUDGET, header_only=False):
+    """
+    Text of a PDF/DOCX/TXT resume, bounded by page count and time budget.
+    header_only reads just the first HEADER_PAGES pages.
+    """
+    if header_only:
+        max_pages = min(max_pages, HEADER_PAGES) if max_pages else HEADER_PAGES
+
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext not in PAGE_READERS:
+        return ""
+
+    with timed("extract_text_" + ext[1:]):
+        if time_budget and ext in ISOLATED_FORMATS:
+            return _read_isolated(file_path, max_pages, time_budget)
+        return _join_pages(file_path, max_pages, time_budget)
+
+
+def extract_resume_text_timed(file_path, max_pages=MAX_PAGES, time_budget=TIME_BUDGET):
+    """
+    (text, in_time) where in_time is False if reading ran past the time
+    budget (checked between pages), so the text may have been cut short
+    by it and a retry on a less loaded worker could read more.
+    """
+    started = time.monotonic()
+    text = extract_resume_text(file_path, max_pages, time_budget)
+    return text, not (time_budget and time.monotonic() - started > time_budget)
 
 
 # ======================================================
@@ -57,8 +251,10 @@ def extract_phone(text):
     return None
 
 
-def extract_name(text, email):
-    lines = [l.strip() for l in text.split("\n")[:10] if l.strip()]
+def extract_name(text, email, lines=None):
+    if lines is None:
+        lines = text.split("\n")
+    lines = [l.strip() for l in lines[:10] if l.strip()]
     blacklist = re.compile(r"(email|phone|contact|skills|experience|education|project)", re.I)
 
     for line in lines:
@@ -72,7 +268,10 @@ def extract_name(text, email):
 
 
 def extract_location(text):
-    doc = nlp(text[:1200])
+    if not EXTRACT_LOCATION:
+        return []
+
+    doc = get_nlp()(text[:1200])
     locations = []
 
     for ent in doc.ents:
@@ -109,29 +308,75 @@ SECTION_HEADERS = {
 }
 
 
-def split_sections(text):
-    sections = defaultdict(list)
+# One anchored, case-insensitive alternation over every header phrase,
+# compiled once. A line is a header only if, apart from a little
+# decoration ("== ", ":", "•"), the whole line is one of the phrases, so
+# body lines that merely mention "research" or "employment" are not.
+# finditer walks the text once in MULTILINE mode instead of normalizing
+# and testing each line against each header.
+_HEADER_DECORATION = r"[^\S\n]*[^\w\n]{0,4}[^\S\n]*"
+
+
+def _compile_headers(section_headers):
+    groups = []
+    for key, phrases in section_headers.items():
+        # longest first so "work experience" wins over "experience"
+        alternatives = sorted(phrases, key=len, reverse=True)
+        groups.append(
+            f"(?P<{key}>"
+            + "|".join(r"[^\S\n]+".join(map(re.escape, p.split())) for p in alternatives)
+            + ")"
+        )
+    return re.compile(
+        "^" + _HEADER_DECORATION + "(?:" + "|".join(groups) + ")" + _HEADER_DECORATION + "$",
+        re.IGNORECASE | re.MULTILINE
+    )
+
+
+SECTION_HEADER_RE = _compile_headers(SECTION_HEADERS)
+
+
+def section_spans(text):
+    """
+    {section: [(start, end), ...]} offsets of each section's body in text,
+    in document order. Text before the first header belongs to no section.
+    Nothing is copied; slice text[start:end] where a body is needed.
+    """
+    spans = defaultdict(list)
     current = None
+    body_start = 0
 
-    for line in text.split("\n"):
-        clean = line.strip()
-        lower = clean.lower()
-        normalized = re.sub(r"[^a-z\s]", "", lower)
+    for match in SECTION_HEADER_RE.finditer(text):
+        if current:
+            spans[current].append((body_start, match.start()))
+        current = match.lastgroup
+        body_start = match.end() + 1
 
-        matched = None
-        for key, headers in SECTION_HEADERS.items():
-            if any(h in normalized for h in headers):
-                matched = key
-                break
+    if current:
+        spans[current].append((min(body_start, len(text)), len(text)))
 
-        if matched:
-            current = matched
-            continue
+    return dict(spans)
 
-        if current and clean:
-            sections[current].append(clean)
 
-    return {k: "\n".join(v).strip() for k, v in sections.items() if v}
+def section_text(text, spans):
+    """
+    Body of a section from its spans: stripped, non-blank lines.
+    """
+    return "\n".join(
+        line.strip()
+        for start, end in spans
+        for line in text[start:end].split("\n")
+        if line.strip()
+    )
+
+
+def split_sections(text):
+    sections = {}
+    for key, spans in section_spans(text).items():
+        body = section_text(text, spans)
+        if body:
+            sections[key] = body
+    return sections
 
 
 # ======================================================
@@ -217,28 +462,61 @@ def parse_projects(text):
 # ======================================================
 
 def parse_resume(file_path):
-    raw_text = extract_resume_text(file_path)
-    clean_text = re.sub(r"\s+", " ", raw_text)
+    return parse_document(ResumeDocument(extract_resume_text(file_path)))
+
+
+def parse_document(document):
+    raw_text = document.raw_text
+    section = document.section
 
-    sections = split_sections(raw_text)
+    with timed("split_sections"):
+        document.section_spans
 
-    email = extract_email(clean_text)
+    with timed("contact_details"):
+        email = extract_email(document.clean_text)
+        name = extract_name(raw_text, email, document.lines)
+
+    with timed("phonenumbers"):
+        phone = extract_phone(document.clean_text)
+
+    with timed("ner_location"):
+        location = extract_location(raw_text)
+
+    with timed("parse_entries"):
+        experience = parse_experience(section("experience"))
+        projects = parse_projects(section("projects"))
 
     parsed = {
-        "name": extract_name(raw_text, email),
+        "name": name,
         "email": email,
-        "phone": extract_phone(clean_text),
-        "location": extract_location(raw_text),
+        "phone": phone,
+        "location": location,
 
-        "skills": [s.strip() for s in sections.get("skills", "").split("\n") if s.strip()],
-        "education": sections.get("education", ""),
-        "experience": parse_experience(sections.get("experience", "")),
-        "projects": parse_projects(sections.get("projects", "")),
-        "certifications": sections.get("certifications", ""),
-        "publications": sections.get("publications", ""),
-        "hobbies": sections.get("hobbies", ""),
+        "skills": [s for s in section("skills").split("\n") if s],
+        "education": section("education"),
+        "experience": experience,
+        "projects": projects,
+        "certifications": section("certifications"),
+        "publications": section("publications"),
+        "hobbies": section("hobbies"),
 
         "raw_text": raw_text
     }
 
-    return parsed
\ No newline at end of file
+    return parsed
+
+
+def parse_resume_header(file_path):
+    """
+    Contact details only, read from the first HEADER_PAGES pages.
+    """
+    document = ResumeDocument(extract_resume_text(file_path, header_only=True))
+
+    email = extract_email(document.clean_text)
+
+    return {
+        "name": extract_name(document.raw_text, email, document.lines),
+        "email": email,
+        "phone": extract_phone(document.clean_text),
+        "location": extract_location(document.raw_text)
+    }
@@ -1,5 +1,8 @@
 import re
 
+from backend.nlp.taxonomy import get_taxonomy, normalize_text
+from backend.nlp.skill_extractor import TECHNICAL_CATEGORIES
+
 def extract_personal_details(text):
     email = re.findall(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", text)
     phone = re.findall(r"\+?\d[\d -]{8,12}\d", text)
@@ -65,46 +68,13 @@ def extract_experience(text):
 
     return experience
 def extract_structured_skills(text):
-    text = text.lower()
-
-    technical_skills_db = [
-        "python", "java", "c++", "sql", "mysql", "mongodb",
-        "html", "css", "javascript", "flask", "django",
-        "machine learning", "deep learning", "nlp",
-        "linux", "git", "docker", "aws"
-    ]
-
-    soft_skills_db = [
-        "communication", "teamwork", "leadership",
-        "problem solving", "critical thinking",
-        "time management", "adaptability"
-    ]
-
-    certifications_db = [
-        "aws", "cisco", "ccna", "azure",
-        "google cloud", "oracle"
-    ]
-
-    technical = []
-    soft = []
-    certifications = []
-
-    for skill in technical_skills_db:
-        if skill in text:
-            technical.append(skill)
-
-    for skill in soft_skills_db:
-        if skill in text:
-            soft.append(skill)
-
-    for cert in certifications_db:
-        if cert in text:
-            certifications.append(cert)
+    taxonomy = get_taxonomy()
+    found = taxonomy.count(normalize_text(text))
 
     return {
-        "technical": list(set(technical)),
-        "soft": list(set(soft)),
-        "certifications": list(set(certifications))
+        "technical": taxonomy.names_in(found, *TECHNICAL_CATEGORIES),
+        "soft": taxonomy.names_in(found, "soft"),
+        "certifications": taxonomy.names_in(found, "certification")
     }
 def extract_projects(text):
     projects = []
@@ -157,25 +127,12 @@ def extract_achievements(text):
 
 
 def extract_languages(text):
-    programming_languages = []
-    spoken_languages = []
-
-    prog_langs = ["python", "java", "c++", "javascript", "sql"]
-    human_langs = ["english", "hindi", "french", "german", "spanish"]
-
-    lower_text = text.lower()
-
-    for lang in prog_langs:
-        if lang in lower_text:
-            programming_languages.append(lang)
-
-    for lang in human_langs:
-        if lang in lower_text:
-            spoken_languages.append(lang)
+    taxonomy = get_taxonomy()
+    found = taxonomy.count(normalize_text(text))
 
     return {
-        "programming": list(set(programming_languages)),
-        "spoken": list(set(spoken_languages))
+        "programming": taxonomy.names_in(found, "programming"),
+        "spoken": taxonomy.names_in(found, "spoken_language")
     }
 
 
@@ -1,69 +1,69 @@
-import re
-from collections import defaultdict
+from backend.nlp.taxonomy import get_taxonomy, normalize_text
 
 # =========================
-# MASTER SKILLS DATABASE
+# SKILL TAXONOMY
 # =========================
+#
+# Skills, aliases and categories come from the compiled taxonomy
+# (backend/nlp/taxonomy.py, source in backend/nlp/data/skills_taxonomy.json).
+# These categories are what counts as a technical skill: skills_meta, job
+# matching and the skill index. Soft skills, certifications and spoken
+# languages are picked up by resume_sections.
 
-SKILLS_DB = {
-    "programming": [
-        "python", "java", "c++", "javascript", "typescript"
-    ],
-    "web": [
-        "html", "css", "react", "node", "flask", "django"
-    ],
-    "database": [
-        "sql", "mysql", "postgresql", "mongodb"
-    ],
-    "ai_ml": [
-        "machine learning", "deep learning", "nlp", "data science"
-    ],
-    "tools": [
-        "git", "docker", "aws", "linux"
-    ]
-}
-
-# 🔥 FLATTEN (NO SINGLE LETTER SKILLS)
-ALL_SKILLS = set(
-    skill for group in SKILLS_DB.values()
-    for skill in group
-    if len(skill) > 1
+TECHNICAL_CATEGORIES = (
+    "programming", "web", "database", "ai_ml", "data", "cloud",
+    "devops", "tools", "testing", "mobile", "security"
 )
 
-# =========================
-# CLEAN TEXT
-# =========================
 
-def normalize_text(text: str) -> str:
-    text = text.lower()
-    text = re.sub(r"[^a-z0-9\s]", " ", text)
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
+def technical_skills():
+    taxonomy = get_taxonomy()
+    return taxonomy.names_in(range(taxonomy.size), *TECHNICAL_CATEGORIES)
+
+
+def canonical_skill(skill):
+    """
+    "ReactJS" -> "react"; skills the taxonomy does not know come back
+    lowercased with single spaces.
+    """
+    return get_taxonomy().canonical(skill) or " ".join(skill.lower().split())
+
+
+def canonical_skills(skills):
+    """
+    canonical_skill for many names in one taxonomy lookup.
+    """
+    taxonomy = get_taxonomy()
+    skills = list(skills)
+    return [
+        taxonomy.name(skill_id) if skill_id >= 0 else " ".join(skill.lower().split())
+        for skill, skill_id in zip(skills, taxonomy.lookup_many(skills).tolist())
+    ]
 
 # =========================
 # CORE EXTRACTION
 # =========================
 
-def extract_skills_nlp(text: str):
-    text = normalize_text(text)
-    skill_counter = defaultdict(int)
-
-    for skill in ALL_SKILLS:
-        # 🔒 STRICT WORD BOUNDARY MATCH
-        pattern = r"\b" + re.escape(skill) + r"\b"
-        matches = re.findall(pattern, text)
-        if matches:
-            skill_counter[skill] += len(matches)
+def extract_skills_nlp(text):
+    """
+    text: a string, or a ResumeDocument whose normalized view is reused.
+    """
+    text = text.normalized if hasattr(text, "normalized") else normalize_text(text)
+    taxonomy = get_taxonomy()
+    technical = taxonomy.category_mask(*TECHNICAL_CATEGORIES)
+    skill_counter = taxonomy.count(text)
 
     # =========================
     # CONFIDENCE CALCULATION
     # =========================
 
     skills_meta = []
-    for skill, freq in skill_counter.items():
+    for skill_id, freq in skill_counter.items():
+        if not technical[skill_id]:
+            continue
         confidence = min(1.0, freq / 3)
         skills_meta.append({
-            "skill": skill,
+            "skill": taxonomy.name(skill_id),
             "confidence": round(confidence, 2)
         })
 
@@ -0,0 +1,185 @@
+import sys
+import numpy as np
+
+from backend.nlp.taxonomy import get_taxonomy
+
+# ======================================================
+# SKILL ENCODING
+# ======================================================
+#
+# Skills are stored and compared as taxonomy ids (backend/nlp/taxonomy.py)
+# instead of strings:
+#
+#   resume  skills_vec   (id uint32, confidence x 100 uint8) records
+#   job     skills_ids   sorted uint32 ids of its required skills
+#
+# both saved as BSON binary next to `skills_vocab`, the digest of the
+# compiled taxonomy the ids refer to. Both are sparse, so their size
+# follows the resume / job and not the taxonomy. Batch scoring gathers the
+# job's skill mask at every resume's ids and sums confidences per resume
+# in one bincount.
+#
+# Recompiling the taxonomy from a changed source can renumber skills, so
+# encodings stamped with another digest are ignored (re-encoded from the
+# strings) until backfilled:
+#
+#     python -m backend.nlp.skill_vocab backfill
+
+SKILL_DTYPE = np.dtype([("id", "<u4"), ("confidence", "u1")])
+ID_DTYPE = np.dtype("<u4")
+
+
+def vocab_version():
+    return get_taxonomy().digest[:12]
+
+
+def encode_resume_skills(skills_meta):
+    """
+    skills_meta = [{"skill": "python", "confidence": 0.67}, ...] -> SKILL_DTYPE array
+    """
+    skills_meta = skills_meta or []
+    ids = get_taxonomy().lookup_many([entry["skill"] for entry in skills_meta])
+
+    confidences = {}
+    for skill_id, entry in zip(ids.tolist(), skills_meta):
+        if skill_id >= 0:
+            confidences[skill_id] = max(confidences.get(skill_id, 0), round(entry["confidence"] * 100))
+
+    vec = np.zeros(len(confidences), dtype=SKILL_DTYPE)
+    vec["id"] = sorted(confidences)
+    vec["confidence"] = [confidences[i] for i in sorted(confidences)]
+    return vec
+
+
+def encode_job_skills(required_skills):
+    """
+    ["Python", "ReactJS", ...] -> sorted taxonomy ids (skills outside the
+    taxonomy cannot match and are only counted in the denominator of the score).
+    """
+    ids = get_taxonomy().lookup_many(required_skills or [])
+    return np.array(sorted(set(ids[ids >= 0].tolist())), dtype=ID_DTYPE)
+
+
+def skill_mask(ids):
+    """
+    Bool array over the taxonomy, set at ids.
+    """
+    mask = np.zeros(get_taxonomy().size, dtype=bool)
+    mask[np.asarray(ids, dtype=np.intp)] = True
+    return mask
+
+
+def overlap(ids_a, ids_b):
+    return int(np.count_nonzero(skill_mask(ids_a)[np.asarray(ids_b, dtype=np.intp)]))
+
+# ======================================================
+# DOCUMENT FIELDS
+# ======================================================
+
+def resume_skill_fields(skills_meta):
+    return {
+        "skills_vec": encode_resume_skills(skills_meta).tobytes(),
+        "skills_vocab": vocab_version()
+    }
+
+
+def job_skill_fields(required_skills):
+    return {
+        "skills_ids": encode_job_skills(required_skills).tobytes(),
+        "skills_vocab": vocab_version()
+    }
+
+
+def resume_skill_vector(resume):
+    """
+    The stored skills_vec bytes of a resume document, or None when it is
+    missing or was encoded against another taxonomy.
+    """
+    if resume.get("skills_vocab") != vocab_version() or resume.get("skills_vec") is None:
+        return None
+    return bytes(resume["skills_vec"])
+
+
+def job_skill_ids(job):
+    if job.get("skills_vocab") != vocab_version() or job.get("skills_ids") is None:
+        return None
+    return np.frombuffer(job["skills_ids"], dtype=ID_DTYPE)
+
+
+def stack_resume_vectors(resumes):
+    """
+    N resumes -> (row, skill id, confidence x 100) arrays over all their
+    skills. Each item is stored skills_vec bytes, a SKILL_DTYPE array, or a
+    skills_meta list still to encode (all of those in one taxonomy lookup).
+    """
+    rows, ids, confidences = [], [], []
+
+    encoded = [(row, r) for row, r in enumerate(resumes) if isinstance(r, (bytes, np.ndarray))]
+    if encoded:
+        chunks = [r if isinstance(r, bytes) else r.tobytes() for _, r in encoded]
+        records = np.frombuffer(b"".join(chunks), dtype=SKILL_DTYPE)
+        rows.append(np.repeat([row for row, _ in encoded], [len(c) // SKILL_DTYPE.itemsize for c in chunks]))
+        ids.append(records["id"])
+        confidences.append(records["confidence"])
+
+    names, meta_rows, meta_confidences = [], [], []
+    for row, resume in enumerate(resumes):
+        if isinstance(resume, (bytes, np.ndarray)):
+            continue
+        for entry in resume or []:
+            names.append(entry["skill"])
+            meta_rows.append(row)
+            meta_confidences.append(entry["confidence"])
+    if names:
+        skill_ids = get_taxonomy().lookup_many(names)
+        known = skill_ids >= 0
+        rows.append(np.asarray(meta_rows)[known])
+        ids.append(skill_ids[known])
+        confidences.append(np.rint(np.asarray(meta_confidences)[known] * 100))
+
+    if not rows:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp), np.zeros(0)
+    return (
+        np.concatenate(rows).astype(np.intp),
+        np.concatenate(ids).astype(np.intp),
+        np.concatenate(confidences).astype(float)
+    )
+
+# ======================================================
+# BACKFILL
+# ======================================================
+
+def backfill(batch_size=1000):
+    from pymongo import UpdateOne
+    from backend.db import resumes_collection, jobs_collection
+
+    stale = {"skills_vocab": {"$ne": vocab_version()}}
+    counts = {}
+
+    for collection, query, projection, update in (
+        (resumes_collection, {**stale, "skills_meta": {"$exists": True}}, {"skills_meta": 1},
+         lambda doc: {"$set": resume_skill_fields(doc.get("skills_meta"))}),
+        (jobs_collection, stale, {"required_skills": 1},
+         lambda doc: {"$set": job_skill_fields(doc.get("required_skills")), "$unset": {"skills_mask": ""}})
+    ):
+        done = 0
+        while True:
+            batch = list(collection.find(query, projection).limit(batch_size))
+            if not batch:
+                break
+            collection.bulk_write(
+                [UpdateOne({"_id": doc["_id"]}, update(doc)) for doc in batch],
+                ordered=False
+            )
+            done += len(batch)
+        counts[collection.name] = done
+
+    return counts
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["backfill"]:
+        print("usage: python -m backend.nlp.skill_vocab backfill", file=sys.stderr)
+        sys.exit(2)
+    for name, count in backfill().items():
+        print(f"{name}: encoded {count}")
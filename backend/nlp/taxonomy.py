@@ -0,0 +1,586 @@
+import os
+import re
+import sys
+import json
+import mmap
+import time
+import struct
+import hashlib
+import tempfile
+import threading
+from collections import defaultdict
+
+import numpy as np
+
+# ======================================================
+# SKILL TAXONOMY
+# ======================================================
+#
+# Canonical skills, their aliases and categories live in one JSON file,
+# SKILL_TAXONOMY_SOURCE (backend/nlp/data/skills_taxonomy.json):
+#
+#     {"skill": "postgresql", "categories": ["database"], "aliases": ["postgres", "psql"]}
+#
+# It is compiled into a binary lookup table, SKILL_TAXONOMY_TABLE, that
+# every worker memory-maps read-only: the pages are shared through the OS
+# page cache instead of each worker parsing the JSON and building its own
+# dicts, and loading is a header read plus numpy views over the map.
+#
+#     python -m backend.nlp.taxonomy compile          # after editing the source
+#     python -m backend.nlp.taxonomy lookup ReactJS
+#
+# The table is compiled on first use when it is missing or was built from
+# a different source (its header carries the source's SHA-1), and, like
+# the TF-IDF model, a recompiled table is picked up by running workers.
+# gunicorn.conf.py compiles it once in the master before forking.
+#
+# Keys are aliases normalized like resume text ([a-z0-9] tokens separated
+# by single spaces; "c++", "c#" and ".net" are spelled out first, as
+# "c plus plus", "c sharp" and "dotnet", so they survive), plus each alias lowercased as written ("c++") for
+# looking up skills typed by users. The table is a token trie stored as
+# an open-addressing hash (linear probing): a key of k tokens is a chain
+# of k slots, each identified by (64-bit hash of its token, parent slot).
+# Text is matched by hashing all of its tokens in one numpy pass, looking
+# every position up at once, and extending only the positions whose slot
+# has children (PREFIX) by their next token, so no per-token Python runs.
+# Token hashes are compared without reading key bytes back; a false match
+# needs a 64-bit collision.
+#
+# Layout (little-endian):
+#   header   magic, format, source SHA-1, counts and section offsets
+#   slots    2^k x (token hash, parent slot, skill id or -1, flags)
+#   skills   per skill id: (name offset, name length, category bits)
+#   names    utf-8 canonical names
+#   meta     JSON: source version and category names
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+SKILL_TAXONOMY_SOURCE = os.environ.get(
+    "SKILL_TAXONOMY_SOURCE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "skills_taxonomy.json")
+)
+SKILL_TAXONOMY_TABLE = os.environ.get(
+    "SKILL_TAXONOMY_TABLE",
+    os.path.join(BASE_DIR, "cache", "skills_taxonomy.bin")
+)
+
+MAGIC = b"SKTX"
+FORMAT = 2
+HEADER = struct.Struct("<4sI20s8I")
+ALIGN = 16
+
+SLOT_DTYPE = np.dtype([("hash", "<u8"), ("parent", "<i4"), ("skill", "<i4"), ("flags", "<u4")])
+SKILL_DTYPE = np.dtype([("name_off", "<u4"), ("name_len", "<u4"), ("categories", "<u8")])
+
+USED = 1
+PREFIX = 2
+
+# seconds between checks for a recompiled table
+RELOAD_CHECK_SECONDS = 1.0
+
+
+class TaxonomyError(ValueError):
+    pass
+
+# ======================================================
+# NORMALIZATION
+# ======================================================
+
+_NON_ALNUM = re.compile(r"[^a-z0-9\s]")
+_SPACES = re.compile(r"\s+")
+
+# symbols that are part of a skill's name, spelled out before the rest
+# of the punctuation is dropped: c++ / c# / f#, and a leading dot (.net)
+_SYMBOL_WORDS = re.compile(r"(?<=[a-z0-9])(\+\+|#)|(?<![a-z0-9])\.(?=[a-z])")
+_SYMBOL_SPELLING = {"++": " plus plus ", "#": " sharp ", ".": " dot"}
+
+
+def normalize_text(text: str) -> str:
+    return normalize_lowercase(text.lower())
+
+
+def normalize_lowercase(text: str) -> str:
+    # normalize_text for input that is already lowercased
+    text = _SYMBOL_WORDS.sub(lambda m: _SYMBOL_SPELLING[m.group()], text)
+    text = _NON_ALNUM.sub(" ", text)
+    text = _SPACES.sub(" ", text)
+    return text.strip()
+
+
+def _written_key(alias):
+    return " ".join(alias.lower().split())
+
+# ======================================================
+# TOKEN HASHING
+# ======================================================
+
+_MASK64 = (1 << 64) - 1
+_BASE = 0x100000001B3                      # odd, so invertible mod 2^64
+_BASE_INVERSE = pow(_BASE, -1, 1 << 64)
+_PARENT_MIX = 0x9E3779B97F4A7C15
+
+
+# bytes hashed against one power table; longer texts go in pieces
+_MAX_POWERS = 1 << 20
+
+# (powers, inverses), replaced as a whole so readers never see a mix
+_power_tables = (np.ones(1, dtype=np.uint64), np.ones(1, dtype=np.uint64))
+_power_lock = threading.Lock()
+
+
+def _powers(n):
+    """
+    (BASE^i, BASE^-i) for i < n <= _MAX_POWERS, mod 2^64; grown by
+    doubling and shared.
+    """
+    global _power_tables
+    tables = _power_tables
+    if len(tables[0]) < n:
+        with _power_lock:
+            tables = _power_tables
+            if len(tables[0]) < n:
+                size = min(max(n, 2 * len(tables[0]), 4096), _MAX_POWERS)
+                grown = []
+                for base in (_BASE, _BASE_INVERSE):
+                    powers = np.full(size, base, dtype=np.uint64)
+                    powers[0] = 1
+                    grown.append(np.cumprod(powers, dtype=np.uint64))   # wraps mod 2^64
+                tables = _power_tables = tuple(grown)
+    powers, inverses = tables
+    return powers[:n], inverses[:n]
+
+
+def token_hashes(data: bytes):
+    """
+    64-bit hash of every space-separated token of data, in order: a
+    polynomial hash from one cumulative sum over the bytes, then mixed.
+    """
+    if len(data) <= _MAX_POWERS:
+        return _token_hashes(data)
+
+    # a token's hash only depends on its own bytes, so cutting at spaces
+    # changes nothing (a single token longer than the table is split)
+    parts = []
+    start = 0
+    while start < len(data):
+        end = start + _MAX_POWERS
+        if end < len(data):
+            cut = data.rfind(b" ", start, end)
+            if cut > start:
+                end = cut + 1
+        parts.append(_token_hashes(data[start:end]))
+        start = end
+    return np.concatenate(parts)
+
+
+def _token_hashes(data):
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if not raw.size:
+        return np.zeros(0, dtype=np.uint64)
+
+    space = raw == 32
+    boundary = np.empty(raw.size + 1, dtype=bool)
+    boundary[0] = boundary[-1] = True
+    boundary[1:-1] = space[1:] != space[:-1]
+    edges = np.flatnonzero(boundary)
+    # edges alternate start, end of runs; keep the runs of non-space bytes
+    first = 1 if space[0] else 0
+    starts = edges[first:-1:2]
+    ends = edges[first + 1::2]
+
+    powers, inverses = _powers(raw.size)
+    with np.errstate(over="ignore"):
+        prefix = np.zeros(raw.size + 1, dtype=np.uint64)
+        np.cumsum((raw.astype(np.uint64) + np.uint64(1)) * powers, out=prefix[1:])
+        h = (prefix[ends] - prefix[starts]) * inverses[starts]
+
+        # spread the bits (the low bits of a polynomial hash mod 2^64 are weak)
+        h ^= h >> np.uint64(33)
+        h *= np.uint64(0xFF51AFD7ED558CCD)
+        h ^= h >> np.uint64(33)
+    return h
+
+
+def _slot_start(hashes, parents, mask):
+    with np.errstate(over="ignore"):
+        mixed = (parents + 1).astype(np.uint64) * np.uint64(_PARENT_MIX)
+    return ((hashes ^ mixed) & np.uint64(mask)).astype(np.int64)
+
+# ======================================================
+# COMPILE
+# ======================================================
+
+def _align(offset):
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+def build_table(data, digest):
+    """
+    Parsed taxonomy JSON -> compiled table bytes.
+    """
+    categories = {}
+    names = []
+    keys = {}          # key -> skill id
+    conflicts = []
+
+    for skill_id, entry in enumerate(data.get("skills") or []):
+        name = _written_key(entry.get("skill") or "")
+        if not name:
+            raise TaxonomyError(f"skill #{skill_id} has no name")
+
+        bits = 0
+        for category in entry.get("categories") or []:
+            if category not in categories:
+                if len(categories) == 64:
+                    raise TaxonomyError("more than 64 categories")
+                categories[category] = len(categories)
+            bits |= 1 << categories[category]
+        names.append((name, bits))
+
+        for alias in [name] + list(entry.get("aliases") or []):
+            for key in {_written_key(alias), normalize_text(alias)}:
+                # no single-letter skills
+                if len(key) < 2:
+                    continue
+                owner = keys.setdefault(key, skill_id)
+                if owner != skill_id:
+                    conflicts.append(f"'{key}' ({names[owner][0]} / {name})")
+
+    seen = {}
+    for skill_id, (name, _) in enumerate(names):
+        if seen.setdefault(name, skill_id) != skill_id:
+            raise TaxonomyError(f"skill '{name}' is listed twice")
+        # resume text is matched in normalized form, so the name must
+        # survive normalization ("c++" once became the dropped "c")
+        if keys.get(normalize_text(name)) != skill_id:
+            raise TaxonomyError(f"skill '{name}' cannot be found in text (normalizes to '{normalize_text(name)}')")
+    if conflicts:
+        raise TaxonomyError("aliases claimed by more than one skill: " + ", ".join(conflicts[:20]))
+
+    # one trie node per distinct token path; prefixes get skill -1 unless
+    # they are keys themselves
+    nodes = {}
+    for key, skill_id in keys.items():
+        tokens = tuple(key.split(" "))
+        for j in range(1, len(tokens)):
+            nodes.setdefault(tokens[:j], -1)
+        nodes[tokens] = skill_id
+
+    paths = sorted(nodes, key=len)        # parents before children
+    words = list(dict.fromkeys(token for path in paths for token in path))
+    word_hash = dict(zip(words, token_hashes(" ".join(words).encode("utf-8")).tolist()))
+
+    # load factor <= 1/4 keeps most lookups (mostly misses) to one probe
+    n_slots = 8
+    while n_slots < 4 * len(paths):
+        n_slots *= 2
+    mask = n_slots - 1
+
+    slots = np.zeros(n_slots, dtype=SLOT_DTYPE)
+    slots["parent"] = -1
+    slots["skill"] = -1
+    occupied = bytearray(n_slots)
+    slot_of = {}
+
+    for path in paths:
+        h = word_hash[path[-1]]
+        parent = slot_of[path[:-1]] if len(path) > 1 else -1
+        i = (h ^ (((parent + 1) * _PARENT_MIX) & _MASK64)) & mask
+        while occupied[i]:
+            i = (i + 1) & mask
+        occupied[i] = 1
+        slot_of[path] = i
+        slots[i] = (h, parent, nodes[path], USED)
+        if len(path) > 1:
+            slots["flags"][parent] |= PREFIX
+
+    pool = bytearray()
+    skills = np.zeros(len(names), dtype=SKILL_DTYPE)
+    for skill_id, (name, bits) in enumerate(names):
+        encoded = name.encode("utf-8")
+        skills[skill_id] = (len(pool), len(encoded), bits)
+        pool += encoded
+
+    meta = json.dumps({
+        "version": str(data.get("version", "")),
+        "categories": sorted(categories, key=categories.get)
+    }).encode("utf-8")
+
+    slots_off = _align(HEADER.size)
+    skills_off = _align(slots_off + slots.nbytes)
+    pool_off = _align(skills_off + skills.nbytes)
+    meta_off = _align(pool_off + len(pool))
+
+    out = bytearray(meta_off + len(meta))
+    HEADER.pack_into(
+        out, 0, MAGIC, FORMAT, digest,
+        len(names), n_slots, slots_off, skills_off, pool_off, len(pool), meta_off, len(meta)
+    )
+    out[slots_off:slots_off + slots.nbytes] = slots.tobytes()
+    out[skills_off:skills_off + skills.nbytes] = skills.tobytes()
+    out[pool_off:pool_off + len(pool)] = pool
+    out[meta_off:] = meta
+    return bytes(out)
+
+
+def compile_taxonomy(source=SKILL_TAXONOMY_SOURCE, table=SKILL_TAXONOMY_TABLE):
+    with open(source, "rb") as f:
+        raw = f.read()
+    try:
+        data = json.loads(raw)
+    except ValueError as e:
+        raise TaxonomyError(f"{source}: {e}")
+
+    compiled = build_table(data, hashlib.sha1(raw).digest())
+
+    directory = os.path.dirname(table) or "."
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".taxonomy-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(compiled)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, table)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return len(data.get("skills") or [])
+
+
+def ensure_compiled(source=SKILL_TAXONOMY_SOURCE, table=SKILL_TAXONOMY_TABLE):
+    """
+    Compile the table unless it is current for the source. Returns True
+    if it was (re)compiled.
+    """
+    with open(source, "rb") as f:
+        digest = hashlib.sha1(f.read()).digest()
+
+    try:
+        with open(table, "rb") as f:
+            header = f.read(HEADER.size)
+        if len(header) == HEADER.size:
+            magic, fmt, table_digest = HEADER.unpack(header)[:3]
+            if (magic, fmt, table_digest) == (MAGIC, FORMAT, digest):
+                return False
+    except OSError:
+        pass
+
+    compile_taxonomy(source, table)
+    return True
+
+# ======================================================
+# LOOKUP
+# ======================================================
+
+class SkillTaxonomy:
+    """
+    Read-only view of a compiled table. Skills are identified by their
+    position in the source file (0 .. size-1).
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._map) < HEADER.size:
+            raise TaxonomyError(f"{path}: not a compiled skill taxonomy")
+        (magic, fmt, digest, size, n_slots, slots_off, skills_off,
+         pool_off, pool_len, meta_off, meta_len) = HEADER.unpack_from(self._map)
+        if magic != MAGIC or fmt != FORMAT:
+            raise TaxonomyError(f"{path}: not a compiled skill taxonomy (format {FORMAT})")
+
+        slots = np.frombuffer(self._map, dtype=SLOT_DTYPE, count=n_slots, offset=slots_off)
+        self._hash = slots["hash"]
+        self._parent = slots["parent"]
+        self._skill = slots["skill"]
+        self._flags = slots["flags"]
+        self._mask = n_slots - 1
+
+        self._skills = np.frombuffer(self._map, dtype=SKILL_DTYPE, count=size, offset=skills_off)
+        self._pool = memoryview(self._map)[pool_off:pool_off + pool_len]
+
+        meta = json.loads(self._map[meta_off:meta_off + meta_len])
+        self.version = meta["version"]
+        self.categories = meta["categories"]
+        self.digest = digest.hex()
+        self.size = size
+
+        self._names = {}
+        self._category_masks = {}
+
+    def _find(self, hashes, parents):
+        """
+        Slot of each (token hash, parent slot) pair, -1 where absent.
+        """
+        found = np.full(len(hashes), -1, dtype=np.int64)
+        probe = _slot_start(hashes, parents, self._mask)
+        todo = np.arange(len(hashes))
+
+        while todo.size:
+            slot = probe[todo]
+            used = (self._flags[slot] & USED) != 0
+            match = used & (self._hash[slot] == hashes[todo]) & (self._parent[slot] == parents[todo])
+            found[todo[match]] = slot[match]
+
+            todo = todo[used & ~match]
+            probe[todo] = (probe[todo] + 1) & self._mask
+
+        return found
+
+    def lookup_many(self, skills):
+        """
+        Skill id of each name or alias as a user would type it ("ReactJS",
+        "C++"), -1 for unknown ones.
+        """
+        skills = list(skills)
+        ids = np.full(len(skills), -1, dtype=np.int64)
+
+        for normalize in (_written_key, normalize_text):
+            todo = [i for i in np.flatnonzero(ids < 0).tolist() if len(normalize(skills[i])) >= 2]
+            if not todo:
+                continue
+            keys = [normalize(skills[i]) for i in todo]
+            lengths = np.array([key.count(" ") + 1 for key in keys])
+            first = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            hashes = token_hashes(" ".join(keys).encode("utf-8"))
+
+            # walk each key's chain one token at a time
+            slot = np.full(len(keys), -1, dtype=np.int64)
+            for level in range(int(lengths.max())):
+                active = np.flatnonzero((lengths > level) & ((slot >= 0) | (level == 0)))
+                slot[active] = self._find(hashes[first[active] + level], slot[active])
+            hit = slot >= 0
+            ids[np.asarray(todo)[hit]] = self._skill[slot[hit]]
+
+        return ids
+
+    def lookup(self, skill):
+        skill_id = int(self.lookup_many([skill])[0])
+        return skill_id if skill_id >= 0 else None
+
+    def canonical(self, skill):
+        skill_id = self.lookup(skill)
+        return self.name(skill_id) if skill_id is not None else None
+
+    def name(self, skill_id):
+        name = self._names.get(skill_id)
+        if name is None:
+            offset, length, _ = self._skills[skill_id]
+            name = self._names[skill_id] = bytes(self._pool[int(offset):int(offset) + int(length)]).decode("utf-8")
+        return name
+
+    def categories_of(self, skill_id):
+        bits = int(self._skills["categories"][skill_id])
+        return [c for i, c in enumerate(self.categories) if bits >> i & 1]
+
+    def category_mask(self, *categories):
+        """
+        Bool array over skill ids: in any of the given categories.
+        """
+        mask = self._category_masks.get(categories)
+        if mask is None:
+            bits = 0
+            for category in categories:
+                if category in self.categories:
+                    bits |= 1 << self.categories.index(category)
+            mask = self._category_masks[categories] = (self._skills["categories"] & np.uint64(bits)) != 0
+        return mask
+
+    def names_in(self, skill_ids, *categories):
+        mask = self.category_mask(*categories)
+        return [self.name(i) for i in skill_ids if mask[i]]
+
+    def count(self, normalized_text):
+        """
+        {skill id: occurrences} of every alias in normalized text. Nested
+        aliases of different skills all count ("react native" also counts
+        "react").
+        """
+        counts = defaultdict(int)
+        hashes = token_hashes(normalized_text.encode("utf-8"))
+        n = len(hashes)
+        if not n:
+            return counts
+
+        starts = np.arange(n)
+        slots = self._find(hashes, np.full(n, -1, dtype=np.int64))
+        last = np.full(n, -1, dtype=np.int64)    # skill last counted at each start
+        length = 1
+
+        while True:
+            hit = np.flatnonzero(slots >= 0)
+            skills = self._skill[slots[hit]].astype(np.int64)
+
+            # an alias nested in a longer alias of the same skill
+            # ("node" / "node js") counts once per position
+            known = skills >= 0
+            for skill_id in skills[known & (skills != last[hit])].tolist():
+                counts[skill_id] += 1
+            last[hit[known]] = skills[known]
+
+            extend = hit[((self._flags[slots[hit]] & PREFIX) != 0) & (starts[hit] + length < n)]
+            if not extend.size:
+                return counts
+
+            starts = starts[extend]
+            last = last[extend]
+            slots = self._find(hashes[starts + length], slots[extend])
+            length += 1
+
+# ======================================================
+# SHARED INSTANCE
+# ======================================================
+
+_taxonomy = None
+_taxonomy_mtime = None
+_checked_at = 0.0
+_taxonomy_lock = threading.Lock()
+
+
+def get_taxonomy(path=SKILL_TAXONOMY_TABLE):
+    """
+    The compiled taxonomy, compiled on first use if needed. Reloads when
+    the table on disk has been swapped (checked at most once a second).
+    """
+    global _taxonomy, _taxonomy_mtime, _checked_at
+
+    now = time.monotonic()
+    if _taxonomy is not None and now - _checked_at < RELOAD_CHECK_SECONDS:
+        return _taxonomy
+
+    with _taxonomy_lock:
+        if _taxonomy is None:
+            ensure_compiled(SKILL_TAXONOMY_SOURCE, path)
+
+        mtime = os.stat(path).st_mtime_ns
+        if _taxonomy is None or mtime != _taxonomy_mtime:
+            _taxonomy = SkillTaxonomy(path)
+            _taxonomy_mtime = mtime
+        _checked_at = now
+
+    return _taxonomy
+
+
+if __name__ == "__main__":
+    command, args = (sys.argv[1], sys.argv[2:]) if len(sys.argv) > 1 else (None, [])
+
+    if command == "compile":
+        source = args[0] if args else SKILL_TAXONOMY_SOURCE
+        table = args[1] if len(args) > 1 else SKILL_TAXONOMY_TABLE
+        count = compile_taxonomy(source, table)
+        print(f"{count} skills -> {table}")
+    elif command == "lookup" and args:
+        taxonomy = get_taxonomy()
+        for skill in args:
+            skill_id = taxonomy.lookup(skill)
+            if skill_id is None:
+                print(f"{skill}: unknown")
+            else:
+                print(f"{skill}: {taxonomy.name(skill_id)} ({', '.join(taxonomy.categories_of(skill_id))})")
+    else:
+        print("usage: python -m backend.nlp.taxonomy compile [SOURCE [TABLE]] | lookup SKILL...", file=sys.stderr)
+        sys.exit(2)
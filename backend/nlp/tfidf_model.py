@@ -0,0 +1,124 @@
+import os
+import sys
+import pickle
+import tempfile
+import threading
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# ======================================================
+# CORPUS-FITTED TF-IDF MODEL
+# ======================================================
+#
+# One vectorizer is fitted over every stored job description and resume,
+# pickled to TFIDF_MODEL_PATH and loaded once per worker. Scoring is then
+# a transform plus a sparse dot product (rows are L2-normalized, so the
+# dot product is the cosine similarity).
+#
+# Refit out of process while the app keeps serving:
+#
+#     python -m backend.nlp.tfidf_model
+#
+# The new file is written next to the old one and swapped in with
+# os.replace, so readers never see a partial model. Workers notice the
+# new mtime on their next call and reload.
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+TFIDF_MODEL_PATH = os.environ.get(
+    "TFIDF_MODEL_PATH",
+    os.path.join(BASE_DIR, "models", "tfidf_vectorizer.pkl")
+)
+
+VECTORIZER_PARAMS = {
+    "stop_words": "english",
+    "ngram_range": (1, 2),
+    "max_df": 0.85,
+    "dtype": np.float32
+}
+
+_model = None
+_model_mtime = None
+_model_lock = threading.Lock()
+
+
+def build_vectorizer(**overrides):
+    params = dict(VECTORIZER_PARAMS)
+    params.update(overrides)
+    return TfidfVectorizer(**params)
+
+
+def fit_model(documents):
+    vectorizer = build_vectorizer()
+    vectorizer.fit(documents)
+    return vectorizer
+
+
+def save_model(vectorizer, path=TFIDF_MODEL_PATH):
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tfidf-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(vectorizer, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def get_model(path=TFIDF_MODEL_PATH):
+    """
+    Return the fitted vectorizer, or None if no model has been built yet.
+    Reloads when the file on disk has been swapped.
+    """
+    global _model, _model_mtime
+
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return _model
+
+    if _model is not None and mtime == _model_mtime:
+        return _model
+
+    with _model_lock:
+        if _model is None or mtime != _model_mtime:
+            with open(path, "rb") as f:
+                _model = pickle.load(f)
+            _model_mtime = mtime
+
+    return _model
+
+# ======================================================
+# REFIT
+# ======================================================
+
+def job_text(job):
+    return " ".join([job.get("description") or ""] + list(job.get("required_skills") or []))
+
+
+def iter_corpus():
+    from backend.db import jobs_collection
+    from backend.repository import iter_resume_texts
+
+    for job in jobs_collection.find({}, {"description": 1, "required_skills": 1}):
+        yield job_text(job)
+
+    yield from iter_resume_texts()
+
+
+def refit(path=TFIDF_MODEL_PATH):
+    vectorizer = fit_model(iter_corpus())
+    save_model(vectorizer, path)
+    return vectorizer
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else TFIDF_MODEL_PATH
+    model = refit(target)
+    print(f"TF-IDF model fitted ({len(model.vocabulary_)} terms) -> {target}")
@@ -0,0 +1,250 @@
+"""
+Query-plan check for every route query.
+
+The queries are read from the source: every literal filter passed to a
+collection method (find, find_one, update_one, distinct, aggregate's
+leading $match, ...) or to repository.find_resume(s) anywhere under
+backend/, with the sort given next to it. Values that are computed at
+runtime are replaced by a placeholder, which is enough for the planner.
+Filters that are themselves built at runtime are taken from
+DYNAMIC_QUERIES, keyed by the function that issues them; a call site
+with neither fails the check, so a new query cannot go unchecked.
+
+Runs explain() on each against the database in MONGO_URI (point it at a
+local mongod) after bootstrapping indexes, and exits non-zero if any
+winning plan contains a COLLSCAN.
+
+    MONGO_URI=mongodb://localhost:27017 python -m backend.query_plans
+"""
+
+import os
+import ast
+import sys
+from bson.objectid import ObjectId
+
+from backend import db
+from backend.indexes import ensure_indexes
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+QUERY_METHODS = {
+    "find", "find_one", "count_documents", "distinct", "aggregate",
+    "update_one", "update_many", "delete_one", "delete_many", "find_one_and_update"
+}
+
+# repository helpers that take a resumes_collection filter first
+RESUME_HELPERS = {"find_resumes", "find_resume"}
+
+# whole-collection reads on purpose: worker start-up loads and one-off
+# migrations
+OFFLINE_FUNCTIONS = {"_load", "backfill", "migrate_payloads", "iter_resume_texts"}
+
+_ID = ObjectId()
+_VALUE = str(ObjectId())
+
+# "module.function" -> [(collection, filter, sort)] for filters built at runtime
+DYNAMIC_QUERIES = {
+    "skill_index._catch_up": [
+        (db.resumes_collection, {"$or": [{"skills_seq": {"$gt": 0}}, {"skills_seq": {"$in": [1]}}]}, None),
+        (db.skill_tombstones_collection, {"$or": [{"skills_seq": {"$gt": 0}}, {"skills_seq": {"$in": [1]}}]}, None),
+    ],
+    "job_matrix._catch_up": [
+        (db.jobs_collection, {"$or": [{"job_seq": {"$gt": 0}}, {"job_seq": {"$in": [1]}}]}, [("job_seq", 1)]),
+    ],
+    "match_scores._mark_failed": [
+        (db.applications_collection, {"_id": _ID}, None),
+        (db.applications_collection, {"job_id": _VALUE, "match_status": {"$ne": "scored"}}, None),
+    ],
+    "batch_scoring._stored_files": [
+        (db.resumes_collection, {"$or": [{"_id": {"$in": [_ID]}}, {"content_hash": {"$in": [_VALUE]}}]}, None),
+    ],
+    "repository.load_payloads": [
+        (db.resumes_collection, {"_id": {"$in": [_ID]}, "$or": [{"raw_text": {"$exists": True}}]}, None),
+    ],
+}
+
+
+class Dynamic(Exception):
+    pass
+
+
+def _value(node):
+    """
+    Literal AST node -> value, with _VALUE for anything computed. Raises
+    Dynamic where the shape of the filter itself is computed.
+    """
+    if isinstance(node, ast.Dict):
+        result = {}
+        for key, value in zip(node.keys, node.values):
+            if not (isinstance(key, ast.Constant) and isinstance(key.value, str)):
+                raise Dynamic
+            result[key.value] = _value(value)
+            if key.value in ("$in", "$nin", "$all") and not isinstance(result[key.value], list):
+                result[key.value] = [_VALUE]
+            if key.value in ("$or", "$and", "$nor") and not isinstance(result[key.value], list):
+                raise Dynamic
+        return result
+    if isinstance(node, (ast.List, ast.Tuple)):
+        return [_value(item) for item in node.elts]
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.operand, ast.Constant):
+        return ast.literal_eval(node)     # -1 in a sort
+    return _VALUE
+
+
+def _sort(call, parents):
+    # sort=[...] on the call itself, or a chained .sort(key, direction)
+    for keyword in call.keywords:
+        if keyword.arg == "sort":
+            return [tuple(s) for s in _value(keyword.value)]
+    parent = parents.get(call)
+    if isinstance(parent, ast.Attribute) and parent.attr == "sort":
+        chained = parents.get(parent)
+        if isinstance(chained, ast.Call):
+            args = [_value(a) for a in chained.args]
+            return [tuple(s) for s in args[0]] if isinstance(args[0], list) else [tuple(args)]
+    return None
+
+
+def _call_filter(call):
+    """
+    (collection, filter node) of a query call, or None.
+    """
+    func = call.func
+    if isinstance(func, ast.Name) and func.id in RESUME_HELPERS and call.args:
+        return db.resumes_collection, call.args[0]
+    if not (isinstance(func, ast.Attribute) and func.attr in QUERY_METHODS and isinstance(func.value, ast.Name)):
+        return None
+    collection = getattr(db, func.value.id, None)
+    if not func.value.id.endswith("_collection") or collection is None:
+        return None
+
+    if func.attr == "distinct":
+        return (collection, call.args[1]) if len(call.args) > 1 else None
+    if func.attr == "aggregate":
+        pipeline = call.args[0] if call.args else None
+        if not isinstance(pipeline, ast.List) or not pipeline.elts:
+            return collection, pipeline
+        first = pipeline.elts[0]
+        if isinstance(first, ast.Dict) and any(isinstance(k, ast.Constant) and k.value == "$match" for k in first.keys):
+            return collection, first.values[[k.value for k in first.keys].index("$match")]
+        return None
+    return (collection, call.args[0]) if call.args else None
+
+
+def source_queries(directory=BACKEND_DIR):
+    """
+    [(name, collection, filter, sort)] for every query call under
+    directory, and the call sites whose filter is built at runtime.
+    """
+    queries, dynamic = [], []
+    for root, _, files in os.walk(directory):
+        for filename in sorted(files):
+            path = os.path.join(root, filename)
+            if not filename.endswith(".py") or path == os.path.abspath(__file__):
+                continue
+            module = os.path.relpath(path, directory)[:-3].replace(os.sep, ".")
+            with open(path) as f:
+                tree = ast.parse(f.read(), path)
+
+            parents = {child: node for node in ast.walk(tree) for child in ast.iter_child_nodes(node)}
+            for node in ast.walk(tree):
+                if not isinstance(node, ast.Call):
+                    continue
+                found = _call_filter(node)
+                if found is None:
+                    continue
+
+                function = parents.get(node)
+                while function is not None and not isinstance(function, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    function = parents.get(function)
+                function = function.name if function is not None else "<module>"
+                # the helpers pass their caller's filter on
+                if function in OFFLINE_FUNCTIONS or (module == "repository" and function in RESUME_HELPERS):
+                    continue
+
+                name = f"{module}.{function}:{node.lineno}"
+                try:
+                    query = _value(found[1]) if found[1] is not None else None
+                    if not isinstance(query, dict):
+                        raise Dynamic
+                    sort = _sort(node, parents)
+                except Dynamic:
+                    dynamic.append((name, f"{module}.{function}"))
+                    continue
+                # an empty filter reads everything by design
+                if query:
+                    queries.append((name, found[0], query, sort))
+    return queries, dynamic
+
+
+def route_queries():
+    """
+    (queries, unchecked call sites) with DYNAMIC_QUERIES filled in.
+    """
+    queries, dynamic = source_queries()
+    unchecked = []
+    for name, function in dynamic:
+        if function not in DYNAMIC_QUERIES:
+            unchecked.append(name)
+    for function, entries in DYNAMIC_QUERIES.items():
+        for i, (collection, query, sort) in enumerate(entries):
+            queries.append((f"{function}[{i}]", collection, query, sort))
+    return queries, unchecked
+
+
+def plan_stages(plan):
+    """All stage names in an explain() plan tree (classic or SBE)."""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(plan_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(plan_stages(item))
+    return stages
+
+
+def explain(collection, query, sort=None):
+    cursor = collection.find(query)
+    if sort:
+        cursor = cursor.sort(sort)
+    return cursor.explain()["queryPlanner"]["winningPlan"]
+
+
+def check_plans(queries=None, out=sys.stdout):
+    unchecked = []
+    if queries is None:
+        queries, unchecked = route_queries()
+
+    failures = []
+    for name in unchecked:
+        failures.append(name)
+        print(f"FAIL {name}: filter built at runtime, add it to DYNAMIC_QUERIES", file=out)
+    for name, collection, query, sort in queries:
+        stages = plan_stages(explain(collection, query, sort))
+        bad = "COLLSCAN" in stages
+        if bad:
+            failures.append(name)
+        print(f"{'FAIL' if bad else 'ok  '} {collection.name:<18} {name:<44} {' <- '.join(stages)}", file=out)
+    return failures
+
+
+def main():
+    errors = ensure_indexes()
+    if errors:
+        print(f"index bootstrap failed: {errors}", file=sys.stderr)
+        return 1
+
+    failures = check_plans()
+    if failures:
+        print(f"\n{len(failures)} route quer{'y' if len(failures) == 1 else 'ies'} failed the check", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+from pymongo.errors import DuplicateKeyError
+
+from backend.db import jobs_collection, applications_collection, recruiter_stats_collection
+
+# ======================================================
+# MATERIALIZED APPLICATION COUNTERS (PER RECRUITER)
+# ======================================================
+#
+# One document per recruiter in recruiter_stats:
+#   {"_id": recruiter_id, "total": n, "pending": n, "shortlisted": n, "rejected": n, "version": n}
+#
+# candidate_apply and update_application_status keep it current with
+# atomic $inc, so the dashboard is a single _id lookup. Recruiters who
+# have no counters yet (data from before they existed) get them built
+# from one $group aggregation, on first dashboard load or on the first
+# change, whichever comes first. The $inc never upserts, so it cannot
+# create a partial document that hides the historical counts.
+#
+# A change made while the counters are being seeded can be both in the
+# aggregation and $inc'd onto the new document. So every seed is followed
+# by a recount: a fresh aggregation written back only if no $inc (each
+# bumps `version`) landed since it was read, retried otherwise.
+
+APPLICATION_STATUSES = ("pending", "shortlisted", "rejected")
+
+
+def empty_stats():
+    stats = {"total": 0}
+    stats.update({status: 0 for status in APPLICATION_STATUSES})
+    return stats
+
+
+def record_application(recruiter_id, status="pending"):
+    _record(recruiter_id, {"total": 1, status: 1})
+
+
+def record_status_change(recruiter_id, old_status, new_status):
+    old_status = old_status or "pending"
+    if old_status == new_status:
+        return
+
+    _record(recruiter_id, {old_status: -1, new_status: 1})
+
+
+def _record(recruiter_id, inc):
+    """
+    Apply a change that is already written to applications_collection.
+    """
+    inc = dict(inc, version=1)
+    if recruiter_stats_collection.update_one({"_id": recruiter_id}, {"$inc": inc}).matched_count:
+        return
+
+    # no counters yet: the aggregation already includes this change
+    _seed(recruiter_id)
+
+
+def _seed(recruiter_id):
+    # $setOnInsert: never clobber counters created concurrently
+    recruiter_stats_collection.update_one(
+        {"_id": recruiter_id},
+        {"$setOnInsert": dict(count_by_status(recruiter_id), version=0)},
+        upsert=True
+    )
+    # drop changes both aggregated and $inc'd while seeding
+    return _recount(recruiter_id)
+
+
+def _recount(recruiter_id):
+    while True:
+        current = recruiter_stats_collection.find_one({"_id": recruiter_id}, {"version": 1})
+        counts = count_by_status(recruiter_id)
+        if current is None:
+            try:
+                recruiter_stats_collection.insert_one(dict(counts, _id=recruiter_id, version=0))
+                return counts
+            except DuplicateKeyError:
+                continue
+
+        # counters written before `version` existed match version: None
+        version = current.get("version")
+        if recruiter_stats_collection.replace_one(
+            {"_id": recruiter_id, "version": version},
+            dict(counts, version=(version or 0) + 1)
+        ).matched_count:
+            return counts
+
+
+def count_by_status(recruiter_id):
+    """
+    Authoritative counts from one $group-by-status aggregation.
+    """
+    job_ids = [
+        str(job["_id"])
+        for job in jobs_collection.find({"created_by": recruiter_id}, {"_id": 1})
+    ]
+
+    stats = empty_stats()
+
+    for row in applications_collection.aggregate([
+        {"$match": {"job_id": {"$in": job_ids}}},
+        {"$group": {"_id": {"$ifNull": ["$status", "pending"]}, "count": {"$sum": 1}}}
+    ]):
+        stats[row["_id"]] = row["count"]
+        stats["total"] += row["count"]
+
+    return stats
+
+
+def get_recruiter_stats(recruiter_id):
+    stats = recruiter_stats_collection.find_one({"_id": recruiter_id})
+
+    if stats is None:
+        _seed(recruiter_id)
+        stats = recruiter_stats_collection.find_one({"_id": recruiter_id})
+
+    result = empty_stats()
+    result.update({k: v for k, v in stats.items() if k not in ("_id", "version")})
+    return result
+
+
+def rebuild_recruiter_stats(recruiter_id):
+    return _recount(recruiter_id)
@@ -0,0 +1,233 @@
+"""
+Resume data access with per-view projections.
+
+Resume documents in resumes_collection carry only what list/score views
+need. The large parsed payload (raw_text and the parsed sections) lives in
+resume_payloads under the same _id, serialized as JSON and compressed,
+and is loaded only where it is actually used (the analysis page, scoring
+and refits).
+
+    python -m backend.repository migrate   # move payloads off old documents
+"""
+
+import os
+import sys
+import json
+import zlib
+from bson.binary import Binary
+from pymongo import UpdateOne
+
+from backend.db import resumes_collection, resume_payloads_collection
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# ======================================================
+# PROJECTIONS
+# ======================================================
+
+PAYLOAD_FIELDS = ("raw_text", "experience", "projects", "education", "certifications")
+
+RESUME_PROJECTIONS = {
+    "dashboard": {"filename": 1, "status": 1, "skills": 1, "uploaded_at": 1},
+    "apply": {"filename": 1},
+    "applicant": {"filename": 1, "ats_score": 1, "summary": 1, "skills": 1},
+    "scoring": {"skills_meta": 1, "skills_vec": 1, "skills_vocab": 1},
+    "suggestions": {"filename": 1, "ats_score": 1, "ats_feedback": 1},
+    "recommend": {"skills": 1},
+    "analysis": {
+        "uploaded_by": 1,
+        "filename": 1,
+        "status": 1,
+        "analysis_error": 1,
+        "personal_details": 1,
+        "summary": 1,
+        "skills": 1,
+        "ats_score": 1
+    },
+    "analyze": {"file_path": 1, "content_hash": 1, "status": 1, "queued_at": 1},
+    "status": {"status": 1, "analysis_error": 1, "personal_details": 1},
+    "delete": {"file_path": 1, "doc_no": 1},
+}
+
+
+def find_resumes(query, view, sort=None, limit=0):
+    cursor = resumes_collection.find(query, RESUME_PROJECTIONS[view])
+    if sort:
+        cursor = cursor.sort(sort)
+    if limit:
+        cursor = cursor.limit(limit)
+    return list(cursor)
+
+
+def find_resume(query, view, sort=None):
+    return resumes_collection.find_one(query, RESUME_PROJECTIONS[view], sort=sort)
+
+# ======================================================
+# PAYLOAD ENCODING
+# ======================================================
+
+# zstd when the optional `zstandard` package is installed, else zlib.
+# RESUME_PAYLOAD_CODEC=none stores uncompressed JSON.
+PAYLOAD_CODEC = os.environ.get("RESUME_PAYLOAD_CODEC", "zstd" if zstandard else "zlib")
+
+
+def encode_payload(payload, codec=PAYLOAD_CODEC):
+    data = json.dumps(payload, default=str, separators=(",", ":")).encode("utf-8")
+
+    if codec == "zstd" and zstandard:
+        data = zstandard.ZstdCompressor(level=3).compress(data)
+    elif codec == "none":
+        pass
+    else:
+        codec = "zlib"
+        data = zlib.compress(data, 6)
+
+    return {"codec": codec, "data": Binary(data)}
+
+
+def decode_payload(doc):
+    if not doc:
+        return {}
+
+    data = bytes(doc["data"])
+    codec = doc.get("codec", "zlib")
+
+    if codec == "zstd":
+        if not zstandard:
+            raise RuntimeError("resume payload is zstd-compressed but zstandard is not installed")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    elif codec == "zlib":
+        data = zlib.decompress(data)
+
+    return json.loads(data)
+
+
+def split_payload(document):
+    """
+    Split an analysis result into (light fields, payload fields).
+    """
+    light = {k: v for k, v in document.items() if k not in PAYLOAD_FIELDS}
+    payload = {k: document[k] for k in PAYLOAD_FIELDS if k in document}
+    return light, payload
+
+# ======================================================
+# WRITES
+# ======================================================
+
+def save_analysis(resume_id, result):
+    light, payload = split_payload(result)
+
+    resume_payloads_collection.replace_one(
+        {"_id": resume_id},
+        encode_payload(payload),
+        upsert=True
+    )
+
+    update = {"$set": light}
+    # drop copies left on documents analyzed before the split
+    update["$unset"] = {field: "" for field in PAYLOAD_FIELDS}
+
+    resumes_collection.update_one({"_id": resume_id}, update)
+
+
+def save_payloads(payloads):
+    """
+    payloads = {resume_id: payload_dict}, written in one bulk_write.
+    """
+    if not payloads:
+        return
+    resume_payloads_collection.bulk_write([
+        UpdateOne({"_id": resume_id}, {"$set": encode_payload(payload)}, upsert=True)
+        for resume_id, payload in payloads.items()
+    ], ordered=False)
+
+
+def delete_payload(resume_id):
+    resume_payloads_collection.delete_one({"_id": resume_id})
+
+# ======================================================
+# READS
+# ======================================================
+
+LEGACY_PAYLOAD_PROJECTION = {field: 1 for field in PAYLOAD_FIELDS}
+
+
+def load_payload(resume_id):
+    return load_payloads([resume_id]).get(resume_id, {})
+
+
+def load_payloads(resume_ids):
+    resume_ids = list(resume_ids)
+
+    payloads = {
+        doc["_id"]: decode_payload(doc)
+        for doc in resume_payloads_collection.find({"_id": {"$in": resume_ids}})
+    }
+
+    # resumes analyzed before payloads were split out (until migrated)
+    missing = [rid for rid in resume_ids if rid not in payloads]
+    if missing:
+        for doc in resumes_collection.find(
+            {"_id": {"$in": missing}, "$or": [{f: {"$exists": True}} for f in PAYLOAD_FIELDS]},
+            LEGACY_PAYLOAD_PROJECTION
+        ):
+            payloads[doc.pop("_id")] = doc
+
+    return payloads
+
+
+def with_payload(resume):
+    """
+    The resume document with its payload fields merged back in.
+    """
+    if not resume:
+        return resume
+    merged = dict(resume)
+    merged.update(load_payload(resume["_id"]))
+    return merged
+
+
+def iter_resume_texts():
+    for doc in resume_payloads_collection.find({}):
+        yield decode_payload(doc).get("raw_text") or ""
+
+    # documents analyzed before payloads were split out
+    for resume in resumes_collection.find({"raw_text": {"$exists": True}}, {"raw_text": 1}):
+        yield resume.get("raw_text") or ""
+
+# ======================================================
+# MIGRATION
+# ======================================================
+
+def migrate_payloads(batch_size=500):
+    """
+    Move payload fields from old resume documents into resume_payloads.
+    """
+    moved = 0
+    query = {"$or": [{field: {"$exists": True}} for field in PAYLOAD_FIELDS]}
+    projection = LEGACY_PAYLOAD_PROJECTION
+
+    while True:
+        batch = list(resumes_collection.find(query, projection).limit(batch_size))
+        if not batch:
+            return moved
+
+        save_payloads({
+            doc["_id"]: {k: doc[k] for k in PAYLOAD_FIELDS if k in doc}
+            for doc in batch
+        })
+        resumes_collection.bulk_write([
+            UpdateOne({"_id": doc["_id"]}, {"$unset": {field: "" for field in PAYLOAD_FIELDS}})
+            for doc in batch
+        ], ordered=False)
+        moved += len(batch)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["migrate"]:
+        print("usage: python -m backend.repository migrate", file=sys.stderr)
+        sys.exit(2)
+    print(f"moved payloads of {migrate_payloads()} resumes")
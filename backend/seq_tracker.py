@@ -0,0 +1,74 @@
+"""
+Catch-up cursor over a global sequence (next_sequence) for the
+in-memory indexes that follow Mongo writes: skill_index and job_matrix.
+
+A writer reserves its sequence number before its write commits, so two
+writers can commit out of order: seq 8 becomes visible after seq 9 has
+already been read. A plain `{"$gt": last}` query would skip 8 for
+good. The tracker remembers every number below the highest it has seen
+that has not shown up yet (a hole) and asks for those again on each
+catch-up, until they appear or HOLE_TIMEOUT_SECONDS pass. Numbers whose
+document was superseded by a newer write, or deleted, never appear and
+simply expire.
+"""
+
+import os
+import time
+
+HOLE_TIMEOUT_SECONDS = float(os.environ.get("SEQ_HOLE_TIMEOUT_SECONDS", 60))
+MAX_HOLES = 10000
+
+# numbers below the highest seen that are treated as possibly in flight
+# when an index is loaded from scratch
+LOAD_LOOKBACK = 1000
+
+
+class SeqTracker:
+
+    def __init__(self, seq=0):
+        self.seq = seq
+        self.holes = {}      # seq -> monotonic time it was first missed
+
+    @classmethod
+    def loaded(cls, seqs):
+        """
+        A tracker for an index just loaded with documents carrying seqs.
+        """
+        seqs = [s for s in seqs if s]
+        tracker = cls(max(0, max(seqs, default=0) - LOAD_LOOKBACK))
+        tracker.advance([s for s in seqs if s > tracker.seq])
+        return tracker
+
+    def query(self, field):
+        """
+        Filter for the documents this tracker has not seen yet.
+        """
+        newer = {field: {"$gt": self.seq}}
+        if not self.holes:
+            return newer
+        return {"$or": [newer, {field: {"$in": list(self.holes)}}]}
+
+    def advance(self, seqs):
+        """
+        Record the seqs a catch-up query returned.
+        """
+        now = time.monotonic()
+        seen = set(seqs)
+
+        for s in seen:
+            self.holes.pop(s, None)
+
+        top = max(seen, default=0)
+        if top > self.seq:
+            # only the newest MAX_HOLES can be kept anyway
+            for s in range(max(self.seq + 1, top - MAX_HOLES), top):
+                if s not in seen:
+                    self.holes[s] = now
+            self.seq = top
+
+        expired = [s for s, since in self.holes.items() if now - since > HOLE_TIMEOUT_SECONDS]
+        for s in expired:
+            del self.holes[s]
+        if len(self.holes) > MAX_HOLES:
+            for s in sorted(self.holes)[:len(self.holes) - MAX_HOLES]:
+                del self.holes[s]
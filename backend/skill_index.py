@@ -0,0 +1,446 @@
+"""
+Inverted skill index for candidate sourcing.
+
+Every analyzed resume gets a compact integer `doc_no`. Each canonical
+skill maps to a sorted uint32 array of the doc_nos that have it, so a
+query like
+
+    python AND docker AND (aws OR azure) AND NOT java
+
+is a handful of sorted-array intersections/unions in NumPy.
+
+The index lives in memory in each worker and is kept current
+incrementally:
+  - record_skills() is called whenever analysis writes skills. It stamps
+    the resume with a doc_no and a global `skills_seq` and updates the
+    local index straight away.
+  - Before each query the index pulls any resumes whose skills_seq it
+    has not seen (writes from other workers or the bulk ingester),
+    including numbers skipped because their write committed late (see
+    backend/seq_tracker.py). That is one indexed query, usually empty.
+  - forget_resume() writes a tombstone with a fresh skills_seq to
+    skill_tombstones, which the same catch-up reads, so deletes reach
+    every worker.
+
+Updates go into small delta sets and are merged into the arrays once
+they grow past COMPACT_THRESHOLD.
+
+    python -m backend.skill_index backfill   # number resumes analyzed before the index existed
+"""
+
+import re
+import sys
+import threading
+from collections import defaultdict
+from datetime import datetime
+import numpy as np
+from pymongo import UpdateOne
+
+from backend.db import resumes_collection, skill_tombstones_collection, next_sequence
+from backend.seq_tracker import SeqTracker
+from backend.nlp.skill_extractor import canonical_skill, canonical_skills
+
+COMPACT_THRESHOLD = 5000
+
+_EMPTY = np.zeros(0, dtype=np.uint32)
+
+
+def _sorted_unique(values):
+    # sort + adjacent-duplicate mask; much faster than np.unique, which
+    # takes a hashing path in NumPy 2.x
+    values = np.sort(np.asarray(values, dtype=np.uint32))
+    if values.size < 2:
+        return values
+    keep = np.empty(values.size, dtype=bool)
+    keep[0] = True
+    np.not_equal(values[1:], values[:-1], out=keep[1:])
+    return values[keep]
+
+
+def _union(a, b):
+    if not a.size:
+        return b
+    if not b.size:
+        return a
+    return _sorted_unique(np.concatenate((a, b)))
+
+# ======================================================
+# QUERY PARSING
+# ======================================================
+
+_TOKEN = re.compile(r"\(|\)|[^\s()]+")
+_OPERATORS = {"AND", "OR", "NOT"}
+
+
+class SkillQueryError(ValueError):
+    pass
+
+
+def parse_query(query):
+    """
+    Parse a boolean skill query into a nested tuple tree:
+        ("skill", name) | ("and", a, b) | ("or", a, b) | ("not", a)
+
+    AND binds tighter than OR; adjacent terms without an operator are
+    ANDed. Unquoted multi-word skills are allowed ("machine learning").
+    """
+    raw = _TOKEN.findall(query or "")
+
+    # merge consecutive plain words into one multi-word skill
+    tokens = []
+    for tok in raw:
+        if tok in "()" or tok.upper() in _OPERATORS:
+            tokens.append(tok if tok in "()" else tok.upper())
+        elif tokens and tokens[-1] not in _OPERATORS and tokens[-1] not in "()":
+            tokens[-1] = tokens[-1] + " " + tok
+        else:
+            tokens.append(tok)
+
+    pos = 0
+
+    def peek():
+        return tokens[pos] if pos < len(tokens) else None
+
+    def take():
+        nonlocal pos
+        pos += 1
+        return tokens[pos - 1]
+
+    def expr():
+        node = term()
+        while peek() == "OR":
+            take()
+            node = ("or", node, term())
+        return node
+
+    def term():
+        node = factor()
+        while peek() not in (None, "OR", ")"):
+            if peek() == "AND":
+                take()
+            node = ("and", node, factor())
+        return node
+
+    def factor():
+        tok = peek()
+        if tok is None:
+            raise SkillQueryError("unexpected end of query")
+        if tok == "NOT":
+            take()
+            return ("not", factor())
+        if tok == "(":
+            take()
+            node = expr()
+            if peek() != ")":
+                raise SkillQueryError("missing ')'")
+            take()
+            return node
+        if tok in _OPERATORS or tok == ")":
+            raise SkillQueryError(f"unexpected '{tok}'")
+        return ("skill", canonical_skill(take()))
+
+    if not tokens:
+        raise SkillQueryError("empty query")
+
+    tree = expr()
+    if pos != len(tokens):
+        raise SkillQueryError(f"unexpected '{tokens[pos]}'")
+    return tree
+
+# ======================================================
+# INDEX
+# ======================================================
+
+class SkillIndex:
+
+    def __init__(self):
+        self.postings = {}                 # skill -> sorted uint32 array (compacted)
+        self.universe = _EMPTY             # every indexed doc_no (compacted)
+
+        self.added = defaultdict(set)      # skill -> doc_nos added since compaction
+        self.delta_skills = {}             # doc_no -> skills, for docs changed since compaction
+        self.stale = set()                 # doc_nos whose compacted postings are outdated
+        self._stale_array = None
+
+        self.tracker = SeqTracker()
+        self.loaded = False
+        self.lock = threading.RLock()
+
+    # -------------------------
+    # BUILD / UPDATE
+    # -------------------------
+
+    @classmethod
+    def build(cls, entries):
+        """
+        entries: iterable of (doc_no, skills)
+        """
+        index = cls()
+        lists = defaultdict(list)
+        docs = []
+
+        for doc_no, skills in entries:
+            docs.append(doc_no)
+            for skill in set(skills or []):
+                lists[skill].append(doc_no)
+
+        index.postings = {skill: _sorted_unique(nos) for skill, nos in lists.items()}
+        index.universe = _sorted_unique(docs)
+        index.loaded = True
+        return index
+
+    def update(self, doc_no, skills):
+        skills = set(canonical_skills(skills or []))
+
+        with self.lock:
+            for old in self.delta_skills.get(doc_no) or ():
+                self.added[old].discard(doc_no)
+
+            self.delta_skills[doc_no] = skills
+            self.stale.add(doc_no)
+            self._stale_array = None
+
+            for skill in skills:
+                self.added[skill].add(doc_no)
+
+            if len(self.delta_skills) >= COMPACT_THRESHOLD:
+                self.compact()
+
+    def remove(self, doc_no):
+        self.update(doc_no, ())
+        with self.lock:
+            self.delta_skills[doc_no] = None
+
+    def compact(self):
+        with self.lock:
+            stale = self._stale()
+            skills = set(self.postings) | set(self.added)
+
+            postings = {}
+            for skill in skills:
+                merged = self._postings(skill, stale)
+                if merged.size:
+                    postings[skill] = merged
+            self.postings = postings
+
+            removed = np.asarray(
+                [d for d, s in self.delta_skills.items() if s is None], dtype=np.uint32
+            )
+            added = np.asarray(
+                [d for d, s in self.delta_skills.items() if s is not None], dtype=np.uint32
+            )
+            self.universe = _union(np.setdiff1d(self.universe, removed, assume_unique=True), _sorted_unique(added))
+
+            self.added = defaultdict(set)
+            self.delta_skills = {}
+            self.stale = set()
+            self._stale_array = None
+
+    # -------------------------
+    # QUERY
+    # -------------------------
+
+    def _stale(self):
+        if self._stale_array is None:
+            self._stale_array = np.fromiter(self.stale, dtype=np.uint32, count=len(self.stale))
+            self._stale_array.sort()
+        return self._stale_array
+
+    def _postings(self, skill, stale):
+        base = self.postings.get(skill, _EMPTY)
+        if stale.size and base.size:
+            base = base[~np.isin(base, stale, assume_unique=True)]
+        added = self.added.get(skill)
+        if added:
+            base = _union(base, _sorted_unique(np.fromiter(added, dtype=np.uint32, count=len(added))))
+        return base
+
+    def _universe(self):
+        if not self.delta_skills:
+            return self.universe
+        removed = [d for d, s in self.delta_skills.items() if s is None]
+        added = [d for d, s in self.delta_skills.items() if s is not None]
+        universe = self.universe
+        if removed:
+            universe = np.setdiff1d(universe, np.asarray(removed, dtype=np.uint32), assume_unique=True)
+        if added:
+            universe = _union(universe, _sorted_unique(added))
+        return universe
+
+    def evaluate(self, tree):
+        with self.lock:
+            return self._evaluate(tree, self._stale())
+
+    def _evaluate(self, node, stale):
+        kind = node[0]
+        if kind == "skill":
+            return self._postings(node[1], stale)
+        if kind == "and":
+            # a NOT on either side is a set difference, no universe needed
+            left, right = node[1], node[2]
+            if right[0] == "not":
+                return np.setdiff1d(self._evaluate(left, stale), self._evaluate(right[1], stale), assume_unique=True)
+            if left[0] == "not":
+                return np.setdiff1d(self._evaluate(right, stale), self._evaluate(left[1], stale), assume_unique=True)
+            return np.intersect1d(self._evaluate(left, stale), self._evaluate(right, stale), assume_unique=True)
+        if kind == "or":
+            return _union(self._evaluate(node[1], stale), self._evaluate(node[2], stale))
+        if kind == "not":
+            return np.setdiff1d(self._universe(), self._evaluate(node[1], stale), assume_unique=True)
+        raise SkillQueryError(f"unknown node {kind}")
+
+    def search(self, query):
+        return self.evaluate(parse_query(query))
+
+# ======================================================
+# MONGO GLUE
+# ======================================================
+
+SKILL_INDEX = SkillIndex()
+
+
+def record_skills(resume_skills):
+    """
+    resume_skills = {resume_id: [skill, ...]} for resumes whose skills
+    were just written. Assigns doc_nos to new resumes, stamps a fresh
+    skills_seq on each and updates this worker's index.
+    """
+    if not resume_skills:
+        return
+
+    existing = {
+        r["_id"]: r["doc_no"]
+        for r in resumes_collection.find(
+            {"_id": {"$in": list(resume_skills)}, "doc_no": {"$exists": True}},
+            {"doc_no": 1}
+        )
+    }
+
+    new_ids = [rid for rid in resume_skills if rid not in existing]
+    if new_ids:
+        first = next_sequence("resume_doc_no", len(new_ids))
+        existing.update({rid: first + i for i, rid in enumerate(new_ids)})
+
+    first_seq = next_sequence("skills_seq", len(resume_skills))
+
+    ops = []
+    for i, (rid, skills) in enumerate(resume_skills.items()):
+        ops.append(UpdateOne(
+            {"_id": rid},
+            {"$set": {"doc_no": existing[rid], "skills_seq": first_seq + i}}
+        ))
+        if SKILL_INDEX.loaded:
+            SKILL_INDEX.update(existing[rid], skills)
+
+    resumes_collection.bulk_write(ops, ordered=False)
+
+
+def forget_resume(doc_no):
+    """
+    Drop a deleted resume from every worker's index: removed here straight
+    away, and through a tombstone stamped with a fresh skills_seq that
+    the other workers read on catch-up (the resume itself is gone, so
+    they cannot find it).
+    """
+    if doc_no is None:
+        return
+    skill_tombstones_collection.insert_one({
+        "doc_no": doc_no,
+        "skills_seq": next_sequence("skills_seq"),
+        "created_at": datetime.utcnow()
+    })
+    if SKILL_INDEX.loaded:
+        SKILL_INDEX.remove(doc_no)
+
+
+def _load():
+    global SKILL_INDEX
+    seqs = []
+    entries = []
+    for r in resumes_collection.find(
+        {"doc_no": {"$exists": True}},
+        {"doc_no": 1, "skills": 1, "skills_seq": 1}
+    ):
+        entries.append((r["doc_no"], r.get("skills") or []))
+        seqs.append(r.get("skills_seq", 0))
+    seqs.extend(t["skills_seq"] for t in skill_tombstones_collection.find({}, {"skills_seq": 1}))
+
+    # every distinct name in one taxonomy lookup
+    names = list({s for _, skills in entries for s in skills})
+    canonical = dict(zip(names, canonical_skills(names)))
+
+    index = SkillIndex.build((doc_no, [canonical[s] for s in skills]) for doc_no, skills in entries)
+    index.tracker = SeqTracker.loaded(seqs)
+    SKILL_INDEX = index
+
+
+def _catch_up():
+    """
+    Apply skill writes and deletes from other workers (or the bulk
+    ingester) in skills_seq order.
+    """
+    query = SKILL_INDEX.tracker.query("skills_seq")
+    changes = list(resumes_collection.find(query, {"doc_no": 1, "skills": 1, "skills_seq": 1}))
+    changes += [dict(t, deleted=True) for t in skill_tombstones_collection.find(query, {"doc_no": 1, "skills_seq": 1})]
+    if not changes:
+        return
+
+    changes.sort(key=lambda c: c["skills_seq"])
+    for c in changes:
+        if c.get("deleted"):
+            SKILL_INDEX.remove(c["doc_no"])
+        else:
+            SKILL_INDEX.update(c["doc_no"], c.get("skills") or [])
+    SKILL_INDEX.tracker.advance(c["skills_seq"] for c in changes)
+
+
+_load_lock = threading.Lock()
+
+
+def get_skill_index():
+    if not SKILL_INDEX.loaded:
+        with _load_lock:
+            if not SKILL_INDEX.loaded:
+                _load()
+    with SKILL_INDEX.lock:
+        _catch_up()
+    return SKILL_INDEX
+
+
+def search_resumes(query, limit=50, projection=None):
+    """
+    Returns (total_matches, resumes) for a boolean skill query.
+    """
+    doc_nos = get_skill_index().search(query)
+
+    resumes = list(
+        resumes_collection.find(
+            {"doc_no": {"$in": doc_nos[:limit].tolist()}},
+            projection or {"filename": 1, "skills": 1, "ats_score": 1, "uploaded_by": 1, "doc_no": 1}
+        ).sort("doc_no", 1)
+    ) if limit else []
+
+    return int(doc_nos.size), resumes
+
+
+def backfill():
+    """
+    Number every analyzed resume that predates the index.
+    """
+    done = 0
+    while True:
+        batch = list(resumes_collection.find(
+            {"status": {"$exists": True}, "skills": {"$exists": True}, "doc_no": {"$exists": False}},
+            {"skills": 1}
+        ).limit(1000))
+        if not batch:
+            return done
+        record_skills({r["_id"]: r.get("skills") or [] for r in batch})
+        done += len(batch)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["backfill"]:
+        print("usage: python -m backend.skill_index backfill", file=sys.stderr)
+        sys.exit(2)
+    print(f"indexed {backfill()} resumes")
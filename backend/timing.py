@@ -0,0 +1,38 @@
+"""
+Stage timing without dependencies, for code that must import cleanly
+outside the web app (backend/nlp, the extraction child processes).
+
+    with timed("stage"):
+        ...
+
+reports (stage, seconds, failed) to every registered observer.
+backend.metrics registers the Prometheus one when it is imported, so
+stages timed in a process that never imports it are simply not recorded.
+"""
+
+import time
+from contextlib import contextmanager
+
+_observers = []
+
+
+def add_observer(observer):
+    """
+    observer(stage, seconds, failed), called after every timed stage.
+    """
+    _observers.append(observer)
+
+
+@contextmanager
+def timed(stage):
+    start = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        for observer in _observers:
+            observer(stage, seconds, failed)
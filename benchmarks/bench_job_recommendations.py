@@ -0,0 +1,74 @@
+"""
+Job recommendations: top-k latency against the precomputed job matrix.
+
+Synthetic jobs mix taxonomy skills (skewed popularity) with generic
+filler words; the vectorizer is fitted over the jobs, as it would be by
+the corpus refit.
+
+    python -m benchmarks.bench_job_recommendations            # 100k jobs
+    python -m benchmarks.bench_job_recommendations 20000
+"""
+
+import sys
+import time
+import numpy as np
+
+from backend.nlp.skill_extractor import technical_skills
+from backend.nlp.tfidf_model import build_vectorizer
+from backend.job_matrix import JobMatrix
+
+FILLER = (
+    "team build design develop maintain scalable services customers product "
+    "experience strong communication ownership agile delivery platform data "
+    "systems quality testing deploy production support collaborate remote"
+).split()
+RESUMES = 50
+K = 10
+ADDS = 500
+SEED = 11
+
+
+def synthetic_text(rng, skills, probs, words):
+    picked = [skills[i] for i in np.flatnonzero(rng.random(len(skills)) < probs)]
+    filler = rng.choice(FILLER, size=words).tolist()
+    return " ".join(filler + picked)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = np.random.default_rng(SEED)
+    skills = technical_skills()
+    probs = 0.5 / np.sqrt(np.arange(1, len(skills) + 1))
+
+    jobs = [(f"job{i}", synthetic_text(rng, skills, probs, 40)) for i in range(n)]
+    vectorizer = build_vectorizer().fit(text for _, text in jobs)
+
+    start = time.perf_counter()
+    matrix = JobMatrix.build(vectorizer, jobs)
+    print(f"built matrix over {n} jobs in {time.perf_counter() - start:.1f}s "
+          f"({matrix.terms.nnz} non-zeros, {len(vectorizer.vocabulary_)} terms)")
+
+    resumes = [synthetic_text(rng, skills, probs, 120) for _ in range(RESUMES)]
+
+    def run(label):
+        matrix.top_k(resumes[0], K)  # warm-up
+        timings = []
+        for text in resumes:
+            start = time.perf_counter()
+            matrix.top_k(text, K)
+            timings.append((time.perf_counter() - start) * 1000)
+        p50, p99 = np.percentile(timings, [50, 99])
+        print(f"  {label:<32} p50 {p50:6.2f} ms   p99 {p99:6.2f} ms")
+
+    run("compacted")
+
+    start = time.perf_counter()
+    for i in range(ADDS):
+        matrix.add(f"new{i}", synthetic_text(rng, skills, probs, 40))
+    per_add = (time.perf_counter() - start) * 1000 / ADDS
+    print(f"  incremental add: {per_add:.2f} ms per job")
+    run(f"with {ADDS} pending jobs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+NLP pipeline benchmark over a synthetic corpus.
+
+Times each stage separately, and the whole analyze + match path end to
+end, at several corpus sizes. Reports docs/sec, p50/p99 latency per
+document and the peak Python memory of each stage (tracemalloc, measured
+in a separate pass so it does not skew the timings).
+
+Stages (inputs of later stages are prepared untimed from earlier ones):
+
+    extract_text         extract_resume_text(path)
+    split_sections       split_sections(raw_text)
+    parse_resume         parse_resume(path)
+    extract_skills       extract_skills_from_sections(...) -> extract_skills_nlp
+    calculate_ats_score  calculate_ats_score(...) against one of the jobs
+    end_to_end           parse + skills + calculate_simple_ats + calculate_ats_score
+
+Results are written as JSON so runs can be compared:
+
+    python -m benchmarks.bench_pipeline                          # sizes 20,100,500
+    python -m benchmarks.bench_pipeline --sizes 1000 --formats pdf --out before.json
+    python -m benchmarks.bench_pipeline --compare before.json after.json
+
+Set EXTRACT_LOCATION=0 to leave spaCy NER out (as in production without
+a model), and TFIDF_MODEL_PATH to benchmark against a fitted corpus model.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import subprocess
+from datetime import datetime
+
+import numpy as np
+
+from backend.nlp.resume_parser import extract_resume_text, split_sections, parse_resume, EXTRACT_LOCATION
+from backend.nlp.skill_extractor import extract_skills_from_sections
+from backend.nlp.matcher import calculate_ats_score, calculate_simple_ats
+from backend.nlp.tfidf_model import get_model
+from backend.analysis import skill_sections, resume_scoring_input
+from benchmarks.corpus import generate_corpus, FORMATS, SEED
+
+SIZES = [20, 100, 500]
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# ======================================================
+# STAGES
+# ======================================================
+
+def _match(parsed, skills_meta, job):
+    scoring = resume_scoring_input({**parsed, "_id": None, "skills_meta": skills_meta})
+    return calculate_ats_score(
+        scoring["text"],
+        job["description"],
+        skills_meta,
+        scoring["sections"],
+        job["required_skills"]
+    )
+
+
+def _end_to_end(path, job):
+    parsed = parse_resume(path)
+    skills_meta = extract_skills_from_sections(skill_sections(parsed))
+    calculate_simple_ats({
+        "skills": [s["skill"] for s in skills_meta],
+        "experience": parsed.get("experience", []),
+        "education": parsed.get("education", ""),
+        "raw_text": parsed.get("raw_text", "")
+    })
+    return _match(parsed, skills_meta, job)
+
+
+def build_stages(paths, jobs):
+    """
+    [(name, fn, inputs)]; fn is called once per input.
+    """
+    texts = [extract_resume_text(p) for p in paths]
+    parsed = [parse_resume(p) for p in paths]
+    sections = [skill_sections(p) for p in parsed]
+    skills = [extract_skills_from_sections(s) for s in sections]
+    job_for = [jobs[i % len(jobs)] for i in range(len(paths))]
+
+    return [
+        ("extract_text", extract_resume_text, paths),
+        ("split_sections", split_sections, texts),
+        ("parse_resume", parse_resume, paths),
+        ("extract_skills", extract_skills_from_sections, sections),
+        ("calculate_ats_score", lambda args: _match(*args), list(zip(parsed, skills, job_for))),
+        ("end_to_end", lambda args: _end_to_end(*args), list(zip(paths, job_for)))
+    ]
+
+# ======================================================
+# MEASUREMENT
+# ======================================================
+
+def time_stage(fn, inputs):
+    latencies = np.empty(len(inputs))
+    started = time.perf_counter()
+    for i, item in enumerate(inputs):
+        t0 = time.perf_counter()
+        fn(item)
+        latencies[i] = time.perf_counter() - t0
+    total = time.perf_counter() - started
+    return total, latencies
+
+
+def peak_memory(fn, inputs):
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        for item in inputs:
+            fn(item)
+        return tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+
+def run(sizes, formats, seed, memory=True, out=sys.stdout):
+    results = []
+    workdir = tempfile.mkdtemp(prefix="bench-corpus-")
+
+    try:
+        for size in sizes:
+            paths, jobs = generate_corpus(os.path.join(workdir, str(size)), size, seed=seed, formats=formats)
+            stages = build_stages(paths, jobs)
+
+            # warm-up: imports, lazy models, regex caches
+            for _, fn, inputs in stages:
+                fn(inputs[0])
+
+            print(f"\n{size} resumes ({', '.join(formats)})", file=out)
+            print(f"  {'stage':<20} {'docs/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'peak KiB':>10}", file=out)
+
+            for name, fn, inputs in stages:
+                total, latencies = time_stage(fn, inputs)
+                peak = peak_memory(fn, inputs) if memory else None
+                row = {
+                    "size": size,
+                    "stage": name,
+                    "docs": len(inputs),
+                    "seconds": round(total, 6),
+                    "docs_per_sec": round(len(inputs) / total, 2) if total else None,
+                    "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 4),
+                    "p99_ms": round(float(np.percentile(latencies, 99)) * 1000, 4),
+                    "peak_mem_kib": round(peak / 1024, 1) if peak is not None else None
+                }
+                results.append(row)
+                print(
+                    f"  {name:<20} {row['docs_per_sec']:>10} {row['p50_ms']:>9.3f} {row['p99_ms']:>9.3f} "
+                    f"{row['peak_mem_kib'] if memory else '-':>10}",
+                    file=out
+                )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return results
+
+
+def run_metadata(args):
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "sizes": args.sizes,
+        "formats": args.formats,
+        "extract_location": EXTRACT_LOCATION,
+        "semantic_model": "corpus" if get_model() is not None else "pairwise"
+    }
+
+# ======================================================
+# COMPARE
+# ======================================================
+
+def compare(before_path, after_path, out=sys.stdout):
+    with open(before_path, encoding="utf-8") as f:
+        before = {(r["size"], r["stage"]): r for r in json.load(f)["results"]}
+    with open(after_path, encoding="utf-8") as f:
+        after = json.load(f)["results"]
+
+    print(f"  {'size':>6} {'stage':<20} {'docs/s before':>14} {'after':>10} {'change':>8} {'p99 before':>11} {'after':>9}", file=out)
+    for row in after:
+        old = before.get((row["size"], row["stage"]))
+        if not old:
+            continue
+        change = (row["docs_per_sec"] / old["docs_per_sec"] - 1) * 100 if old["docs_per_sec"] else 0
+        print(
+            f"  {row['size']:>6} {row['stage']:<20} {old['docs_per_sec']:>14} {row['docs_per_sec']:>10} "
+            f"{change:>+7.1f}% {old['p99_ms']:>11.3f} {row['p99_ms']:>9.3f}",
+            file=out
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the resume NLP pipeline on a synthetic corpus.")
+    parser.add_argument("--sizes", type=lambda s: [int(x) for x in s.split(",")], default=SIZES)
+    parser.add_argument("--formats", type=lambda s: s.split(","), default=list(FORMATS))
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--out", help="results file (default: benchmarks/results/pipeline-<timestamp>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two results files")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    unknown = set(args.formats) - set(FORMATS)
+    if unknown:
+        parser.error(f"unknown formats: {', '.join(sorted(unknown))}")
+
+    meta = run_metadata(args)
+    results = run(args.sizes, args.formats, args.seed, memory=not args.no_memory)
+
+    out_path = args.out or os.path.join(
+        RESULTS_DIR, f"pipeline-{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+    print(f"\nresults -> {out_path}")
+
+
+if __name__ == "__main__":
+    main()
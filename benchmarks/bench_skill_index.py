@@ -0,0 +1,73 @@
+"""
+Inverted skill index: build time and boolean query latency.
+
+Synthetic resumes draw technical skills from the skill taxonomy with a
+skewed (Zipf-like) popularity, so common skills have long posting lists.
+
+    python -m benchmarks.bench_skill_index            # 1M resumes
+    python -m benchmarks.bench_skill_index 100000
+"""
+
+import sys
+import time
+import numpy as np
+
+from backend.nlp.skill_extractor import technical_skills
+from backend.skill_index import SkillIndex
+
+QUERIES = [
+    "python",
+    "python AND docker",
+    "python AND docker AND (aws OR azure)",
+    "(react OR node) AND mongodb NOT java",
+    "machine learning AND (python OR java) AND NOT docker",
+]
+REPEAT = 20
+UPDATES = 2000
+SEED = 7
+
+
+def synthetic_resumes(n, rng, chunk=50_000):
+    # skills the queries use are the most popular, so their posting lists are long
+    head = ["python", "java", "docker", "aws", "react", "node", "mongodb", "machine learning", "azure"]
+    skills = head + sorted(set(technical_skills()) - set(head))
+    # P(resume has skill i) ~ 1/i: a few very common skills, a long tail
+    probs = (0.4 / np.arange(1, len(skills) + 1)).astype(np.float32)
+
+    for offset in range(0, n, chunk):
+        has = rng.random((min(chunk, n - offset), len(skills)), dtype=np.float32) < probs
+        for row, picked in enumerate(has):
+            yield offset + row + 1, [skills[i] for i in np.flatnonzero(picked)]
+
+
+def time_queries(index):
+    for query in QUERIES:
+        index.search(query)  # warm-up
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            hits = index.search(query)
+        ms = (time.perf_counter() - start) * 1000 / REPEAT
+        print(f"  {ms:8.2f} ms  {hits.size:>9} hits  {query}")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(SEED)
+
+    start = time.perf_counter()
+    index = SkillIndex.build(synthetic_resumes(n, rng))
+    build = time.perf_counter() - start
+    size_mb = sum(p.nbytes for p in index.postings.values()) / 1e6
+
+    print(f"built index over {n} resumes in {build:.1f}s ({size_mb:.1f} MB of postings)")
+    print("compacted:")
+    time_queries(index)
+
+    for doc_no, skills in synthetic_resumes(UPDATES, rng):
+        index.update(int(rng.integers(1, n)), skills)
+    print(f"with {UPDATES} uncompacted incremental updates:")
+    time_queries(index)
+
+
+if __name__ == "__main__":
+    main()
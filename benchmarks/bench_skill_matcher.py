@@ -0,0 +1,219 @@
+"""
+Skill matching benchmarks, two cases:
+
+  matcher   throughput at 20, 1k and 10k skills of the single-pass
+            matcher (SkillTaxonomy.count over the compiled table) against
+            the original approach of one re.findall per skill name or alias
+  table     compile / load time, per-worker memory and matching
+            throughput of the memory-mapped table at 1k, 10k and 50k
+            aliases, against a token trie of nested dicts, the
+            in-process structure the compiled table replaces
+
+The real taxonomy is cut or padded with synthetic skills to each size
+(without aliases for matcher, three aliases each for table).
+
+    python -m benchmarks.bench_skill_matcher [matcher|table]
+"""
+
+import os
+import re
+import sys
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+
+from backend.nlp.taxonomy import (
+    SKILL_TAXONOMY_SOURCE, SkillTaxonomy, compile_taxonomy, normalize_text
+)
+
+MATCHER_SIZES = [20, 1000, 10000]      # skills
+TABLE_SIZES = [1000, 10000, 50000]     # aliases
+DOCS = 50
+WORDS_PER_DOC = 800
+SEED = 42
+
+
+def random_word(rng):
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 9)))
+
+
+def make_skills(size, rng):
+    with open(SKILL_TAXONOMY_SOURCE, encoding="utf-8") as f:
+        data = json.load(f)
+
+    skills = data["skills"][:size]
+    taken = set(all_aliases(data))
+    while len(skills) < size:
+        name = " ".join(random_word(rng) for _ in range(rng.randint(1, 3)))
+        if name in taken:
+            continue
+        taken.add(name)
+        skills.append({"skill": name, "categories": ["tools"]})
+    data["skills"] = skills
+    return data
+
+
+def make_taxonomy(aliases, rng):
+    with open(SKILL_TAXONOMY_SOURCE, encoding="utf-8") as f:
+        data = json.load(f)
+
+    skills = data["skills"]
+    taken = set(all_aliases(data))
+    count = len(taken)
+    while count < aliases:
+        name = " ".join(random_word(rng) for _ in range(rng.randint(1, 3)))
+        extra = [f"{name} {random_word(rng)}", name.replace(" ", ""), random_word(rng)]
+        if len({name, *extra}) < 4 or {name, *extra} & taken:
+            continue
+        taken.update([name, *extra])
+        skills.append({"skill": name, "categories": ["tools"], "aliases": extra})
+        count += 1 + len(extra)
+    return data
+
+
+def all_aliases(data):
+    return [normalize_text(alias) for entry in data["skills"] for alias in [entry["skill"]] + entry.get("aliases", [])]
+
+
+def make_docs(aliases, rng):
+    filler = ["developed", "team", "using", "project", "the", "and", "with", "data", "built", "services"]
+    docs = []
+    for _ in range(DOCS):
+        words = [rng.choice(aliases) if rng.random() < 0.05 else rng.choice(filler) for _ in range(WORDS_PER_DOC)]
+        docs.append(normalize_text(" ".join(words)))
+    return docs
+
+
+def regex_per_skill(keys, text):
+    counter = defaultdict(int)
+    for key in keys:
+        matches = re.findall(r"\b" + re.escape(key) + r"\b", text)
+        if matches:
+            counter[key] += len(matches)
+    return counter
+
+
+def dict_trie(data):
+    root = {}
+    for skill_id, entry in enumerate(data["skills"]):
+        for alias in [entry["skill"]] + entry.get("aliases", []):
+            node = root
+            for token in normalize_text(alias).split():
+                node = node.setdefault(token, {})
+            node["$"] = skill_id
+    return root
+
+
+def dict_trie_count(root, text):
+    counts = defaultdict(int)
+    tokens = text.split()
+    for i in range(len(tokens)):
+        node = root
+        for token in tokens[i:]:
+            node = node.get(token)
+            if node is None:
+                break
+            if "$" in node:
+                counts[node["$"]] += 1
+    return counts
+
+
+def measure(fn):
+    """
+    (result, seconds, Python heap bytes still held by the result)
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, seconds, held
+
+
+def timed(fn, docs):
+    start = time.perf_counter()
+    for doc in docs:
+        fn(doc)
+    return time.perf_counter() - start
+
+
+def compiled(data, directory, name):
+    source = os.path.join(directory, f"{name}.json")
+    table = os.path.join(directory, f"{name}.bin")
+    with open(source, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+    start = time.perf_counter()
+    compile_taxonomy(source, table)
+    return table, time.perf_counter() - start
+
+
+def bench_matcher(rng, directory):
+    print(f"{'skills':>8} {'build ms':>10} {'matcher docs/s':>16} {'regex docs/s':>14} {'speedup':>9}")
+
+    for size in MATCHER_SIZES:
+        data = make_skills(size, rng)
+        keys = list(dict.fromkeys(all_aliases(data)))
+        docs = make_docs(keys, rng)
+
+        table, compile_time = compiled(data, directory, f"skills-{size}")
+        start = time.perf_counter()
+        taxonomy = SkillTaxonomy(table)
+        build = compile_time + time.perf_counter() - start
+
+        matcher_rate = len(docs) / timed(taxonomy.count, docs)
+
+        # The per-skill regex baseline is too slow to run over every doc at 10k
+        regex_docs = docs if size <= 1000 else docs[:5]
+        regex_rate = len(regex_docs) / timed(lambda d: regex_per_skill(keys, d), regex_docs)
+
+        print(
+            f"{size:>8} {build * 1000:>10.1f} {matcher_rate:>16.1f} "
+            f"{regex_rate:>14.1f} {matcher_rate / regex_rate:>8.1f}x"
+        )
+
+
+def bench_table(rng, directory):
+    print(
+        f"{'aliases':>8} {'compile ms':>11} {'table KB':>9} {'load ms':>8} {'load heap KB':>13} "
+        f"{'dict ms':>8} {'dict heap KB':>13} {'table docs/s':>13} {'dict docs/s':>12}"
+    )
+
+    for size in TABLE_SIZES:
+        data = make_taxonomy(size, rng)
+        table, compile_time = compiled(data, directory, f"taxonomy-{size}")
+
+        taxonomy, load_time, load_heap = measure(lambda: SkillTaxonomy(table))
+        trie, trie_time, trie_heap = measure(lambda: dict_trie(data))
+
+        docs = make_docs(all_aliases(data), rng)
+        table_rate = len(docs) / timed(taxonomy.count, docs)
+        trie_rate = len(docs) / timed(lambda d: dict_trie_count(trie, d), docs)
+
+        print(
+            f"{size:>8} {compile_time * 1000:>11.1f} {os.path.getsize(table) / 1024:>9.0f} "
+            f"{load_time * 1000:>8.2f} {load_heap / 1024:>13.1f} "
+            f"{trie_time * 1000:>8.1f} {trie_heap / 1024:>13.0f} "
+            f"{table_rate:>13.1f} {trie_rate:>12.1f}"
+        )
+
+
+CASES = {"matcher": bench_matcher, "table": bench_table}
+
+
+def main():
+    cases = sys.argv[1:] or list(CASES)
+    rng = random.Random(SEED)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name in cases:
+            print(f"\n# {name}")
+            CASES[name](rng, directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Synthetic resumes and job descriptions for the benchmarks.
+
+Deterministic for a given seed. Resumes vary in length (short / medium /
+long), section order, header wording and styling (any of the variants in
+SECTION_HEADERS, upper/title case, trailing colons, decorations) and
+bullet style, and are written as PDF, DOCX or TXT.
+
+PDFs are written directly (single Helvetica font, one text object per
+page) so the generator needs nothing beyond the app's own dependencies.
+
+    python -m benchmarks.corpus ./corpus 200     # write 200 resumes + jobs.json
+"""
+
+import os
+import sys
+import json
+import random
+
+import docx
+
+from backend.nlp.resume_parser import SECTION_HEADERS
+from backend.nlp.skill_extractor import technical_skills
+
+SEED = 1234
+FORMATS = ("pdf", "docx", "txt")
+
+FIRST_NAMES = ["Aarav", "Priya", "Rohan", "Sneha", "Vikram", "Ananya", "Karan", "Meera", "Arjun", "Divya"]
+LAST_NAMES = ["Sharma", "Iyer", "Patel", "Reddy", "Gupta", "Nair", "Singh", "Menon", "Das", "Kapoor"]
+CITIES = ["Bengaluru", "Pune", "Hyderabad", "Chennai", "Mumbai", "Delhi", "Kochi", "Jaipur"]
+TITLES = ["Software Engineer", "Backend Developer", "Data Analyst", "ML Engineer", "Full Stack Developer", "DevOps Engineer"]
+COMPANIES = ["Infosys", "TCS", "Wipro", "Zoho", "Freshworks", "Flipkart", "Razorpay", "Swiggy"]
+DEGREES = ["B.Tech in Computer Science", "M.Tech in Data Science", "MCA", "B.Sc Computer Science", "MBA"]
+VERBS = ["Built", "Designed", "Migrated", "Optimized", "Automated", "Led", "Implemented", "Maintained"]
+JOB_VERBS = ["build", "design", "own", "scale", "automate", "maintain"]
+OBJECTS = [
+    "a REST API serving 2M requests/day", "the reporting pipeline", "CI/CD workflows",
+    "an internal analytics dashboard", "the payments reconciliation service",
+    "a recommendation model", "search indexing jobs", "the customer onboarding flow"
+]
+OUTCOMES = [
+    "cutting latency by 40%", "reducing costs by 25%", "improving test coverage to 85%",
+    "serving 50k daily users", "halving deployment time", "with zero downtime"
+]
+FILLER = [
+    "collaborated with product and design", "mentored two interns", "wrote technical documentation",
+    "participated in on-call rotation", "reviewed pull requests", "ran sprint demos"
+]
+CERTIFICATIONS = ["AWS Certified Developer", "Google Data Analytics", "MongoDB Associate", "CKA", "Azure Fundamentals"]
+HOBBIES = ["chess", "trekking", "photography", "cricket", "open source"]
+
+# section count and bullets per entry by length
+LENGTHS = {
+    "short": {"jobs": 1, "projects": 1, "bullets": 2},
+    "medium": {"jobs": 3, "projects": 2, "bullets": 4},
+    "long": {"jobs": 8, "projects": 6, "bullets": 7}
+}
+
+BULLETS = ["• ", "- ", "* ", ""]
+
+SKILLS = technical_skills()
+
+# ======================================================
+# TEXT
+# ======================================================
+
+def _header(rng, section):
+    text = rng.choice(SECTION_HEADERS[section])
+    style = rng.randrange(4)
+    if style == 0:
+        text = text.upper()
+    elif style == 1:
+        text = text.title()
+    elif style == 2:
+        text = text.title() + ":"
+    else:
+        text = "== " + text.upper() + " =="
+    return text
+
+
+def _bullets(rng, style, count, skills):
+    lines = []
+    for _ in range(count):
+        line = f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(skills)}, {rng.choice(OUTCOMES)}"
+        if rng.random() < 0.3:
+            line += f"; {rng.choice(FILLER)}"
+        lines.append(style + line)
+    return lines
+
+
+def make_resume(rng, length=None):
+    """
+    One synthetic resume as plain text (lines separated by newlines).
+    """
+    length = length or rng.choice(list(LENGTHS))
+    shape = LENGTHS[length]
+    bullet = rng.choice(BULLETS)
+    skills = rng.sample(SKILLS, rng.randint(4, min(12, len(SKILLS))))
+
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [
+        name,
+        f"{name.lower().replace(' ', '.')}{rng.randint(1, 99)}@example.com | +91 9{rng.randint(100000000, 999999999)}",
+        f"{rng.choice(CITIES)}, India",
+        ""
+    ]
+
+    sections = {
+        "skills": [", ".join(skills)] if rng.random() < 0.5 else skills,
+        "experience": [],
+        "projects": [],
+        "education": [f"{rng.choice(DEGREES)}, {rng.randint(2008, 2022)}"],
+        "certifications": rng.sample(CERTIFICATIONS, rng.randint(0, 3)),
+        "hobbies": [", ".join(rng.sample(HOBBIES, 2))]
+    }
+
+    for _ in range(shape["jobs"]):
+        start = rng.randint(2010, 2022)
+        sections["experience"] += [
+            f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)}",
+            f"{start} - {'Present' if rng.random() < 0.3 else start + rng.randint(1, 3)}",
+            *_bullets(rng, bullet, shape["bullets"], skills),
+            ""
+        ]
+
+    for i in range(shape["projects"]):
+        sections["projects"] += [
+            f"Project {i + 1}: {rng.choice(OBJECTS).capitalize()}",
+            f"Tech Stack: {', '.join(rng.sample(skills, min(3, len(skills))))}",
+            *_bullets(rng, bullet, max(1, shape["bullets"] // 2), skills),
+            ""
+        ]
+
+    order = list(sections)
+    rng.shuffle(order)
+    for section in order:
+        if not sections[section]:
+            continue
+        lines.append(_header(rng, section))
+        lines.extend(sections[section])
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+def make_job(rng):
+    required = rng.sample(SKILLS, rng.randint(2, 5))
+    title = rng.choice(TITLES)
+    description = " ".join([
+        f"We are hiring a {title} to join our team in {rng.choice(CITIES)}.",
+        f"You will {rng.choice(JOB_VERBS)} {rng.choice(OBJECTS)} and {rng.choice(JOB_VERBS)} {rng.choice(OBJECTS)}.",
+        f"Experience with {', '.join(required)} is required;",
+        f"{rng.choice(SKILLS)} is a plus. Candidates should have {rng.randint(1, 8)}+ years of experience",
+        f"and a {rng.choice(DEGREES)}."
+    ])
+    return {"title": title, "description": description, "required_skills": required}
+
+# ======================================================
+# FILE FORMATS
+# ======================================================
+
+def write_txt(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def write_docx(path, text):
+    document = docx.Document()
+    for line in text.split("\n"):
+        document.add_paragraph(line)
+    document.save(path)
+
+
+PDF_LINES_PER_PAGE = 60
+
+
+def _pdf_escape(line):
+    line = line.encode("latin-1", "replace").decode("latin-1")
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path, text):
+    lines = text.split("\n")
+    pages = [lines[i:i + PDF_LINES_PER_PAGE] for i in range(0, len(lines), PDF_LINES_PER_PAGE)] or [[]]
+
+    # objects: 1 catalog, 2 pages, 3 font, then (page, content) per page
+    objects = [None, None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in pages:
+        stream = "BT /F1 10 Tf 12 TL 50 800 Td\n" + "".join(f"({_pdf_escape(l)}) '\n" for l in page) + "ET"
+        stream = stream.encode("latin-1")
+        page_no = len(objects) + 1
+        kids.append(f"{page_no} 0 R")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_no + 1} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + body + b"\nendobj\n"
+
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+WRITERS = {"pdf": write_pdf, "docx": write_docx, "txt": write_txt}
+
+# ======================================================
+# CORPUS
+# ======================================================
+
+def generate_corpus(directory, n, seed=SEED, formats=FORMATS, jobs=10):
+    """
+    Write n resumes (formats round-robin) into directory.
+    Returns (resume paths, job dicts).
+    """
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+
+    paths = []
+    for i in range(n):
+        fmt = formats[i % len(formats)]
+        path = os.path.join(directory, f"resume_{i:05d}.{fmt}")
+        WRITERS[fmt](path, make_resume(rng))
+        paths.append(path)
+
+    return paths, [make_job(rng) for _ in range(jobs)]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: python -m benchmarks.corpus <directory> <count>", file=sys.stderr)
+        sys.exit(2)
+    paths, job_list = generate_corpus(sys.argv[1], int(sys.argv[2]))
+    with open(os.path.join(sys.argv[1], "jobs.json"), "w", encoding="utf-8") as f:
+        json.dump(job_list, f, indent=2)
+    print(f"wrote {len(paths)} resumes and {len(job_list)} jobs to {sys.argv[1]}")
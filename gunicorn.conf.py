@@ -0,0 +1,33 @@
+"""
+gunicorn settings, picked up automatically from the working directory.
+
+Puts prometheus_client in multiprocess mode so /metrics aggregates the
+samples of every worker (see backend/metrics.py). The directory is
+wiped when the master starts so counters from a previous run do not
+leak into the new one.
+
+Also compiles the skill taxonomy once in the master, before any worker
+memory-maps it (see backend/nlp/taxonomy.py).
+"""
+
+import os
+import shutil
+import tempfile
+
+METRICS_DIR = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR",
+    os.path.join(tempfile.gettempdir(), "resume-screening-metrics")
+)
+
+
+def on_starting(server):
+    shutil.rmtree(METRICS_DIR, ignore_errors=True)
+    os.makedirs(METRICS_DIR, exist_ok=True)
+
+    from backend.nlp.taxonomy import ensure_compiled
+    ensure_compiled()
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)